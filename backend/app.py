@@ -13,6 +13,7 @@ from werkzeug.utils import secure_filename
 import os
 import json
 import shutil
+import zipfile
 import re
 import threading
 import time
@@ -747,9 +748,16 @@ def download_all_clips(job_id):
         if not os.path.exists(output_dir):
             return jsonify({'error': 'Job not found'}), 404
         
-        # Create ZIP file
+        # Create ZIP file (hidden files such as export cache keys left out)
         zip_path = os.path.join(Config.OUTPUT_FOLDER, f"{job_id}_clips.zip")
-        shutil.make_archive(zip_path.replace('.zip', ''), 'zip', output_dir)
+        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for root, dirs, files in os.walk(output_dir):
+                dirs[:] = [name for name in dirs if not name.startswith('.')]
+                for name in sorted(files):
+                    if name.startswith('.'):
+                        continue
+                    file_path = os.path.join(root, name)
+                    archive.write(file_path, os.path.relpath(file_path, output_dir))
         
         return send_file(zip_path, as_attachment=True)
     
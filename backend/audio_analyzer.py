@@ -33,6 +33,112 @@ try:
 except ImportError:  # pragma: no cover - optional for Groq API
     httpx = None
 
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional fast multi-keyword matcher
+    ahocorasick = None
+
+try:
+    import hyperscan
+except ImportError:  # pragma: no cover - optional DFA multi-keyword matcher
+    hyperscan = None
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - numba ships with openai-whisper
+    njit = None
+
+
+# Keyword categories scored per segment, in score-kernel column order
+SCORED_CATEGORIES = (
+    'hook', 'emotional', 'controversial', 'educational',
+    'entertaining', 'money', 'urgency', 'mental_slap', 'rare_topic'
+)
+VIRAL_CATEGORY_COUNT = 7  # first 7 columns come from VIRAL_KEYWORDS
+
+_DIGITS = frozenset('0123456789')
+
+# Suffix groups stripped in order by _simple_stem, with their length guard
+_STEM_SUFFIX_GROUPS = (
+    (('lah', 'kah', 'tah', 'pun', 'nya', 'ku', 'mu'), 2),  # Common Indonesian enclitics
+    (('kan', 'an', 'i'), 3),  # Indonesian derivational suffixes
+    (('ing', 'ed', 'es', 's'), 3),  # Simple English suffixes
+)
+
+
+def _build_suffix_trie(suffixes):
+    """Trie over reversed suffixes; the None key holds a complete suffix's length."""
+    trie = {}
+    for suffix in suffixes:
+        node = trie
+        for ch in reversed(suffix):
+            node = node.setdefault(ch, {})
+        node[None] = len(suffix)
+    return trie
+
+
+_SUFFIX_TRIES = tuple((_build_suffix_trie(suffixes), guard) for suffixes, guard in _STEM_SUFFIX_GROUPS)
+
+# Combined question/numbers/emphasis bonus, indexed by
+# (exclamation << 0) | (numbers << 1) | (question << 2)
+_BONUS_LUT = np.array([0.0, 0.1, 0.15, 0.25, 0.2, 0.3, 0.35, 0.45], dtype=np.float64)
+
+
+def _jit(func):
+    """Compile with Numba when available; otherwise run as plain Python."""
+    if njit is None:
+        return func
+    return njit(cache=True, fastmath=True)(func)
+
+
+@_jit
+def _score_kernel(counts, flags, bonus_masks, bonus_lut):
+    """
+    Score all segments in one pass.
+    counts: (N, C, 2) int32 token/phrase matches per SCORED_CATEGORIES column.
+    flags: (N, 5) float64 question, numbers, exclamation, filler count, meta strength.
+    bonus_masks: (N,) uint8 packed text flags indexing bonus_lut (see _BONUS_LUT).
+    Returns token_scores, phrase_scores, combined (N, C) and engagement (N,).
+    """
+    n = counts.shape[0]
+    c = counts.shape[1]
+    token_scores = np.empty((n, c), dtype=np.float64)
+    phrase_scores = np.empty((n, c), dtype=np.float64)
+    combined = np.empty((n, c), dtype=np.float64)
+    engagement = np.empty(n, dtype=np.float64)
+
+    for i in range(n):
+        for j in range(c):
+            token_score = min(counts[i, j, 0] / 3.0, 1.0)
+            phrase_score = min(counts[i, j, 1] / 2.0, 1.0)
+            token_scores[i, j] = token_score
+            phrase_scores[i, j] = phrase_score
+            # Probabilistic OR to prevent stacking bias
+            combined[i, j] = 1 - ((1 - token_score) * (1 - phrase_score))
+
+        text_bonus = bonus_lut[bonus_masks[i]]  # question + numbers + emphasis
+        filler_penalty = min(flags[i, 3] * 0.08, 0.4)
+
+        # Enhanced engagement calculation with money, urgency, and relatability
+        value = (
+            combined[i, 0] * 0.25 +  # hook
+            combined[i, 1] * 0.18 +  # emotional
+            combined[i, 2] * 0.12 +  # controversial
+            combined[i, 3] * 0.12 +  # educational
+            combined[i, 4] * 0.12 +  # entertaining
+            combined[i, 5] * 0.15 +  # money
+            combined[i, 6] * 0.15 +  # urgency
+            flags[i, 4] * 0.12 +  # meta topic strength
+            combined[i, 7] * 0.18 +  # mental slap
+            text_bonus -
+            filler_penalty -
+            combined[i, 8] * 0.2  # rare topic penalty
+        )
+        engagement[i] = max(0.0, min(1.0, value))  # Clamp to 0-1
+
+    return token_scores, phrase_scores, combined, engagement
+
+
 class AudioAnalyzer:
     def __init__(self, video_path: str, config, overrides: Optional[Dict[str, str]] = None):
         self.video_path = video_path
@@ -81,6 +187,26 @@ class AudioAnalyzer:
         self.groq_fallback_on_low_confidence = getattr(config, 'GROQ_FALLBACK_ON_LOW_CONFIDENCE', True)
         self.groq_confidence_threshold = getattr(config, 'GROQ_CONFIDENCE_THRESHOLD', 0.6)
         self.min_segment_confidence = getattr(config, 'MIN_SEGMENT_CONFIDENCE', 0.5)
+        self._scores_soa = None  # Columnar segment scores from the last analysis
+
+        # Keyword matching: one multi-pattern matcher over every configured phrase
+        self._keyword_categories = self._build_keyword_categories()
+        self._category_tokens = {}
+        self._category_phrases = {}
+        for category, keywords in self._keyword_categories.items():
+            self._category_tokens[category], self._category_phrases[category] = self._split_keywords(keywords)
+        self._category_index = {category: i for i, category in enumerate(self._keyword_categories)}
+        self._scored_rows = np.array([self._category_index[c] for c in SCORED_CATEGORIES], dtype=np.intp)
+        self._filler_row = self._category_index['filler']
+        self._empty_counts = np.zeros((len(SCORED_CATEGORIES), 2), dtype=np.int32)
+        meta_topics = getattr(config, 'META_TOPICS', {}) or {}
+        self._meta_topic_rows = np.array(
+            [self._category_index[f'meta:{topic_id}'] for topic_id in meta_topics], dtype=np.intp
+        )
+        self._meta_topic_labels = [data.get('label', topic_id) for topic_id, data in meta_topics.items()]
+        self._phrase_categories = self._build_phrase_index()
+        self._vocab, self._token_category_matrix = self._build_token_vocab()
+        self._phrase_matcher, self._phrase_matcher_kind = self._build_phrase_matcher()
         
     def analyze(self, language: str = 'id') -> Dict:
         """
@@ -742,20 +868,25 @@ class AudioAnalyzer:
     def _transcribe_in_chunks_openai(self, language: str, chunk_duration: int = 300) -> Dict:
         """
         Fallback method: transcribe video in smaller chunks when timeout occurs.
-        Splits video into chunks, processes separately, then merges results.
+        Decodes the audio once, transcribes slices of it, then merges results.
+        Failed chunks are retried from a canonical 16 kHz mono WAV re-extract;
+        chunks that still fail are left out instead of padded with placeholders.
         """
         print(f"   🔄 Processing in {chunk_duration}s chunks...")
         duration = self._get_video_duration_fallback()
         
-        all_segments = []
-        segment_id = 0
-        full_text = []
-        word_timestamps = self.word_timestamps_enabled
+        chunk_results = {}  # chunk_idx -> (segments, text)
+        failed_chunks = []  # (chunk_idx, start, end)
         
-        # Process video in chunks
-        import subprocess
-        import tempfile
-        import os
+        # Decode the whole track once (16 kHz mono float32) and slice it per chunk
+        # instead of spawning an FFmpeg split + temp file for every chunk
+        sample_rate = whisper.audio.SAMPLE_RATE
+        try:
+            audio = whisper.load_audio(self.video_path)
+        except Exception as e:
+            print(f"   ⚠️  Audio decode failed: {e}")
+            audio = None
+        use_fp16 = getattr(getattr(self.model, 'device', None), 'type', None) == 'cuda'
         
         num_chunks = int(duration / chunk_duration) + 1
         print(f"   📊 Total chunks to process: {num_chunks}")
@@ -774,77 +905,48 @@ class AudioAnalyzer:
             print(f"   🎬 Processing chunk {chunk_idx + 1}/{num_chunks} ({start_time:.0f}s - {chunk_end:.0f}s)...")
             
             try:
-                # Extract chunk using FFmpeg
-                with tempfile.NamedTemporaryFile(suffix='.mp4', delete=False) as temp_file:
-                    chunk_path = temp_file.name
-                
-                ffmpeg_cmd = [
-                    'ffmpeg', '-i', self.video_path,
-                    '-ss', str(start_time),
-                    '-t', str(actual_duration),
-                    '-c', 'copy',
-                    '-y', chunk_path
-                ]
-                subprocess.run(ffmpeg_cmd, capture_output=True, timeout=60)
-                
-                # Transcribe chunk
-                try:
-                    chunk_result = self.model.transcribe(
-                        chunk_path,
-                        language=language,
-                        task='transcribe',
-                        verbose=False,
-                        fp16=False,
-                        word_timestamps=False  # Disabled due to Triton bug
-                    )
-                except TypeError as exc:
-                    if 'word_timestamps' in str(exc):
-                        print("   word_timestamps not supported, disabling.")
-                        word_timestamps = False
-                        self.word_timestamps_enabled = False
-                        chunk_result = self.model.transcribe(
-                            chunk_path,
-                            language=language,
-                            task='transcribe',
-                            verbose=False,
-                            fp16=False
-                        )
-                    else:
-                        raise
-                
-                # Add offset to segment times
-                for segment in chunk_result['segments']:
-                    word_entries = []
-                    if word_timestamps:
-                        word_entries = self._extract_word_timestamps(segment.get('words', []))
-                    all_segments.append({
-                        'id': segment_id,
-                        'start': segment['start'] + start_time,
-                        'end': segment['end'] + start_time,
-                        'text': segment['text'].strip(),
-                        'words': word_entries
-                    })
-                    segment_id += 1
-                
-                full_text.append(chunk_result['text'])
-                
-                # Clean up temp file
-                try:
-                    os.unlink(chunk_path)
-                except:
-                    pass
-                    
+                if audio is None:
+                    raise RuntimeError("audio track could not be decoded")
+                chunk_audio = audio[int(start_time * sample_rate):int(chunk_end * sample_rate)]
+                chunk_results[chunk_idx] = self._transcribe_chunk(chunk_audio, start_time, language, use_fp16)
             except Exception as e:
                 print(f"   ⚠️  Chunk {chunk_idx + 1} failed: {e}")
-                # Create placeholder for failed chunk
-                all_segments.append({
-                    'id': segment_id,
-                    'start': start_time,
-                    'end': chunk_end,
-                    'text': f'Audio content {chunk_idx + 1}',
-                    'words': []
-                })
-                segment_id += 1
+                failed_chunks.append((chunk_idx, start_time, chunk_end))
+        
+        if failed_chunks:
+            print(f"   🔁 Retrying {len(failed_chunks)} failed chunk(s) with WAV re-extract...")
+            # FFmpeg re-extracts run concurrently; Whisper decoding stays on this
+            # thread because the model installs per-call hooks and is not thread-safe
+            with ThreadPoolExecutor(max_workers=min(4, len(failed_chunks))) as executor:
+                futures = {
+                    executor.submit(self._extract_audio_segment, start, end, 'wav'): (chunk_idx, start)
+                    for chunk_idx, start, end in failed_chunks
+                }
+                for future in as_completed(futures):
+                    chunk_idx, start_time = futures[future]
+                    wav_path = future.result()
+                    if not wav_path:
+                        print(f"   ⚠️  Chunk {chunk_idx + 1} skipped: re-extract failed")
+                        continue
+                    try:
+                        chunk_results[chunk_idx] = self._transcribe_chunk(wav_path, start_time, language, use_fp16)
+                        print(f"   ✅ Chunk {chunk_idx + 1} recovered on retry")
+                    except Exception as e:
+                        print(f"   ⚠️  Chunk {chunk_idx + 1} skipped after retry: {e}")
+                    finally:
+                        try:
+                            os.unlink(wav_path)
+                        except OSError:
+                            pass
+        
+        # Merge in chunk order and renumber segment ids
+        all_segments = []
+        full_text = []
+        for chunk_idx in sorted(chunk_results):
+            segments, text = chunk_results[chunk_idx]
+            for segment in segments:
+                all_segments.append({'id': len(all_segments), **segment})
+            full_text.append(text)
         
         print(f"   ✅ Chunk processing complete: {len(all_segments)} segments")
         
@@ -853,6 +955,48 @@ class AudioAnalyzer:
             'text': ' '.join(full_text) if full_text else 'Transcription completed in chunks',
             'segments': all_segments
         }
+
+    def _transcribe_chunk(self, chunk_audio, start_time: float, language: str, use_fp16: bool) -> Tuple[List[Dict], str]:
+        """
+        Transcribe one chunk (audio array or file path) with openai-whisper.
+        Returns its segments shifted by start_time, plus the chunk text.
+        """
+        try:
+            chunk_result = self.model.transcribe(
+                chunk_audio,
+                language=language,
+                task='transcribe',
+                verbose=False,
+                fp16=use_fp16,
+                word_timestamps=False  # Disabled due to Triton bug
+            )
+        except TypeError as exc:
+            if 'word_timestamps' in str(exc):
+                print("   word_timestamps not supported, disabling.")
+                self.word_timestamps_enabled = False
+                chunk_result = self.model.transcribe(
+                    chunk_audio,
+                    language=language,
+                    task='transcribe',
+                    verbose=False,
+                    fp16=use_fp16
+                )
+            else:
+                raise
+        
+        # Add offset to segment times
+        segments = []
+        for segment in chunk_result['segments']:
+            word_entries = []
+            if self.word_timestamps_enabled:
+                word_entries = self._extract_word_timestamps(segment.get('words', []))
+            segments.append({
+                'start': segment['start'] + start_time,
+                'end': segment['end'] + start_time,
+                'text': segment['text'].strip(),
+                'words': word_entries
+            })
+        return segments, chunk_result['text']
     
     def _extract_words(self, text: str) -> List[str]:
         """Extract normalized tokens from text."""
@@ -919,23 +1063,21 @@ class AudioAnalyzer:
         if not token or len(token) <= 3:
             return token
 
-        # Common Indonesian enclitics
-        for suffix in ('lah', 'kah', 'tah', 'pun', 'nya', 'ku', 'mu'):
-            if token.endswith(suffix) and len(token) > len(suffix) + 2:
-                token = token[: -len(suffix)]
-                break
-
-        # Indonesian derivational suffixes
-        for suffix in ('kan', 'an', 'i'):
-            if token.endswith(suffix) and len(token) > len(suffix) + 3:
-                token = token[: -len(suffix)]
-                break
-
-        # Simple English suffixes
-        for suffix in ('ing', 'ed', 'es', 's'):
-            if token.endswith(suffix) and len(token) > len(suffix) + 3:
-                token = token[: -len(suffix)]
-                break
+        # Indonesian enclitics, then derivational suffixes, then English suffixes
+        for trie, guard in _SUFFIX_TRIES:
+            # Walk the token backwards; keep the longest suffix that passes the guard
+            node = trie
+            length = len(token)
+            strip = 0
+            for ch in reversed(token):
+                node = node.get(ch)
+                if node is None:
+                    break
+                suffix_len = node.get(None)
+                if suffix_len is not None and length > suffix_len + guard:
+                    strip = suffix_len
+            if strip:
+                token = token[:-strip]
 
         return token
 
@@ -955,6 +1097,150 @@ class AudioAnalyzer:
                 tokens.append(kw.strip().lower())
         return tokens, phrases
 
+    def _build_keyword_categories(self) -> Dict[str, List[str]]:
+        """Collect every keyword list scored per segment, keyed by category id."""
+        categories = {}
+        for name, keywords in (getattr(self.config, 'VIRAL_KEYWORDS', {}) or {}).items():
+            categories[name] = keywords or []
+        for name in SCORED_CATEGORIES[:VIRAL_CATEGORY_COUNT]:
+            categories.setdefault(name, [])
+        categories['filler'] = getattr(self.config, 'FILLER_WORDS', []) or []
+        categories['mental_slap'] = getattr(self.config, 'MENTAL_SLAP_KEYWORDS', []) or []
+        categories['rare_topic'] = getattr(self.config, 'RARE_TOPICS', []) or []
+        for topic_id, data in (getattr(self.config, 'META_TOPICS', {}) or {}).items():
+            categories[f'meta:{topic_id}'] = data.get('keywords', []) or []
+        return categories
+
+    def _build_token_vocab(self) -> Tuple[Dict[str, int], np.ndarray]:
+        """
+        Intern every single-token keyword to an integer id.
+        Returns the vocab and a (categories, vocab + 1) membership matrix;
+        the last column stands for out-of-vocabulary tokens.
+        """
+        vocab: Dict[str, int] = {}
+        for tokens in self._category_tokens.values():
+            for token in tokens:
+                vocab.setdefault(token, len(vocab))
+        matrix = np.zeros((len(self._category_tokens), len(vocab) + 1), dtype=np.int32)
+        for row, tokens in enumerate(self._category_tokens.values()):
+            for token in tokens:
+                matrix[row, vocab[token]] = 1
+        return vocab, matrix
+
+    def _token_counts(self, stemmed_tokens: List[str]) -> np.ndarray:
+        """Count single-token keyword hits for every category at once."""
+        oov = len(self._vocab)
+        ids = np.fromiter(
+            (self._vocab.get(tok, oov) for tok in stemmed_tokens),
+            dtype=np.intp,
+            count=len(stemmed_tokens)
+        )
+        return self._token_category_matrix[:, ids].sum(axis=1)
+
+    def _build_phrase_index(self) -> Dict[str, Tuple[int, ...]]:
+        """Map each stemmed phrase to the category rows it scores for."""
+        phrase_categories: Dict[str, List[int]] = {}
+        for category, phrases in self._category_phrases.items():
+            for phrase in phrases:
+                phrase_tokens = [self._simple_stem(tok) for tok in phrase.split()]
+                if not phrase_tokens:
+                    continue
+                phrase_categories.setdefault(' '.join(phrase_tokens), []).append(
+                    self._category_index[category]
+                )
+        return {phrase: tuple(categories) for phrase, categories in phrase_categories.items()}
+
+    def _build_phrase_matcher(self):
+        """
+        Build one multi-pattern matcher over all stemmed phrases.
+        Prefers Aho-Corasick, then Hyperscan, then a single alternation regex.
+        Returns (matcher, kind); matcher is None when there are no phrases.
+        """
+        phrases = list(self._phrase_categories)
+        if not phrases:
+            return None, None
+
+        # Patterns are space-padded so matches respect word boundaries
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for phrase in phrases:
+                automaton.add_word(f' {phrase} ', phrase)
+            automaton.make_automaton()
+            return automaton, 'ahocorasick'
+
+        if hyperscan is not None:
+            try:
+                database = hyperscan.Database()
+                database.compile(
+                    expressions=[re.escape(f' {phrase} ').encode() for phrase in phrases],
+                    ids=list(range(len(phrases))),
+                    elements=len(phrases),
+                    flags=[0] * len(phrases)
+                )
+                return (database, phrases), 'hyperscan'
+            except Exception as e:
+                print(f"⚠️ Hyperscan compile failed, using regex matcher: {e}")
+
+        # Longest-first alternation inside a lookahead reports every start
+        # position, including overlapping hits, in one C-level scan.
+        alternation = '|'.join(re.escape(p) for p in sorted(phrases, key=len, reverse=True))
+        pattern = re.compile(f'(?= ({alternation}) )')
+        # Only the longest phrase is captured per position; shorter phrases
+        # that are token-prefixes of it matched there as well.
+        prefixes = {
+            phrase: [other for other in phrases if other != phrase and phrase.startswith(other + ' ')]
+            for phrase in phrases
+        }
+        return (pattern, prefixes), 'regex'
+
+    def _iter_phrase_hits(self, padded_text: str):
+        """Yield (start, end, phrase) for every phrase occurrence in padded text."""
+        kind = self._phrase_matcher_kind
+        if kind == 'ahocorasick':
+            for end_index, phrase in self._phrase_matcher.iter(padded_text):
+                yield end_index - len(phrase), end_index, phrase
+        elif kind == 'hyperscan':
+            database, phrases = self._phrase_matcher
+            hits = []
+
+            def on_match(phrase_id, _from, to, _flags, _context):
+                phrase = phrases[phrase_id]
+                hits.append((to - 1 - len(phrase), to - 1, phrase))
+
+            database.scan(padded_text.encode(), match_event_handler=on_match)
+            yield from hits
+        elif kind == 'regex':
+            pattern, prefixes = self._phrase_matcher
+            for match in pattern.finditer(padded_text):
+                start = match.start() + 1
+                phrase = match.group(1)
+                yield start, start + len(phrase), phrase
+                for prefix in prefixes[phrase]:
+                    yield start, start + len(prefix), prefix
+
+    def _scan_keywords(self, stemmed_tokens: List[str], stemmed_text: str) -> np.ndarray:
+        """
+        Count token and phrase keyword hits for every category in one pass.
+        Returns a (categories, 2) int array of [token_matches, phrase_matches],
+        rows ordered like self._category_index.
+        """
+        counts = np.zeros((len(self._category_index), 2), dtype=np.int32)
+        counts[:, 0] = self._token_counts(stemmed_tokens)
+        if not stemmed_text or self._phrase_matcher is None:
+            return counts
+
+        phrase_matches = [0] * len(self._category_index)
+        last_end: Dict[str, int] = {}
+        for start, end, phrase in self._iter_phrase_hits(f' {stemmed_text} '):
+            # re.findall never counts overlapping hits of the same phrase
+            if start < last_end.get(phrase, 0):
+                continue
+            last_end[phrase] = end
+            for row in self._phrase_categories[phrase]:
+                phrase_matches[row] += 1
+        counts[:, 1] = phrase_matches
+        return counts
+
     def _count_phrase_matches(self, stemmed_text: str, phrases: List[str]) -> int:
         if not stemmed_text or not phrases:
             return 0
@@ -975,7 +1261,8 @@ class AudioAnalyzer:
         """
         token_keywords, phrase_keywords = self._split_keywords(keywords)
         stemmed_tokens = self._stem_tokens(tokens)
-        stemmed_text = ' '.join(stemmed_tokens)
+        # Only phrase matching needs the joined text
+        stemmed_text = ' '.join(stemmed_tokens) if phrase_keywords else ''
 
         token_matches = sum(1 for tok in stemmed_tokens if tok in token_keywords)
         phrase_matches = self._count_phrase_matches(stemmed_text, phrase_keywords)
@@ -994,25 +1281,35 @@ class AudioAnalyzer:
             'phrase_matches': phrase_matches
         }
 
-    def _detect_meta_topic(self, text: str, words: List[str]) -> Tuple[str, float]:
-        """Return the most relevant meta topic label and its strength (0-1)."""
-        meta_topics = getattr(self.config, 'META_TOPICS', {})
-        if not meta_topics:
+    def _detect_meta_topic(
+        self,
+        text: str,
+        words: List[str],
+        keyword_counts: Optional[np.ndarray] = None
+    ) -> Tuple[str, float]:
+        """
+        Return the most relevant meta topic label and its strength (0-1).
+        Pass keyword_counts (from _scan_keywords) to skip rescanning the text.
+        """
+        if not self._meta_topic_labels:
             return 'Umum', 0.0
-        best_label = 'Umum'
-        best_score = 0.0
-        normalized_text = self._normalize_text(text)
-        tokens = words or self._tokenize(normalized_text)
-        for topic_id, data in meta_topics.items():
-            keywords = data.get('keywords', [])
-            if not keywords:
-                continue
-            scores = self._keyword_scores(normalized_text, tokens, keywords)
-            combined = scores['combined']
-            if combined > best_score:
-                best_score = combined
-                best_label = data.get('label', topic_id)
-        return best_label, min(1.0, best_score)
+        if keyword_counts is None:
+            stemmed_tokens = self._stem_tokens(words or self._tokenize(text))
+            keyword_counts = self._scan_keywords(stemmed_tokens, ' '.join(stemmed_tokens))
+
+        rows = keyword_counts[self._meta_topic_rows]
+        if not rows.any():
+            return 'Umum', 0.0  # Most segments hit no meta topic at all
+        token_scores = np.minimum(rows[:, 0] / 3.0, 1.0)
+        phrase_scores = np.minimum(rows[:, 1] / 2.0, 1.0)
+        combined = 1 - ((1 - token_scores) * (1 - phrase_scores))
+
+        # First topic with the highest non-zero score wins
+        best = int(np.argmax(combined))
+        best_score = float(combined[best])
+        if best_score <= 0.0:
+            return 'Umum', 0.0
+        return self._meta_topic_labels[best], min(1.0, best_score)
 
     def _calculate_phrase_score(self, text: str, phrases: List[str]) -> float:
         """Simple phrase matching score for multi-word keywords."""
@@ -1043,10 +1340,18 @@ class AudioAnalyzer:
                 'words': []
             }]
         
-        # Analyze each segment
+        # Normalize/tokenize/stem each segment once, shared by every scoring pass
+        prepare_text = self._prepare_text
+        prepared = [prepare_text(segment.get('text') or '') for segment in segments]
+
+        # Extract match counts per segment, then score them all at once
+        segment_features = self._segment_features
+        scores, scores_soa = self._score_features([
+            segment_features(segment, text_data)
+            for segment, text_data in zip(segments, prepared)
+        ])
         segment_scores = []
-        for segment in segments:
-            score = self._score_segment(segment)
+        for segment, score in zip(segments, scores):
             segment_scores.append({
                 'segment_id': segment.get('id', len(segment_scores)),
                 'start': segment.get('start', 0),
@@ -1057,18 +1362,25 @@ class AudioAnalyzer:
             })
         
         # Find hooks (strong opening statements)
-        hooks = self._find_hooks(segments)
+        hooks = self._find_hooks(segments, scores)
         
         # Find punchlines (impactful statements)
-        punchlines = self._find_punchlines(segments)
+        punchlines = self._find_punchlines(segments, scores)
+        
+        # Columnar copy of segment_scores for numpy-wide aggregation/thresholding
+        scores_soa['start'] = np.array([s['start'] for s in segment_scores], dtype=np.float64)
+        scores_soa['end'] = np.array([s['end'] for s in segment_scores], dtype=np.float64)
+        scores_soa['meta_topic'] = [score['meta_topic'] for score in scores]
+        self._scores_soa = scores_soa
         
         # Overall content analysis
-        overall = self._calculate_overall_scores(segment_scores)
+        overall = self._calculate_overall_scores(segment_scores, scores_soa)
         
         print(f"📊 Analyzed {len(segment_scores)} segments")
         
         return {
             'segment_scores': segment_scores,
+            'segment_scores_soa': scores_soa,
             'hooks': hooks,
             'punchlines': punchlines,
             'overall': overall
@@ -1080,112 +1392,125 @@ class AudioAnalyzer:
         Enhanced with money/urgency, meta topics, and relatability detection
         Returns default scores if segment is empty.
         """
+        scores, _ = self._score_features([self._segment_features(segment)])
+        return scores[0]
+
+    def _prepare_text(self, text: str) -> Dict:
+        """Normalize, tokenize and stem text once for all keyword passes."""
+        normalized = self._normalize_text(text)
+        tokens = normalized.split()
+        stemmed = self._stem_tokens(tokens)
+        return {
+            'normalized': normalized,
+            'tokens': tokens,
+            'stemmed': stemmed,
+            'stemmed_text': ' '.join(stemmed)
+        }
+
+    def _segment_features(self, segment: Dict, prepared: Optional[Dict] = None) -> Dict:
+        """
+        Extract keyword match counts and text flags for one segment.
+        Scoring arithmetic happens in _score_features.
+        """
         raw_text = segment.get('text') or ''
-        normalized_text = self._normalize_text(raw_text)
-        tokens = self._tokenize(normalized_text)
-
-        # Check for viral keywords (token vs phrase separated)
-        hook_scores = self._keyword_scores(normalized_text, tokens, self.config.VIRAL_KEYWORDS.get('hook', []))
-        emotional_scores = self._keyword_scores(normalized_text, tokens, self.config.VIRAL_KEYWORDS.get('emotional', []))
-        controversial_scores = self._keyword_scores(normalized_text, tokens, self.config.VIRAL_KEYWORDS.get('controversial', []))
-        educational_scores = self._keyword_scores(normalized_text, tokens, self.config.VIRAL_KEYWORDS.get('educational', []))
-        entertaining_scores = self._keyword_scores(normalized_text, tokens, self.config.VIRAL_KEYWORDS.get('entertaining', []))
-        money_scores = self._keyword_scores(normalized_text, tokens, self.config.VIRAL_KEYWORDS.get('money', []))
-        urgency_scores = self._keyword_scores(normalized_text, tokens, self.config.VIRAL_KEYWORDS.get('urgency', []))
-
-        hook_score = hook_scores['combined']
-        emotional_score = emotional_scores['combined']
-        controversial_score = controversial_scores['combined']
-        educational_score = educational_scores['combined']
-        entertaining_score = entertaining_scores['combined']
-        money_score = money_scores['combined']
-        urgency_score = urgency_scores['combined']
+        if prepared is None:
+            prepared = self._prepare_text(raw_text)
+
+        # Questions (engaging), numbers/stats (credibility), exclamations (emphasis)
+        text = segment['text']
+        has_question = '?' in text
+        has_numbers = not _DIGITS.isdisjoint(text)
+        has_exclamation = '!' in text
+        bonus_mask = has_exclamation | (has_numbers << 1) | (has_question << 2)
+
+        tokens = prepared['tokens']
+        if not tokens:
+            # Empty/punctuation-only text: no keywords or topics can match
+            return {
+                'counts': self._empty_counts,
+                'flags': (has_question, has_numbers, has_exclamation, 0, 0.0),
+                'bonus_mask': bonus_mask,
+                'meta_topic': 'Umum'
+            }
+
+        stemmed_tokens = prepared['stemmed']
+        keyword_counts = self._scan_keywords(stemmed_tokens, prepared['stemmed_text'])
+
+        # Token vs phrase matches per scored category
+        counts = keyword_counts[self._scored_rows]
 
         # Check for filler words (negative score) - reduce bias for phrases
-        filler_tokens, filler_phrases = self._split_keywords(self.config.FILLER_WORDS)
-        stemmed_text = ' '.join(self._stem_tokens(tokens))
-        filler_token_matches = sum(1 for tok in self._stem_tokens(tokens) if tok in filler_tokens)
-        filler_phrase_matches = self._count_phrase_matches(stemmed_text, filler_phrases)
+        filler_token_matches, filler_phrase_matches = keyword_counts[self._filler_row].tolist()
         filler_count = filler_token_matches + (filler_phrase_matches * 2)
-        filler_penalty = min(filler_count * 0.08, 0.4)
-        
-        # Check for questions (engaging)
-        has_question = '?' in segment['text']
-        question_bonus = 0.2 if has_question else 0
-        
-        # Check for numbers/stats (credibility)
-        has_numbers = bool(re.search(r'\d+', segment['text']))
-        numbers_bonus = 0.15 if has_numbers else 0
-        
-        # Check for exclamation marks (emphasis)
-        has_exclamation = '!' in segment['text']
-        emphasis_bonus = 0.1 if has_exclamation else 0
-        
-        # Meta topic / mental slap detection
-        meta_topic_label, meta_topic_strength = self._detect_meta_topic(raw_text, tokens)
-        mental_slap_score = self._keyword_scores(
-            normalized_text,
-            tokens,
-            getattr(self.config, 'MENTAL_SLAP_KEYWORDS', [])
-        )['combined']
-        rare_topic_score = self._keyword_scores(
-            normalized_text,
-            tokens,
-            getattr(self.config, 'RARE_TOPICS', [])
-        )['combined']
 
-        # Enhanced engagement calculation with money, urgency, and relatability
-        engagement = (
-            hook_score * 0.25 +
-            emotional_score * 0.18 +  # Slightly reduced
-            controversial_score * 0.12 +  # Slightly reduced
-            educational_score * 0.12 +  # Slightly reduced
-            entertaining_score * 0.12 +  # Slightly reduced
-            money_score * 0.15 +  # NEW: Money keywords are highly engaging
-            urgency_score * 0.15 +  # NEW: Urgency creates FOMO
-            meta_topic_strength * 0.12 +
-            mental_slap_score * 0.18 +
-            question_bonus +
-            numbers_bonus +
-            emphasis_bonus -
-            filler_penalty -
-            rare_topic_score * 0.2
+        # Meta topic detection
+        meta_topic_label, meta_topic_strength = self._detect_meta_topic(
+            raw_text, tokens, keyword_counts
         )
-        
-        engagement = max(0, min(1, engagement))  # Clamp to 0-1
-        
+
         return {
-            'hook': hook_score,
-            'emotional': emotional_score,
-            'controversial': controversial_score,
-            'educational': educational_score,
-            'entertaining': entertaining_score,
-            'money': money_score,
-            'urgency': urgency_score,
-            'hook_token': hook_scores['token_score'],
-            'hook_phrase': hook_scores['phrase_score'],
-            'emotional_token': emotional_scores['token_score'],
-            'emotional_phrase': emotional_scores['phrase_score'],
-            'controversial_token': controversial_scores['token_score'],
-            'controversial_phrase': controversial_scores['phrase_score'],
-            'educational_token': educational_scores['token_score'],
-            'educational_phrase': educational_scores['phrase_score'],
-            'entertaining_token': entertaining_scores['token_score'],
-            'entertaining_phrase': entertaining_scores['phrase_score'],
-            'money_token': money_scores['token_score'],
-            'money_phrase': money_scores['phrase_score'],
-            'urgency_token': urgency_scores['token_score'],
-            'urgency_phrase': urgency_scores['phrase_score'],
-            'meta_topic': meta_topic_label,
-            'meta_topic_strength': meta_topic_strength,
-            'mental_slap': mental_slap_score,
-            'rare_topic': rare_topic_score,
-            'engagement': engagement,
-            'has_question': has_question,
-            'has_numbers': has_numbers,
-            'has_exclamation': has_exclamation,
-            'filler_count': filler_count
+            'counts': counts,
+            'flags': (has_question, has_numbers, has_exclamation, filler_count, meta_topic_strength),
+            'bonus_mask': bonus_mask,
+            'meta_topic': meta_topic_label
         }
+
+    def _score_features(self, features: List[Dict]) -> Tuple[List[Dict], Dict[str, np.ndarray]]:
+        """
+        Score extracted segment features with the batched score kernel.
+        Returns per-segment score dicts plus the same scores as columns
+        (one array per field) for vectorized aggregation.
+        """
+        count = len(features)
+        counts = np.zeros((count, len(SCORED_CATEGORIES), 2), dtype=np.int32)
+        flags = np.zeros((count, 5), dtype=np.float64)
+        bonus_masks = np.zeros(count, dtype=np.uint8)
+        for i, feature in enumerate(features):
+            counts[i] = feature['counts']
+            flags[i] = feature['flags']
+            bonus_masks[i] = feature['bonus_mask']
+
+        token_scores, phrase_scores, combined, engagement = _score_kernel(
+            counts, flags, bonus_masks, _BONUS_LUT
+        )
+        token_rows = token_scores.tolist()
+        phrase_rows = phrase_scores.tolist()
+        combined_rows = combined.tolist()
+        engagement_values = engagement.tolist()
+
+        results = []
+        for i, feature in enumerate(features):
+            has_question, has_numbers, has_exclamation, filler_count, meta_topic_strength = feature['flags']
+            scores = {}
+            for j in range(VIRAL_CATEGORY_COUNT):
+                scores[SCORED_CATEGORIES[j]] = combined_rows[i][j]
+            for j in range(VIRAL_CATEGORY_COUNT):
+                category = SCORED_CATEGORIES[j]
+                scores[f'{category}_token'] = token_rows[i][j]
+                scores[f'{category}_phrase'] = phrase_rows[i][j]
+            scores.update({
+                'meta_topic': feature['meta_topic'],
+                'meta_topic_strength': meta_topic_strength,
+                'mental_slap': combined_rows[i][7],
+                'rare_topic': combined_rows[i][8],
+                'engagement': engagement_values[i],
+                'has_question': has_question,
+                'has_numbers': has_numbers,
+                'has_exclamation': has_exclamation,
+                'filler_count': filler_count
+            })
+            results.append(scores)
+
+        columns = {category: combined[:, j] for j, category in enumerate(SCORED_CATEGORIES)}
+        columns.update({
+            'engagement': engagement,
+            'meta_topic_strength': flags[:, 4].copy(),
+            'has_question': flags[:, 0].astype(bool),
+            'has_numbers': flags[:, 1].astype(bool),
+            'has_exclamation': flags[:, 2].astype(bool),
+            'filler_count': flags[:, 3].astype(np.int32)
+        })
+        return results, columns
     
     def _check_keywords(self, words: List[str], keywords: List[str]) -> float:
         """
@@ -1195,19 +1520,22 @@ class AudioAnalyzer:
         matches = sum(1 for word in words if word in (keywords or []))
         return min(matches / 3.0, 1.0)
     
-    def _find_hooks(self, segments: List[Dict]) -> List[Dict]:
+    def _find_hooks(self, segments: List[Dict], scores: Optional[List[Dict]] = None) -> List[Dict]:
         """
         Find potential hooks (strong opening statements)
         Usually in first 10 seconds or after scene changes
+        Reuses per-segment scores from _score_features when given.
         """
         hooks = []
+        hook_keywords = self.config.VIRAL_KEYWORDS['hook'] if scores is None else None
         
-        for segment in segments[:5]:  # Check first 5 segments
-            text = segment.get('text', '')
-            tokens = self._tokenize(text)
-            hook_score = self._keyword_scores(
-                text, tokens, self.config.VIRAL_KEYWORDS['hook']
-            )['combined']
+        for i, segment in enumerate(segments[:5]):  # Check first 5 segments
+            if scores is not None:
+                hook_score = scores[i]['hook']
+            else:
+                text = segment.get('text', '')
+                tokens = self._tokenize(text)
+                hook_score = self._keyword_scores(text, tokens, hook_keywords)['combined']
             
             if hook_score > 0.3:
                 hooks.append({
@@ -1219,15 +1547,18 @@ class AudioAnalyzer:
         
         return sorted(hooks, key=lambda x: x['score'], reverse=True)
     
-    def _find_punchlines(self, segments: List[Dict]) -> List[Dict]:
+    def _find_punchlines(self, segments: List[Dict], scores: Optional[List[Dict]] = None) -> List[Dict]:
         """
         Find punchlines (impactful statements)
+        Reuses per-segment scores from _score_features when given.
         """
         punchlines = []
+        if scores is None:
+            emotional_keywords = self.config.VIRAL_KEYWORDS['emotional']
+            controversial_keywords = self.config.VIRAL_KEYWORDS['controversial']
         
-        for segment in segments:
+        for i, segment in enumerate(segments):
             text = segment.get('text', '')
-            tokens = self._tokenize(text)
             
             # Punchlines often have:
             # - Emotional words
@@ -1235,12 +1566,13 @@ class AudioAnalyzer:
             # - Surprising facts
             # - Strong opinions
             
-            emotional = self._keyword_scores(
-                text, tokens, self.config.VIRAL_KEYWORDS['emotional']
-            )['combined']
-            controversial = self._keyword_scores(
-                text, tokens, self.config.VIRAL_KEYWORDS['controversial']
-            )['combined']
+            if scores is not None:
+                emotional = scores[i]['emotional']
+                controversial = scores[i]['controversial']
+            else:
+                tokens = self._tokenize(text)
+                emotional = self._keyword_scores(text, tokens, emotional_keywords)['combined']
+                controversial = self._keyword_scores(text, tokens, controversial_keywords)['combined']
             
             punchline_score = (emotional + controversial) / 2
             
@@ -1258,23 +1590,35 @@ class AudioAnalyzer:
         
         return sorted(punchlines, key=lambda x: x['score'], reverse=True)
     
-    def _calculate_overall_scores(self, segment_scores: List[Dict]) -> Dict:
+    def _calculate_overall_scores(
+        self,
+        segment_scores: List[Dict],
+        scores_soa: Optional[Dict[str, np.ndarray]] = None
+    ) -> Dict:
         """
         Calculate overall content scores
+        Uses the columnar scores from _score_features when given.
         """
         if not segment_scores:
             return {}
         
-        # Average scores
-        avg_engagement = np.mean([s['scores']['engagement'] for s in segment_scores])
-        avg_hook = np.mean([s['scores']['hook'] for s in segment_scores])
-        avg_emotional = np.mean([s['scores']['emotional'] for s in segment_scores])
+        columns = ('engagement', 'hook', 'emotional', 'educational', 'entertaining', 'controversial')
+        if scores_soa is not None:
+            means = [scores_soa[k].mean() for k in columns]
+        else:
+            # Average scores (one pass into an (N, 6) array instead of 6 list comprehensions)
+            arr = np.empty((len(segment_scores), len(columns)), dtype=np.float64)
+            for i, s in enumerate(segment_scores):
+                scores = s['scores']
+                arr[i] = [scores[k] for k in columns]
+            means = arr.mean(axis=0)
+        avg_engagement, avg_hook, avg_emotional = means[0], means[1], means[2]
         
         # Determine dominant category
         categories = {
-            'educational': np.mean([s['scores']['educational'] for s in segment_scores]),
-            'entertaining': np.mean([s['scores']['entertaining'] for s in segment_scores]),
-            'controversial': np.mean([s['scores']['controversial'] for s in segment_scores]),
+            'educational': means[3],
+            'entertaining': means[4],
+            'controversial': means[5],
             'emotional': avg_emotional
         }
         
@@ -12,10 +12,18 @@ Features:
 
 import os
 import time
-import queue
 import threading
+import itertools
+import functools
+import collections
+import statistics
+import types
+import tempfile
+import shutil
+import multiprocessing
+from contextlib import nullcontext, ExitStack
 from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
-from typing import List, Dict, Callable, Optional, Tuple
+from typing import List, Dict, Callable, Optional, Tuple, Literal
 from dataclasses import dataclass, field
 import subprocess
 import json
@@ -27,6 +35,22 @@ except ImportError:
     torch = None
     TORCH_AVAILABLE = False
 
+try:
+    import psutil
+except ImportError:
+    psutil = None  # pragma: no cover - psutil is in requirements.txt
+
+try:
+    import PyNvVideoCodec as nvc
+    PYNVC_AVAILABLE = True
+except ImportError:
+    nvc = None
+    PYNVC_AVAILABLE = False
+
+
+# Output file name of each exported clip
+CLIP_FILENAME_TEMPLATE = "clip_{clip_num:02d}_score{score_pct:03d}_{duration:.0f}s.mp4"
+
 
 @dataclass
 class ClipTask:
@@ -42,6 +66,8 @@ class ClipTask:
     progress: float = 0.0
     started_at: Optional[float] = None
     completed_at: Optional[float] = None
+    source_info: Optional[Dict] = None  # Video stream info shared by all tasks of the input
+    stream_copied: bool = False  # Exported by a stream copy, without re-encoding
     
     @property
     def duration(self) -> float:
@@ -63,6 +89,8 @@ class BatchJob:
     status: str = 'pending'  # pending, processing, completed, failed, cancelled
     completed_count: int = 0
     failed_count: int = 0
+    source_meta: Optional[Dict] = None  # Full ffprobe JSON of the input video
+    last_finished: Optional[ClipTask] = None  # Most recently finished task (for progress)
     
     @property
     def total_count(self) -> int:
@@ -85,19 +113,32 @@ class BatchProcessor:
     Optimized for GPU-accelerated NVENC encoding.
     """
     
-    def __init__(self, config, gpu_optimizer=None):
+    def __init__(self, config, gpu_optimizer=None,
+                 executor_kind: Literal['thread', 'process', 'auto'] = 'auto'):
         self.config = config
         self.gpu_optimizer = gpu_optimizer
         
+        # 'auto' uses processes only for export functions flagged __needs_process__
+        self.executor_kind = executor_kind
+        
+        # Separate limits for NVENC sessions and CPU-side work (audio remux),
+        # so remuxing never holds an encoder slot
+        self.nvenc_sessions = self._get_nvenc_sessions()
+        self._nvenc_sem = threading.BoundedSemaphore(self.nvenc_sessions)
+        self._cpu_sem = threading.BoundedSemaphore(self._available_cpus())
+        
         # Determine optimal worker count
         self.max_workers = self._get_optimal_workers()
         
-        # Task queue and tracking
-        self.task_queue: queue.Queue = queue.Queue()
+        # Job tracking (single dict get/set/del are atomic under the GIL)
         self.active_jobs: Dict[str, BatchJob] = {}
-        self.completed_jobs: Dict[str, BatchJob] = {}
+        self.completed_jobs: 'collections.OrderedDict[str, BatchJob]' = collections.OrderedDict()
+        self._max_completed = getattr(config, 'MAX_COMPLETED_JOBS_RETAINED', 100)
         
-        # Thread safety
+        # Run when the last active job finishes, e.g. to remove exporter temp files
+        self.batch_cleanups: List[Callable[[], None]] = []
+        
+        # Guards the active -> completed transition and status compare-and-set
         self._lock = threading.Lock()
         
         # Stats
@@ -105,23 +146,135 @@ class BatchProcessor:
         self.total_processing_time = 0.0
         self.avg_clip_time = 0.0
         
+        # Encoded frames/s per worker of recent jobs per job kind, drives max_workers
+        self._initial_workers = self.max_workers
+        self._throughput_history: Dict[Tuple, collections.deque] = {}
+        self._last_throughput: Optional[float] = None
+        
         print(f"   🔧 BatchProcessor initialized with {self.max_workers} parallel workers")
     
+    @staticmethod
+    def _available_cpus() -> int:
+        """
+        CPUs this process may actually use: the affinity mask, further
+        capped by a cgroup v2 CPU quota (e.g. docker --cpus=2).
+        """
+        if hasattr(os, 'sched_getaffinity'):
+            cpus = len(os.sched_getaffinity(0))
+        else:
+            cpus = multiprocessing.cpu_count()
+        
+        try:
+            with open('/sys/fs/cgroup/cpu.max') as f:
+                quota, period = f.read().split()[:2]
+            if quota != 'max':
+                cpus = min(cpus, max(1, int(int(quota) / int(period))))
+        except (OSError, ValueError):
+            pass
+        
+        return cpus
+    
+    def _get_nvenc_sessions(self) -> int:
+        """Number of NVENC sessions the GPU runs without serializing"""
+        if self.gpu_optimizer and self.gpu_optimizer.profile:
+            return self.gpu_optimizer.profile.max_nvenc_sessions
+        return 3
+    
     def _get_optimal_workers(self) -> int:
         """Determine optimal number of parallel workers"""
-        # From config
-        config_workers = getattr(self.config, 'MAX_PARALLEL_EXPORTS', 4)
+        cpu_count = self._available_cpus()
         
-        # From GPU optimizer if available
+        # GPU: exporters gate encodes on the NVENC semaphore, so enough threads
+        # to fill every NVENC session and every CPU remux slot at once
         if self.gpu_optimizer and self.gpu_optimizer.profile:
-            gpu_workers = self.gpu_optimizer.profile.max_parallel_exports
-            return min(config_workers, gpu_workers)
+            return self.nvenc_sessions + cpu_count
         
         # CPU-based fallback
-        import multiprocessing
-        cpu_count = multiprocessing.cpu_count()
+        config_workers = getattr(self.config, 'MAX_PARALLEL_EXPORTS', 4)
         return min(config_workers, max(2, cpu_count // 2))
     
+    def _estimate_worker_vram(self, batch_job: BatchJob) -> int:
+        """
+        Rough VRAM one export needs: NV12 decode surfaces of the source plus
+        encode and lookahead surfaces of the output, at the job's largest size.
+        """
+        presets = getattr(self.config, 'RESOLUTION_PRESETS', {})
+        max_pixels = 0
+        for task in batch_job.tasks:
+            preset = presets.get(task.options.get('resolution'))
+            if preset:
+                max_pixels = max(max_pixels, preset['width'] * preset['height'])
+            if task.source_info:
+                max_pixels = max(max_pixels, task.source_info['width'] * task.source_info['height'])
+        
+        frame_bytes = (max_pixels or 1920 * 1080) * 1.5
+        surfaces = 8 + 4 + getattr(self.config, 'NVENC_LOOKAHEAD', 20)
+        return int(frame_bytes * surfaces)
+    
+    def _get_job_workers(self, batch_job: BatchJob) -> int:
+        """Worker count for one job, capped by free VRAM"""
+        workers = self.max_workers
+        
+        if TORCH_AVAILABLE and torch.cuda.is_available():
+            try:
+                free_vram, _ = torch.cuda.mem_get_info(getattr(self.config, 'GPU_DEVICE', 0))
+                # GPU-bound work is limited by NVENC sessions; the rest of the
+                # pool only waits on CPU slots
+                gpu_workers = max(1, int(free_vram // self._estimate_worker_vram(batch_job)))
+                if gpu_workers < self.nvenc_sessions:
+                    workers = max(1, workers - (self.nvenc_sessions - gpu_workers))
+                    print(f"   ⚠️ Low VRAM ({free_vram / 1024**3:.1f}GB free): {workers} workers")
+            except Exception:
+                pass
+        
+        return min(workers, max(1, batch_job.total_count))
+    
+    @staticmethod
+    def _job_kind(tasks: List[ClipTask]) -> Tuple:
+        """Encode work of a job: its output resolutions and whether hooks are overlaid"""
+        return tuple(sorted({
+            (str(task.options.get('resolution')), bool(task.options.get('hook_text')))
+            for task in tasks
+        }))
+    
+    def _update_throughput(self, batch_job: BatchJob, total_time: float, workers: int) -> None:
+        """
+        Record the job's per-worker encode throughput and compare it with the
+        median of recent jobs of the same kind. Use one worker less for later
+        jobs when it drops below 70% of that (more concurrency than the
+        encoder scales to), and one more, up to the initial count, once it is
+        back at the usual level.
+        """
+        # Stream copies encode nothing and would inflate the frame count
+        encoded = [task for task in batch_job.tasks
+                   if task.status == 'completed' and not task.stream_copied]
+        total_frames = sum(
+            task.duration * (task.source_info['fps'] if task.source_info else 30.0)
+            for task in encoded
+        )
+        if total_frames <= 0 or total_time < 1.0:
+            return
+        
+        per_worker_fps = total_frames / total_time / workers
+        self._last_throughput = per_worker_fps
+        
+        history = self._throughput_history.setdefault(
+            self._job_kind(encoded), collections.deque(maxlen=10)
+        )
+        baseline = statistics.median(history) if history else None
+        history.append(per_worker_fps)
+        if baseline is None:
+            return
+        
+        if per_worker_fps < 0.7 * baseline and self.max_workers > 2:
+            self.max_workers -= 1
+            print(f"   📉 Throughput {per_worker_fps:.0f} fps/worker (usual {baseline:.0f}), "
+                  f"using {self.max_workers} workers")
+        elif per_worker_fps >= 0.9 * baseline and self.max_workers < self._initial_workers:
+            self.max_workers += 1
+            print(f"   📈 Throughput {per_worker_fps:.0f} fps/worker (usual {baseline:.0f}), "
+                  f"using {self.max_workers} workers")
+    
     def create_batch_job(self, job_id: str, clips: List[Dict], input_video: str, output_dir: str) -> BatchJob:
         """
         Create a batch job from a list of clips.
@@ -137,14 +290,22 @@ class BatchProcessor:
         """
         tasks = []
         
+        # Directory prefix joined once; each clip only formats its file name
+        output_prefix = os.path.join(os.fspath(output_dir), '')
+        
+        # Probe the source once for every task of the job
+        source_meta = probe_media(input_video)
+        source_info = video_stream_info(source_meta)
+        
         for i, clip in enumerate(clips):
             # Generate output filename
             clip_num = i + 1
             score = clip.get('viral_score', 0)
             duration = clip.get('end', 0) - clip.get('start', 0)
             
-            output_filename = f"clip_{clip_num:02d}_score{int(score*100):03d}_{duration:.0f}s.mp4"
-            output_path = os.path.join(output_dir, output_filename)
+            output_path = output_prefix + CLIP_FILENAME_TEMPLATE.format(
+                clip_num=clip_num, score_pct=int(score*100), duration=duration
+            )
             
             task = ClipTask(
                 clip_id=clip_num,
@@ -158,14 +319,14 @@ class BatchProcessor:
                     'viral_score': score,
                     'resolution': clip.get('resolution', getattr(self.config, 'DEFAULT_RESOLUTION', '1080p')),
                     **clip.get('export_options', {})
-                }
+                },
+                source_info=source_info
             )
             tasks.append(task)
         
-        batch_job = BatchJob(job_id=job_id, tasks=tasks)
+        batch_job = BatchJob(job_id=job_id, tasks=tasks, source_meta=source_meta)
         
-        with self._lock:
-            self.active_jobs[job_id] = batch_job
+        self.active_jobs[job_id] = batch_job
         
         print(f"   📦 Created batch job '{job_id}' with {len(tasks)} clips")
         return batch_job
@@ -173,7 +334,8 @@ class BatchProcessor:
     def process_batch(self, 
                       job_id: str, 
                       export_function: Callable,
-                      progress_callback: Optional[Callable] = None) -> BatchJob:
+                      progress_callback: Optional[Callable] = None,
+                      group_export_function: Optional[Callable] = None) -> BatchJob:
         """
         Process a batch job using parallel workers.
         
@@ -181,81 +343,118 @@ class BatchProcessor:
             job_id: ID of the batch job to process
             export_function: Function to call for each clip export
                             Signature: export_function(task: ClipTask), returns bool
-            progress_callback: Optional callback for progress updates
+            progress_callback: Optional callback for progress updates, also run for
+                              running clips as their task.progress advances
                               Signature: callback(job_id, completed, total, current_task)
+            group_export_function: Optional function exporting every clip cut from
+                            the same input in one pass (e.g. GPUAwareExporter.export_batch).
+                            When given, one worker runs per input video instead of per clip.
+                            Signature: group_export_function(tasks: List[ClipTask]),
+                            returns Dict[clip_id, bool]
         
         Returns:
             The completed BatchJob
         """
-        with self._lock:
-            if job_id not in self.active_jobs:
-                raise ValueError(f"Job '{job_id}' not found")
-            batch_job = self.active_jobs[job_id]
+        batch_job = self.active_jobs.get(job_id)
+        if batch_job is None:
+            raise ValueError(f"Job '{job_id}' not found")
         
         batch_job.status = 'processing'
         start_time = time.time()
         
+        workers = self._get_job_workers(batch_job)
+        
         print(f"\n{'='*60}")
         print(f"🚀 BATCH PROCESSING: {batch_job.total_count} clips")
-        print(f"   Workers: {self.max_workers}")
+        print(f"   Workers: {workers}")
         print(f"{'='*60}")
         
-        # Use ThreadPoolExecutor for I/O bound FFmpeg operations
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all tasks
-            future_to_task = {}
-            for task in batch_job.tasks:
-                task.status = 'pending'
-                future = executor.submit(self._process_single_task, task, export_function)
-                future_to_task[future] = task
-            
-            # Process completed tasks
-            for future in as_completed(future_to_task):
-                task = future_to_task[future]
-                
-                try:
-                    success = future.result()
-                    if success:
-                        batch_job.completed_count += 1
-                        task.status = 'completed'
-                        print(f"   ✅ Clip {task.clip_id}/{batch_job.total_count}: {os.path.basename(task.output_path)}")
-                    else:
-                        batch_job.failed_count += 1
-                        task.status = 'failed'
-                        print(f"   ❌ Clip {task.clip_id}/{batch_job.total_count}: FAILED")
-                except Exception as e:
-                    batch_job.failed_count += 1
-                    task.status = 'failed'
-                    task.error = str(e)
-                    print(f"   ❌ Clip {task.clip_id}/{batch_job.total_count}: {e}")
+        # Progress is reported at a fixed cadence from one thread, not per clip
+        finished = threading.Event()
+        reporter = threading.Thread(
+            target=self._progress_reporter,
+            args=(batch_job, finished, progress_callback),
+            daemon=True
+        )
+        reporter.start()
+        
+        # Threads for FFmpeg subprocess exports (the GIL is released while waiting),
+        # processes for pure-Python CPU-bound export functions
+        use_processes = self._use_process_pool(group_export_function or export_function)
+        if use_processes:
+            executor = ProcessPoolExecutor(max_workers=workers, mp_context=_process_context())
+        else:
+            executor = ThreadPoolExecutor(max_workers=workers)
+        
+        try:
+            with executor:
+                # Submit all tasks (one future per input video when exporting in groups)
+                future_to_tasks = {}
+                if group_export_function is not None:
+                    grouped_tasks = self._group_tasks_by_input(batch_job.tasks)
+                    for tasks in grouped_tasks.values():
+                        for task in tasks:
+                            task.status = 'pending'
+                        future = self._submit(executor, use_processes, tasks,
+                                              self._process_task_group, tasks, group_export_function)
+                        future_to_tasks[future] = tasks
+                else:
+                    for task in batch_job.tasks:
+                        task.status = 'pending'
+                        future = self._submit(executor, use_processes, [task],
+                                              self._process_single_task, task, export_function)
+                        future_to_tasks[future] = [task]
                 
-                # Progress callback
-                if progress_callback:
+                # Process completed tasks
+                for future in as_completed(future_to_tasks):
+                    tasks = future_to_tasks[future]
+                    error = None
                     try:
-                        progress_callback(
-                            job_id,
-                            batch_job.completed_count + batch_job.failed_count,
-                            batch_job.total_count,
-                            task
-                        )
-                    except:
-                        pass
+                        result = future.result()
+                        if use_processes:
+                            result = _apply_process_result(result, tasks)
+                        results = result if isinstance(result, dict) else {tasks[0].clip_id: result}
+                    except Exception as e:
+                        results = {}
+                        error = str(e)
+                    
+                    for task in tasks:
+                        self._record_task_result(batch_job, task, results.get(task.clip_id, False), error)
+        finally:
+            finished.set()
+            reporter.join()
+            
+            # Temp files shared by exports (hook overlays) go once no other job needs them
+            if self.active_jobs.keys() <= {job_id}:
+                for cleanup in self.batch_cleanups:
+                    cleanup()
         
-        # Finalize job
+        # Finalize job (unless it was cancelled meanwhile)
         total_time = time.time() - start_time
-        batch_job.status = 'completed' if batch_job.failed_count == 0 else 'completed_with_errors'
+        self._transition_status(
+            batch_job, 'processing',
+            'completed' if batch_job.failed_count == 0 else 'completed_with_errors'
+        )
         
         # Update stats
+        self._update_throughput(batch_job, total_time, workers)
         self.total_clips_processed += batch_job.completed_count
         self.total_processing_time += total_time
         if self.total_clips_processed > 0:
             self.avg_clip_time = self.total_processing_time / self.total_clips_processed
         
-        # Move to completed
+        # Cap retained task errors at 1KB
+        for task in batch_job.tasks:
+            if task.error and len(task.error) > 1024:
+                task.error = task.error[:1024]
+        
+        # Move to completed, evicting the oldest retained jobs
         with self._lock:
-            if job_id in self.active_jobs:
-                del self.active_jobs[job_id]
+            self.active_jobs.pop(job_id, None)
             self.completed_jobs[job_id] = batch_job
+            self.completed_jobs.move_to_end(job_id)
+            while len(self.completed_jobs) > self._max_completed:
+                self.completed_jobs.popitem(last=False)
         
         print(f"\n{'='*60}")
         print(f"✅ BATCH COMPLETE")
@@ -267,8 +466,110 @@ class BatchProcessor:
         
         return batch_job
     
-    def _process_single_task(self, task: ClipTask, export_function: Callable) -> bool:
+    def _record_task_result(self,
+                            batch_job: BatchJob,
+                            task: ClipTask,
+                            success: bool,
+                            error: Optional[str]) -> None:
+        """Update job counters and task status for one finished task"""
+        if error is not None:
+            task.error = error
+        task.status = 'completed' if success and error is None else 'failed'
+        
+        # Only the collecting thread writes the counters; the reporter just reads them
+        if task.status == 'completed':
+            task.progress = 100.0
+            batch_job.completed_count += 1
+        else:
+            batch_job.failed_count += 1
+        batch_job.last_finished = task
+    
+    def _progress_reporter(self,
+                           batch_job: BatchJob,
+                           finished: threading.Event,
+                           progress_callback: Optional[Callable],
+                           interval: float = 0.25) -> None:
+        """Report job progress every `interval` seconds until the job finishes"""
+        reported = 0
+        task_progress: Dict[int, float] = {}
+        while True:
+            done_waiting = finished.wait(interval)
+            done = batch_job.completed_count + batch_job.failed_count
+            updates = []
+            
+            # Per-clip FFmpeg progress of running tasks
+            for task in batch_job.tasks:
+                if task.status == 'processing' and task.progress != task_progress.get(task.clip_id, 0.0):
+                    task_progress[task.clip_id] = task.progress
+                    updates.append(task)
+            
+            if done != reported:
+                reported = done
+                print(f"   📊 {done}/{batch_job.total_count} clips ({batch_job.failed_count} failed)")
+                updates.append(batch_job.last_finished)
+            
+            if progress_callback:
+                for task in updates:
+                    try:
+                        progress_callback(batch_job.job_id, done, batch_job.total_count, task)
+                    except:
+                        pass
+            if done_waiting:
+                return
+    
+    def _transition_status(self, batch_job: BatchJob, expected: str, new_status: str) -> bool:
+        """Compare-and-set the job status"""
+        with self._lock:
+            if batch_job.status != expected:
+                return False
+            batch_job.status = new_status
+            return True
+    
+    def _group_tasks_by_input(self, tasks: List[ClipTask]) -> Dict[str, List[ClipTask]]:
+        """Group tasks by source video, each group sorted by start time"""
+        ordered = sorted(tasks, key=lambda t: (t.input_path, t.start_time))
+        return {
+            input_path: list(group)
+            for input_path, group in itertools.groupby(ordered, key=lambda t: t.input_path)
+        }
+    
+    def _use_process_pool(self, export_function: Callable) -> bool:
+        """Pick the executor for a job from executor_kind and the export function"""
+        if self.executor_kind == 'auto':
+            return getattr(export_function, '__needs_process__', False)
+        return self.executor_kind == 'process'
+    
+    def _submit(self, executor, use_processes: bool, tasks: List[ClipTask], worker: Callable, *args):
+        """Submit a worker; in a process pool wrap it so task updates are sent back"""
+        if use_processes:
+            return executor.submit(_run_in_process, worker, tasks, *args)
+        return executor.submit(worker, *args)
+    
+    @staticmethod
+    def _process_task_group(tasks: List[ClipTask], group_export_function: Callable) -> Dict[int, bool]:
+        """Process all tasks sharing one input video"""
+        _memory_guard()
+        started_at = time.time()
+        for task in tasks:
+            task.status = 'processing'
+            task.started_at = started_at
+        
+        try:
+            return group_export_function(tasks)
+        except Exception as e:
+            for task in tasks:
+                task.error = str(e)
+            raise
+        finally:
+            completed_at = time.time()
+            for task in tasks:
+                if task.completed_at is None:
+                    task.completed_at = completed_at
+    
+    @staticmethod
+    def _process_single_task(task: ClipTask, export_function: Callable) -> bool:
         """Process a single clip task"""
+        _memory_guard()
         task.status = 'processing'
         task.started_at = time.time()
         
@@ -283,13 +584,9 @@ class BatchProcessor:
     
     def get_job_status(self, job_id: str) -> Optional[Dict]:
         """Get status of a batch job"""
-        with self._lock:
-            if job_id in self.active_jobs:
-                job = self.active_jobs[job_id]
-            elif job_id in self.completed_jobs:
-                job = self.completed_jobs[job_id]
-            else:
-                return None
+        job = self.active_jobs.get(job_id) or self.completed_jobs.get(job_id)
+        if job is None:
+            return None
         
         return {
             'job_id': job.job_id,
@@ -313,16 +610,17 @@ class BatchProcessor:
     
     def cancel_job(self, job_id: str) -> bool:
         """Cancel a running batch job"""
-        with self._lock:
-            if job_id in self.active_jobs:
-                self.active_jobs[job_id].status = 'cancelled'
-                return True
-        return False
+        job = self.active_jobs.get(job_id)
+        if job is None:
+            return False
+        return self._transition_status(job, 'pending', 'cancelled') or \
+            self._transition_status(job, 'processing', 'cancelled')
     
     def get_stats(self) -> Dict:
         """Get batch processor statistics"""
         return {
             'max_workers': self.max_workers,
+            'per_worker_fps': round(self._last_throughput, 1) if self._last_throughput else None,
             'total_clips_processed': self.total_clips_processed,
             'total_processing_time': round(self.total_processing_time, 2),
             'avg_clip_time': round(self.avg_clip_time, 2),
@@ -337,14 +635,45 @@ class GPUAwareExporter:
     for NVENC encoding with smart fallback to CPU.
     """
     
-    def __init__(self, config, gpu_optimizer=None):
+    # NVENC encoders that may be selected through config.VIDEO_CODEC
+    NVENC_CODECS = ('h264_nvenc', 'hevc_nvenc', 'av1_nvenc')
+    
+    def __init__(self, config, gpu_optimizer=None, nvenc_slots=None, cpu_slots=None, nvenc_sessions=None):
         self.config = config
         self.gpu_optimizer = gpu_optimizer
         self.use_gpu = self._check_gpu_available()
+        self.nvenc_codec = self._select_nvenc_codec() if self.use_gpu else None
+        
+        # Shared semaphores from BatchProcessor (None = unlimited)
+        self.nvenc_slots = nvenc_slots
+        self.cpu_slots = cpu_slots
+        
+        # Concurrent NVENC sessions, so a batched FFmpeg run never opens more
+        # outputs than the GPU has sessions; multi-slot grabs are serialized
+        self.nvenc_sessions = max(1, nvenc_sessions or getattr(config, 'NVENC_MAX_SESSIONS', 2))
+        self._slots_lock = threading.Lock()
         
         # Build FFmpeg base command
         self.ffmpeg_base = self._build_base_command()
         
+        # Resolve export settings once; commands are built per clip
+        self._cfg = self._resolve_settings()
+        self._pre_input = tuple(self.ffmpeg_base) + ('-progress', 'pipe:1', '-nostats')
+        self._pre_codec = self._build_codec_options()
+        self._pre_audio = self._build_audio_options()
+        self._rate_options: Dict[str, Tuple[str, ...]] = {}
+        self._scale_options: Dict[Tuple[int, int], Tuple[str, ...]] = {}
+        
+        # Rendered hook overlays per (text, width, height), in a lazily created temp dir
+        self._hook_images: Dict[Tuple[str, int, int], Optional[str]] = {}
+        self._hook_dir: Optional[str] = None
+        
+        # ffprobe results per input_path (for the stream-copy fast path)
+        self._probe_cache: Dict[str, Optional[Dict]] = {}
+        
+        # NVDEC->NVENC exporter for batches, set by create_batch_processor
+        self.native: Optional['PyNvcExporter'] = None
+        
         print(f"   🎬 GPUAwareExporter: {'GPU (NVENC)' if self.use_gpu else 'CPU'} mode")
     
     def _check_gpu_available(self) -> bool:
@@ -353,16 +682,16 @@ class GPUAwareExporter:
             return False
         
         # Check for NVENC support
-        try:
-            result = subprocess.run(
-                ['ffmpeg', '-hide_banner', '-encoders'],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            return 'h264_nvenc' in result.stdout
-        except:
-            return False
+        return 'h264_nvenc' in _probe_encoders('ffmpeg')
+    
+    def _select_nvenc_codec(self) -> str:
+        """Use the configured NVENC codec (HEVC/AV1) if FFmpeg provides it, else H.264"""
+        codec = getattr(self.config, 'VIDEO_CODEC', 'h264_nvenc')
+        if codec in self.NVENC_CODECS and codec in _probe_encoders('ffmpeg'):
+            return codec
+        if codec in self.NVENC_CODECS:
+            print(f"   ⚠️ {codec} not available in FFmpeg, using h264_nvenc")
+        return 'h264_nvenc'
     
     def _build_base_command(self) -> List[str]:
         """Build base FFmpeg command with optimal settings"""
@@ -379,6 +708,304 @@ class GPUAwareExporter:
         
         return cmd
     
+    def export_timeout(self, task: ClipTask) -> float:
+        """
+        Timeout scaled to the clip: 4x the expected encode time, at least 30s.
+        NVENC runs ~8x realtime, CPU x264 ~1.5x.
+        """
+        encode_speedup = 8.0 if self.use_gpu else 1.5
+        return max(30.0, task.duration / encode_speedup * 4)
+    
+    def encode_slot(self):
+        """Context manager holding an NVENC session slot while encoding"""
+        if self.use_gpu and self.nvenc_slots is not None:
+            return self.nvenc_slots
+        return nullcontext()
+    
+    def encode_slots(self, count: int):
+        """
+        Context manager holding one NVENC session slot per output of a
+        batched FFmpeg run. Slots are taken under a lock, so two batches
+        can't each hold part of what the other waits for.
+        """
+        if count <= 1 or not self.use_gpu or self.nvenc_slots is None:
+            return self.encode_slot()
+        
+        stack = ExitStack()
+        with self._slots_lock:
+            for _ in range(count):
+                stack.enter_context(self.nvenc_slots)
+        return stack
+    
+    def remux_slot(self):
+        """Context manager holding a CPU slot while remuxing"""
+        return self.cpu_slots if self.cpu_slots is not None else nullcontext()
+    
+    def _resolve_settings(self) -> types.SimpleNamespace:
+        """Read every export setting from config once"""
+        config = self.config
+        return types.SimpleNamespace(
+            codec=self.nvenc_codec if self.use_gpu else 'libx264',
+            preset=getattr(config, 'NVENC_PRESET', 'p4') if self.use_gpu else getattr(config, 'CPU_PRESET', 'fast'),
+            tune=getattr(config, 'NVENC_TUNE', 'll'),
+            rc=getattr(config, 'NVENC_RC_MODE', 'vbr'),
+            cq=str(getattr(config, 'NVENC_QUALITY', 23)),
+            bitrate=getattr(config, 'VIDEO_BITRATE', '4M'),
+            resolution=getattr(config, 'DEFAULT_RESOLUTION', '1080p'),
+            presets=getattr(config, 'RESOLUTION_PRESETS', {}),
+            gpu_filters=self.use_gpu and getattr(config, 'USE_GPU_FILTERS', True),
+            # -hwaccel_output_format cuda leaves decoded frames in GPU memory
+            frames_on_gpu=self.use_gpu and getattr(config, 'HWACCEL_DECODER', 'cuda') == 'cuda',
+            hook_enabled=getattr(config, 'HOOK_ENABLED', True),
+            hook_duration=getattr(config, 'HOOK_DURATION', 1.2),
+            hook_font_size=getattr(config, 'HOOK_FONT_SIZE', 48),
+            hook_font_color=getattr(config, 'HOOK_FONT_COLOR', 'white'),
+            hook_bg_color=getattr(config, 'HOOK_BG_COLOR', 'black@0.7'),
+            hook_position=getattr(config, 'HOOK_POSITION', 'center'),
+            audio_codec=getattr(config, 'AUDIO_CODEC', 'aac'),
+            audio_bitrate=getattr(config, 'AUDIO_BITRATE', '192k'),
+            threads=str(getattr(config, 'FFMPEG_THREADS', 4)),
+            stream_copy=getattr(config, 'EXPORT_STREAM_COPY', True),
+            gop_seconds=getattr(config, 'GOP_SECONDS', 2),
+            shared_decode_coverage=getattr(config, 'EXPORT_SHARED_DECODE_COVERAGE', 0.6),
+            keyframe_tolerance=getattr(config, 'KEYFRAME_TOLERANCE', 0.25)
+        )
+    
+    def _build_codec_options(self) -> Tuple[str, ...]:
+        """Video codec options shared by every clip"""
+        cfg = self._cfg
+        if not self.use_gpu:
+            # CPU encoding
+            return ('-c:v', cfg.codec, '-preset', cfg.preset)
+        
+        options = ('-c:v', cfg.codec, '-preset', cfg.preset, '-tune', cfg.tune)
+        
+        # NVENC specific options
+        if cfg.rc == 'vbr':
+            options += ('-rc:v', 'vbr', '-cq', cfg.cq)
+        elif cfg.rc == 'cbr':
+            options += ('-rc:v', 'cbr')
+        return options
+    
+    def _build_audio_options(self) -> Tuple[str, ...]:
+        """Audio (and CPU threading) options shared by every clip"""
+        cfg = self._cfg
+        options = ('-c:a', cfg.audio_codec, '-b:a', cfg.audio_bitrate)
+        
+        # Threading for CPU encoding
+        if not self.use_gpu:
+            options += ('-threads', cfg.threads)
+        return options
+    
+    def _get_rate_options(self, bitrate: str) -> Tuple[str, ...]:
+        """Bitrate options, cached per bitrate string"""
+        options = self._rate_options.get(bitrate)
+        if options is None:
+            options = ('-b:v', bitrate)
+            if self.use_gpu and self._cfg.rc == 'vbr':
+                # Capped VBR: peak at 2x and VBV buffer of 4x the target bitrate
+                bitrate_bps = _bitrate_to_bps(bitrate)
+                options += ('-maxrate', str(2 * bitrate_bps), '-bufsize', str(4 * bitrate_bps))
+            self._rate_options[bitrate] = options
+        return options
+    
+    def _get_gop_options(self, info: Optional[Dict]) -> Tuple[str, ...]:
+        """Explicit NVENC GOP size from the source frame rate"""
+        if not self.use_gpu or not info:
+            return ()
+        return ('-g', str(max(1, round(info['fps'] * self._cfg.gop_seconds))))
+    
+    def _target_size(self, task: ClipTask, info: Optional[Dict]) -> Optional[Tuple[int, int]]:
+        """Output (width, height) if the clip must be scaled, else None"""
+        preset = self._cfg.presets.get(task.options.get('resolution', self._cfg.resolution))
+        if preset is None:
+            return None
+        if info and preset['width'] == info['width'] and preset['height'] == info['height']:
+            # Source already has the target size
+            return None
+        return preset['width'], preset['height']
+    
+    def _scale_chain(self, size: Optional[Tuple[int, int]]) -> str:
+        """
+        Scaling filter chain. With GPU filters frames stay in CUDA memory the
+        whole way (CPU-decoded frames are uploaded even without scaling, for
+        overlay_cuda); CPU scaling downloads CUDA frames explicitly first.
+        """
+        if self._cfg.gpu_filters:
+            upload = '' if self._cfg.frames_on_gpu else 'hwupload_cuda'
+            scale = f"scale_cuda={size[0]}:{size[1]}" if size else ''
+            return ','.join(f for f in (upload, scale) if f)
+        download = 'hwdownload,format=nv12' if self._cfg.frames_on_gpu else ''
+        scale = f"scale={size[0]}:{size[1]}" if size else ''
+        return ','.join(f for f in (download, scale) if f)
+    
+    def _get_scale_options(self, task: ClipTask, info: Optional[Dict] = None) -> Tuple[str, ...]:
+        """Scaling filter options, cached per target size"""
+        size = self._target_size(task, info)
+        if size is None:
+            return ()
+        
+        options = self._scale_options.get(size)
+        if options is None:
+            options = ('-vf', self._scale_chain(size))
+            self._scale_options[size] = options
+        return options
+    
+    def _render_hook_image(self, text: str, width: int, height: int) -> Optional[str]:
+        """
+        Render hook text once into a transparent full-frame PNG, so the
+        overlay itself can be composited on the GPU (drawtext is CPU-only).
+        """
+        key = (text, width, height)
+        if key in self._hook_images:
+            return self._hook_images[key]
+        
+        if self._hook_dir is None:
+            self._hook_dir = tempfile.mkdtemp(prefix='hooks_')
+        index = len(self._hook_images)
+        text_path = os.path.join(self._hook_dir, f'hook_{index}.txt')
+        image_path = os.path.join(self._hook_dir, f'hook_{index}.png')
+        with open(text_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        
+        cfg = self._cfg
+        if cfg.hook_position == 'top':
+            y_pos = "h*0.15"
+        elif cfg.hook_position == 'bottom':
+            y_pos = "h*0.80"
+        else:  # center
+            y_pos = "(h-text_h)/2"
+        
+        textfile = text_path.replace('\\', '/').replace(':', '\\:')
+        cmd = [
+            'ffmpeg', '-y', '-hide_banner', '-loglevel', 'warning',
+            '-f', 'lavfi', '-i', f"color=c=black@0.0:s={width}x{height},format=rgba",
+            '-vf', (
+                f"drawtext=textfile='{textfile}':"
+                f"fontsize={cfg.hook_font_size}:"
+                f"fontcolor={cfg.hook_font_color}:"
+                f"box=1:boxcolor={cfg.hook_bg_color}:boxborderw=20:"
+                f"x=(w-text_w)/2:y={y_pos}"
+            ),
+            '-frames:v', '1',
+            image_path
+        ]
+        try:
+            returncode, stderr_tail = run_ffmpeg(cmd, timeout=30)
+            if returncode != 0:
+                print(f"   ⚠️ Hook render failed: {stderr_tail[-200:]}")
+                image_path = None
+        except Exception as e:
+            print(f"   ⚠️ Hook render failed: {e}")
+            image_path = None
+        
+        self._hook_images[key] = image_path
+        return image_path
+    
+    def remove_hook_images(self) -> None:
+        """Delete the rendered hook overlays and their temp dir"""
+        hook_dir, self._hook_dir = self._hook_dir, None
+        self._hook_images.clear()
+        if hook_dir:
+            shutil.rmtree(hook_dir, ignore_errors=True)
+
+    def _build_hook_command(self, task: ClipTask, info: Optional[Dict]) -> Optional[List[str]]:
+        """
+        Export command compositing the hook overlay: scale_cuda, upload of the
+        pre-rendered PNG and overlay_cuda keep every frame on the GPU.
+        Returns None when the clip has no hook or it can't be rendered.
+        """
+        text = task.options.get('hook_text')
+        if not text or not self._cfg.hook_enabled:
+            return None
+        
+        size = self._target_size(task, info)
+        frame_size = size or ((info['width'], info['height']) if info else None)
+        if frame_size is None:
+            return None
+        image_path = self._render_hook_image(text, *frame_size)
+        if image_path is None:
+            return None
+        
+        chain = self._scale_chain(size)
+        base = f"[0:v]{chain}[base];" if chain else ''
+        base_label = '[base]' if chain else '[0:v]'
+        if self._cfg.gpu_filters:
+            hook = "[1:v]format=yuva420p,hwupload_cuda[hook];"
+            overlay = f"{base_label}[hook]overlay_cuda=x=0:y=0:eof_action=pass[v]"
+        else:
+            hook = "[1:v]format=rgba[hook];"
+            overlay = f"{base_label}[hook]overlay=0:0:eof_action=pass[v]"
+        
+        hook_duration = task.options.get('hook_duration') or self._cfg.hook_duration
+        return [
+            *self._pre_input,
+            '-ss', str(task.start_time), '-i', task.input_path,
+            '-loop', '1', '-t', str(hook_duration), '-i', image_path,
+            '-t', str(task.duration),
+            '-filter_complex', base + hook + overlay,
+            '-map', '[v]', '-map', '0:a:0?',
+            *self._build_output_options(task, scale=False),
+            task.output_path
+        ]
+    
+    def _source_info(self, task: ClipTask) -> Optional[Dict]:
+        """Source video info, from the batch job probe or ffprobe once per input"""
+        if task.source_info is not None:
+            return task.source_info
+        if task.input_path not in self._probe_cache:
+            self._probe_cache[task.input_path] = probe_video(task.input_path)
+        return self._probe_cache[task.input_path]
+    
+    def can_stream_copy(self, task: ClipTask) -> bool:
+        """
+        True when the clip needs no re-encode: no hook overlay, no bitrate
+        override, a target resolution equal to the source, audio already in
+        the output codec and a keyframe within KEYFRAME_TOLERANCE of the start.
+        """
+        options = task.options
+        if not self._cfg.stream_copy or options.get('hook_text') or 'bitrate' in options:
+            return False
+        
+        info = self._source_info(task)
+        if not info or info['codec'] not in STREAM_COPY_CODECS:
+            return False
+        if info.get('audio_codec') not in (None, self._cfg.audio_codec):
+            return False
+        
+        preset = self._cfg.presets.get(options.get('resolution', self._cfg.resolution))
+        if preset is not None and (preset['width'], preset['height']) != (info['width'], info['height']):
+            return False
+        return self._copy_start(task) is not None
+    
+    def _copy_start(self, task: ClipTask) -> Optional[float]:
+        """Keyframe to stream-copy the clip from, None when none is near the start"""
+        info = self._source_info(task)
+        return _nearest_keyframe(
+            task.input_path, task.start_time, self._cfg.keyframe_tolerance,
+            info.get('start_time', 0.0) if info else 0.0
+        )
+    
+    def build_copy_command(self, task: ClipTask) -> List[str]:
+        """
+        Build a stream-copy cut from the keyframe nearest the clip start.
+        Input seeking lands on that keyframe, so video and audio both start
+        there; an output seek with -c copy would start video at the next
+        keyframe instead.
+        """
+        start = self._copy_start(task)
+        if start is None:
+            start = task.start_time
+        return [
+            'ffmpeg', '-y', '-hide_banner', '-loglevel', 'warning',
+            '-progress', 'pipe:1', '-nostats',
+            '-ss', str(start), '-i', task.input_path,
+            '-t', str(task.end_time - start),
+            '-map', '0:v:0', '-map', '0:a:0?', '-c', 'copy',
+            '-avoid_negative_ts', 'make_zero',
+            task.output_path
+        ]
+    
     def build_export_command(self, task: ClipTask) -> List[str]:
         """
         Build complete FFmpeg command for a clip export task.
@@ -389,86 +1016,186 @@ class GPUAwareExporter:
         Returns:
             Complete FFmpeg command as list
         """
-        cmd = self.ffmpeg_base.copy()
+        # Fast path: nothing to re-encode
+        if self.can_stream_copy(task):
+            return self.build_copy_command(task)
+        return self._build_encode_command(task)
+    
+    def _build_encode_command(self, task: ClipTask) -> List[str]:
+        """Re-encoding export command (with the hook overlay when the clip has one)"""
+        hook_cmd = self._build_hook_command(task, self._source_info(task))
+        if hook_cmd is not None:
+            return hook_cmd
         
-        # Input with seek
-        cmd.extend(['-ss', str(task.start_time)])
-        cmd.extend(['-i', task.input_path])
-        cmd.extend(['-t', str(task.duration)])
+        return [
+            *self._pre_input,
+            # Input with seek
+            '-ss', str(task.start_time), '-i', task.input_path, '-t', str(task.duration),
+            *self._build_output_options(task),
+            task.output_path
+        ]
+    
+    def _build_output_options(self, task: ClipTask, scale: bool = True) -> List[str]:
+        """Build codec, bitrate, scaling (unless in a filter graph) and audio options for one output"""
+        info = self._source_info(task)
+        return [
+            *self._pre_codec,
+            *self._get_gop_options(info),
+            *self._get_rate_options(task.options.get('bitrate', self._cfg.bitrate)),
+            *(self._get_scale_options(task, info) if scale else ()),
+            *self._pre_audio
+        ]
+    
+    def build_batch_export_command(self, tasks: List[ClipTask]) -> List[str]:
+        """
+        Build a single FFmpeg command exporting several clips of one input.
+        The input is opened and decoded once; each clip is an output block
+        with its own output-side seek, so NVDEC setup and file I/O are shared.
         
-        # Video codec and settings
-        if self.use_gpu:
-            codec = getattr(self.config, 'VIDEO_CODEC', 'h264_nvenc')
-            preset = getattr(self.config, 'NVENC_PRESET', 'medium')
-            
-            cmd.extend(['-c:v', codec])
-            cmd.extend(['-preset', preset])
+        Args:
+            tasks: ClipTasks sharing the same input_path
             
-            # NVENC specific options
-            rc_mode = getattr(self.config, 'NVENC_RC_MODE', 'vbr')
-            if rc_mode == 'vbr':
-                cmd.extend(['-rc', 'vbr'])
-                cmd.extend(['-cq', str(getattr(self.config, 'NVENC_QUALITY', 23))])
-            elif rc_mode == 'cbr':
-                cmd.extend(['-rc', 'cbr'])
-        else:
-            # CPU encoding
-            preset = getattr(self.config, 'CPU_PRESET', 'fast')
-            cmd.extend(['-c:v', 'libx264'])
-            cmd.extend(['-preset', preset])
+        Returns:
+            Complete FFmpeg command as list
+        """
+        cmd = list(self._pre_input)
         
-        # Bitrate
-        bitrate = task.options.get('bitrate', getattr(self.config, 'VIDEO_BITRATE', '4M'))
-        cmd.extend(['-b:v', bitrate])
+        # Skip straight to the first clip, later seeks are relative to it
+        first_start = min(task.start_time for task in tasks)
+        cmd.extend(['-ss', str(first_start)])
+        cmd.extend(['-i', tasks[0].input_path])
         
-        # Resolution
-        resolution = task.options.get('resolution', getattr(self.config, 'DEFAULT_RESOLUTION', '1080p'))
-        presets = getattr(self.config, 'RESOLUTION_PRESETS', {})
-        if resolution in presets:
-            width = presets[resolution]['width']
-            height = presets[resolution]['height']
+        for task in tasks:
+            cmd.extend(['-ss', str(task.start_time - first_start)])
+            cmd.extend(['-t', str(task.duration)])
+            cmd.extend(self._build_output_options(task))
+            cmd.append(task.output_path)
+        
+        return cmd
+    
+    def export_batch(self, tasks: List[ClipTask]) -> Dict[int, bool]:
+        """
+        Export all clips cut from one input video with as few FFmpeg
+        processes as the NVENC sessions and clip spacing allow (see
+        _split_batch), or one PyNvVideoCodec decode pass for clips keeping
+        the source size when the native exporter is set. Clips a batched run
+        fails to produce are retried one by one.
+        
+        Args:
+            tasks: ClipTasks sharing the same input_path
             
-            if self.use_gpu and getattr(self.config, 'USE_GPU_FILTERS', False):
-                # GPU scaling
-                cmd.extend(['-vf', f'scale_cuda={width}:{height}'])
+        Returns:
+            Dict mapping clip_id to success
+        """
+        # Stream-copy clips are cheap cuts and hook clips need their own
+        # overlay input, keep both out of the shared decode
+        results = {
+            task.clip_id: self.export_clip(task)
+            for task in tasks
+            if self.can_stream_copy(task) or (task.options.get('hook_text') and self._cfg.hook_enabled)
+        }
+        tasks = [task for task in tasks if task.clip_id not in results]
+        
+        if self.native is not None and tasks:
+            results.update(self.native.export_native(tasks))
+            tasks = [task for task in tasks if task.clip_id not in results]
+        
+        for group in self._split_batch(tasks):
+            if len(group) == 1:
+                results[group[0].clip_id] = self.export_clip(group[0])
             else:
-                # CPU scaling
-                cmd.extend(['-vf', f'scale={width}:{height}'])
+                results.update(self._export_group(group))
         
-        # Audio
-        cmd.extend(['-c:a', getattr(self.config, 'AUDIO_CODEC', 'aac')])
-        cmd.extend(['-b:a', getattr(self.config, 'AUDIO_BITRATE', '192k')])
+        return results
+    
+    def _split_batch(self, tasks: List[ClipTask]) -> List[List[ClipTask]]:
+        """
+        Split the clips of one input into batched FFmpeg runs, in start order.
+        A run gets at most one output per NVENC session (each output opens its
+        own encoder), and a clip only joins it while the run's clips cover at
+        least EXPORT_SHARED_DECODE_COVERAGE of the span decoded for them, so
+        sparse clips are seeked to one by one instead.
+        """
+        coverage_needed = self._cfg.shared_decode_coverage
+        if coverage_needed <= 0:
+            return [[task] for task in tasks]
+        max_outputs = self.nvenc_sessions if self.use_gpu else len(tasks)
         
-        # Threading for CPU encoding
-        if not self.use_gpu:
-            threads = getattr(self.config, 'FFMPEG_THREADS', 4)
-            cmd.extend(['-threads', str(threads)])
+        groups: List[List[ClipTask]] = []
+        for task in sorted(tasks, key=lambda t: t.start_time):
+            group = groups[-1] if groups else None
+            if group and len(group) < max_outputs:
+                span = max(task.end_time, *(t.end_time for t in group)) - group[0].start_time
+                covered = task.duration + sum(t.duration for t in group)
+                if span > 0 and covered / span >= coverage_needed:
+                    group.append(task)
+                    continue
+            groups.append([task])
+        return groups
+    
+    def _export_group(self, tasks: List[ClipTask]) -> Dict[int, bool]:
+        """One FFmpeg run for a group from _split_batch, failed clips retried one by one"""
+        results = {}
+        cmd = self.build_batch_export_command(tasks)
+        error = None
+        try:
+            with self.encode_slots(len(tasks)):
+                returncode, stderr_tail = run_ffmpeg(cmd, timeout=sum(self.export_timeout(t) for t in tasks))
+            if returncode != 0:
+                error = stderr_tail
+        except subprocess.TimeoutExpired:
+            error = "Export timeout"
+        except Exception as e:
+            error = str(e)
         
-        # Output
-        cmd.append(task.output_path)
+        for task in tasks:
+            if error is None and os.path.exists(task.output_path) and os.path.getsize(task.output_path) > 1000:
+                results[task.clip_id] = True
+            else:
+                results[task.clip_id] = self.export_clip(task)
         
-        return cmd
+        if error:
+            print(f"   ⚠️ Batched export failed, retried clips individually: {error[:100]}")
+        
+        return results
     
-    def export_clip(self, task: ClipTask) -> bool:
+    def export_clip(self, task: ClipTask, on_progress: Optional[Callable] = None) -> bool:
         """
         Export a single clip using optimized FFmpeg command.
         
         Args:
             task: ClipTask to export
+            on_progress: Optional callback(task) run whenever task.progress
+                         (0-100, parsed from FFmpeg -progress output) changes
             
         Returns:
             True if successful, False otherwise
         """
-        cmd = self.build_export_command(task)
+        def report(out_time: float):
+            if task.duration > 0:
+                task.progress = min(100.0, out_time / task.duration * 100)
+            if on_progress:
+                on_progress(task)
         
+        # Stream copies only use the CPU; FFmpeg encodes and muxes in one
+        # process, so an encode holds its NVENC slot throughout
+        if self.can_stream_copy(task):
+            if self._run_export(task, self.build_copy_command(task), self.remux_slot(), report):
+                task.stream_copied = True
+                return True
+            print(f"   ⚠️ Stream copy of clip {task.clip_id} failed, re-encoding...")
+            task.error = None
+            task.progress = 0.0
+        
+        return self._run_export(task, self._build_encode_command(task), self.encode_slot(), report)
+    
+    def _run_export(self, task: ClipTask, cmd: List[str], slot, report: Callable[[float], None]) -> bool:
+        """Run one export command holding `slot`; sets task.error on failure"""
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                timeout=300  # 5 minute timeout
-            )
+            with slot:
+                returncode, stderr_tail = run_ffmpeg(cmd, timeout=self.export_timeout(task), on_progress=report)
             
-            if result.returncode == 0 and os.path.exists(task.output_path):
+            if returncode == 0 and os.path.exists(task.output_path):
                 # Verify file is valid
                 file_size = os.path.getsize(task.output_path)
                 if file_size > 1000:  # At least 1KB
@@ -477,7 +1204,7 @@ class GPUAwareExporter:
                     task.error = "Output file too small"
                     return False
             else:
-                task.error = result.stderr.decode('utf-8', errors='ignore')[:500]
+                task.error = stderr_tail
                 return False
                 
         except subprocess.TimeoutExpired:
@@ -488,6 +1215,468 @@ class GPUAwareExporter:
             return False
 
 
+# System RAM gates: pause starting exports at MEMORY_PAUSE_PERCENT usage,
+# resume below MEMORY_RESUME_PERCENT
+MEMORY_PAUSE_PERCENT = 85.0
+MEMORY_RESUME_PERCENT = 75.0
+
+
+def _memory_guard(max_wait: float = 60.0) -> None:
+    """
+    Block a worker before it starts an export while system RAM is under
+    pressure. Gives up after max_wait seconds so a job can't stall forever.
+    """
+    if psutil is None or psutil.virtual_memory().percent < MEMORY_PAUSE_PERCENT:
+        return
+    
+    print(f"   ⏸️ RAM above {MEMORY_PAUSE_PERCENT:.0f}%, waiting before next export")
+    deadline = time.time() + max_wait
+    while time.time() < deadline:
+        time.sleep(0.5)
+        if psutil.virtual_memory().percent < MEMORY_RESUME_PERCENT:
+            return
+
+
+@functools.lru_cache(maxsize=1)
+def _probe_encoders(ffmpeg_path: str) -> frozenset:
+    """
+    Encoder names from `ffmpeg -encoders`, scanned once per process.
+    Call _probe_encoders.cache_clear() to rescan (e.g. after changing FFmpeg).
+    """
+    encoders = set()
+    try:
+        result = subprocess.run(
+            [ffmpeg_path, '-hide_banner', '-encoders'],
+            capture_output=True,
+            text=True,
+            timeout=10
+        )
+        for line in result.stdout.splitlines():
+            parts = line.split()
+            # Encoder lines look like " V....D h264_nvenc  NVIDIA NVENC H.264 encoder"
+            if len(parts) >= 2 and len(parts[0]) == 6:
+                encoders.add(parts[1])
+    except Exception:
+        pass
+    return frozenset(encoders)
+
+
+def _process_context():
+    """Multiprocessing context for the process pool (forkserver where available)"""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+# ClipTask fields a worker sets, copied back from process-pool workers
+_WORKER_TASK_FIELDS = ('error', 'started_at', 'completed_at', 'progress', 'stream_copied')
+
+
+def _run_in_process(worker: Callable, tasks: List[ClipTask], *args) -> Tuple[object, List[Dict]]:
+    """
+    Process-pool entry point. Workers mutate their pickled copies of the
+    tasks, so return those fields alongside the result (or raised exception).
+    """
+    try:
+        result = worker(*args)
+    except Exception as e:
+        result = e
+    return result, [{name: getattr(task, name) for name in _WORKER_TASK_FIELDS} for task in tasks]
+
+
+def _apply_process_result(payload: Tuple[object, List[Dict]], tasks: List[ClipTask]):
+    """Copy worker task fields onto the parent's tasks and unwrap the result"""
+    result, updates = payload
+    for task, fields in zip(tasks, updates):
+        for name, value in fields.items():
+            setattr(task, name, value)
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+def run_ffmpeg(cmd: List[str],
+               timeout: float,
+               on_progress: Optional[Callable[[float], None]] = None,
+               max_error_lines: int = 100) -> Tuple[int, str]:
+    """
+    Run an FFmpeg command, keeping only the last lines of stderr in memory.
+    stderr is drained by a reader thread into a bounded deque so verbose
+    encoders can't grow memory across parallel workers. When on_progress is
+    given, stdout is parsed as `-progress pipe:1` output and on_progress is
+    called with the encoded position in seconds; otherwise it is discarded.
+    
+    Returns:
+        Tuple of (returncode, stderr tail capped at 500 characters)
+    
+    Raises:
+        subprocess.TimeoutExpired: the process was stopped after `timeout` seconds
+            (SIGTERM first so FFmpeg can release NVENC, then SIGKILL)
+    """
+    tail = collections.deque(maxlen=max_error_lines)
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE if on_progress else subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        bufsize=0
+    )
+    
+    def drain():
+        for line in proc.stderr:
+            tail.append(line.decode('utf-8', errors='ignore').rstrip())
+    
+    def read_progress():
+        for line in proc.stdout:
+            if line.startswith(b'out_time_us='):
+                try:
+                    on_progress(int(line[12:]) / 1e6)
+                except ValueError:
+                    pass  # 'N/A' before the first frame
+    
+    readers = [threading.Thread(target=drain, daemon=True)]
+    if on_progress:
+        readers.append(threading.Thread(target=read_progress, daemon=True))
+    for reader in readers:
+        reader.start()
+    try:
+        returncode = proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.terminate()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+        raise
+    finally:
+        for reader in readers:
+            reader.join(timeout=5)
+        proc.stderr.close()
+        if proc.stdout:
+            proc.stdout.close()
+    
+    return returncode, '\n'.join(tail)[-500:]
+
+
+def probe_media(video_path: str) -> Optional[Dict]:
+    """Run ffprobe once and return its full JSON (streams and format), or None on failure"""
+    cmd = [
+        'ffprobe', '-v', 'error',
+        '-print_format', 'json',
+        '-show_streams', '-show_format',
+        video_path
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        return json.loads(result.stdout)
+    except Exception:
+        return None
+
+
+def video_stream_info(meta: Optional[Dict]) -> Optional[Dict]:
+    """
+    Extract the first video stream from ffprobe JSON.
+    Returns dict with codec, width, height, fps (float), fps_str, time_base
+    (seconds per PTS tick), start_time (seconds), vfr (the real frame
+    rate differs from the average, i.e. variable frame rate) and
+    audio_codec (None without audio), or None.
+    """
+    if not meta:
+        return None
+    try:
+        stream = next(s for s in meta.get('streams', []) if s.get('codec_type') == 'video')
+        fps_str = stream.get('avg_frame_rate') or '30/1'
+        num, _, den = fps_str.partition('/')
+        fps = float(num) / float(den or 1)
+        if fps <= 0:
+            fps_str, fps = '30/1', 30.0
+        tb_num, _, tb_den = (stream.get('time_base') or '1/90000').partition('/')
+        r_num, _, r_den = (stream.get('r_frame_rate') or fps_str).partition('/')
+        r_fps = float(r_num) / float(r_den or 1)
+        return {
+            'codec': stream.get('codec_name', ''),
+            'width': int(stream['width']),
+            'height': int(stream['height']),
+            'fps': fps,
+            'fps_str': fps_str,
+            'time_base': float(tb_num) / float(tb_den or 1),
+            'start_time': float(stream.get('start_time') or 0.0),
+            'vfr': r_fps > 0 and abs(r_fps - fps) > 0.01 * fps,
+            'audio_codec': next(
+                (s.get('codec_name') for s in meta.get('streams', []) if s.get('codec_type') == 'audio'), None
+            )
+        }
+    except Exception:
+        return None
+
+
+def probe_video(video_path: str) -> Optional[Dict]:
+    """Probe the first video stream of a file (see video_stream_info)"""
+    return video_stream_info(probe_media(video_path))
+
+
+@functools.lru_cache(maxsize=1024)
+def _nearest_keyframe(video_path: str, time: float, tolerance: float, offset: float = 0.0) -> Optional[float]:
+    """
+    Keyframe (clip time, seconds) within `tolerance` of `time`, or None.
+    Only packets around `time` are read; `offset` is the stream start_time
+    that packet timestamps include but FFmpeg seeks don't.
+    """
+    cmd = [
+        'ffprobe', '-v', 'error',
+        '-select_streams', 'v:0',
+        '-read_intervals', f'{max(0.0, time - tolerance) + offset}%{time + tolerance + offset}',
+        '-show_entries', 'packet=pts_time,flags',
+        '-of', 'csv=p=0',
+        video_path
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+    except Exception:
+        return None
+    
+    keyframes = []
+    for line in result.stdout.splitlines():
+        pts, _, flags = line.partition(',')
+        if flags.startswith('K'):
+            try:
+                keyframes.append(float(pts) - offset)
+            except ValueError:
+                pass
+    nearest = min(keyframes, key=lambda kf: abs(kf - time), default=None)
+    if nearest is None or abs(nearest - time) > tolerance:
+        return None
+    return nearest
+
+
+# Source video codecs that can be stream-copied into an MP4 clip
+STREAM_COPY_CODECS = ('h264', 'hevc')
+
+# Elementary stream extensions FFmpeg recognizes for each NVENC codec
+RAW_STREAM_SUFFIXES = {'h264': '.h264', 'hevc': '.hevc', 'av1': '.obu'}
+
+
+class PyNvcExporter:
+    """
+    Batched exporter built on PyNvVideoCodec.
+    Decodes each source video once on NVDEC and hands the GPU-resident frames
+    straight to one NVENC session per clip cut from it, so there is no
+    per-clip FFmpeg process, re-seek or hardware context setup. FFmpeg only
+    stream-copies the span the clips cover out of the source (so decoding
+    starts at the keyframe before the first clip) and muxes the source
+    audio back in.
+    
+    PyNvVideoCodec has no scaler, so only clips that keep the source size
+    go through NVDEC->NVENC, and only from constant frame rate sources (the
+    raw streams carry no timestamps); GPUAwareExporter.export_batch exports
+    the rest.
+    """
+    
+    def __init__(self, config, fallback: 'GPUAwareExporter'):
+        self.config = config
+        self.fallback = fallback
+        self.gpu_id = getattr(config, 'GPU_DEVICE', 0)
+        self.codec = {'hevc_nvenc': 'hevc', 'av1_nvenc': 'av1'}.get(fallback.nvenc_codec, 'h264')
+        
+        print("   🎬 PyNvcExporter: NVDEC->NVENC batched")
+    
+    def export_native(self, tasks: List[ClipTask]) -> Dict[int, bool]:
+        """
+        Export the clips that keep the source size in as few decode passes
+        as the NVENC sessions allow (see _plan_passes).
+        
+        Args:
+            tasks: ClipTasks sharing the same input_path
+            
+        Returns:
+            Dict mapping clip_id to True for every clip exported; clips
+            missing from it are left to the caller
+        """
+        if not tasks:
+            return {}
+        
+        info = tasks[0].source_info or probe_video(tasks[0].input_path)
+        # Raw NVENC streams are muxed at a fixed -framerate, which would drift
+        # against the audio on variable frame rate sources
+        if info and info.get('vfr'):
+            return {}
+        native = [task for task in tasks if info and self._keeps_source_size(task, info)]
+        if not native:
+            return {}
+        
+        results = {}
+        for clips in self._plan_passes(native):
+            try:
+                results.update(self._transcode_group(clips, info))
+            except Exception as e:
+                print(f"   ⚠️ PyNvVideoCodec export failed ({e}), falling back to FFmpeg")
+        return {clip_id: True for clip_id, success in results.items() if success}
+    
+    def _plan_passes(self, tasks: List[ClipTask]) -> List[List[ClipTask]]:
+        """
+        Assign clips to decode passes so no pass has more clips encoding at
+        once than there are NVENC sessions (each open clip is one encoder).
+        """
+        sessions = self.fallback.nvenc_sessions
+        passes: List[List[ClipTask]] = []
+        for task in sorted(tasks, key=lambda t: t.start_time):
+            for clips in passes:
+                # Clips of the pass still encoding when this one starts
+                if sum(1 for clip in clips if clip.end_time > task.start_time) < sessions:
+                    clips.append(task)
+                    break
+            else:
+                passes.append([task])
+        return passes
+    
+    def _keeps_source_size(self, task: ClipTask, info: Dict) -> bool:
+        """True when the export needs no scaling"""
+        resolution = task.options.get('resolution', getattr(self.config, 'DEFAULT_RESOLUTION', '1080p'))
+        preset = getattr(self.config, 'RESOLUTION_PRESETS', {}).get(resolution)
+        if not preset:
+            return True
+        return preset['width'] == info['width'] and preset['height'] == info['height']
+    
+    def _create_encoder(self, task: ClipTask, info: Dict):
+        """Create an NVENC session for one clip"""
+        bitrate = task.options.get('bitrate', getattr(self.config, 'VIDEO_BITRATE', '4M'))
+        return nvc.CreateEncoder(
+            info['width'], info['height'], 'NV12', False,  # device-memory input
+            codec=self.codec,
+            preset=getattr(self.config, 'NVENC_PRESET', 'p4').upper(),
+            rc=getattr(self.config, 'NVENC_RC_MODE', 'vbr'),
+            cq=str(getattr(self.config, 'NVENC_QUALITY', 23)),
+            bitrate=str(_bitrate_to_bps(bitrate)),
+            fps=str(round(info['fps']))
+        )
+    
+    def _cut_source(self, tasks: List[ClipTask], cut_path: str) -> None:
+        """
+        Stream-copy the video the clips cover into cut_path. The input seek
+        lands on the keyframe before the first clip and -copyts keeps the
+        source timestamps, so frames are still matched on source time.
+        """
+        start = tasks[0].start_time
+        span = max(task.end_time for task in tasks) - start
+        cmd = [
+            'ffmpeg', '-y', '-hide_banner', '-loglevel', 'warning',
+            '-ss', str(start), '-t', str(span + 1.0), '-i', tasks[0].input_path,
+            '-map', '0:v:0', '-c', 'copy', '-copyts',
+            cut_path
+        ]
+        returncode, stderr_tail = run_ffmpeg(cmd, timeout=max(30.0, span))
+        if returncode != 0:
+            raise RuntimeError(stderr_tail or "source cut failed")
+    
+    def _transcode_group(self, tasks: List[ClipTask], info: Dict) -> Dict[int, bool]:
+        """Single decode pass feeding every clip's encoder, then mux audio"""
+        pending = sorted(tasks, key=lambda t: t.start_time)
+        active = []  # (task, encoder, raw_path, handle)
+        finished = []  # (task, raw_path)
+        temp_paths = []  # source cut and raw streams, removed however the export ends
+        
+        fd, cut_path = tempfile.mkstemp(suffix='.mkv')
+        os.close(fd)
+        temp_paths.append(cut_path)
+        
+        try:
+            self._cut_source(pending, cut_path)
+            cut_info = probe_video(cut_path) or info
+            
+            with self.fallback.encode_slots(min(len(pending), self.fallback.nvenc_sessions)):
+                demuxer = nvc.CreateDemuxer(filename=cut_path)
+                decoder = nvc.CreateDecoder(
+                    gpuid=self.gpu_id,
+                    codec=demuxer.GetNvCodecId(),
+                    cudacontext=0,
+                    cudastream=0,
+                    usedevicememory=True
+                )
+                
+                def close(entry):
+                    task, encoder, raw_path, handle = entry
+                    try:
+                        handle.write(bytearray(encoder.EndEncode()))
+                    finally:
+                        handle.close()
+                    finished.append((task, raw_path))
+                
+                try:
+                    for packet in demuxer:
+                        for frame in decoder.Decode(packet):
+                            # Presentation time from the decoder's PTS, right for VFR sources too
+                            timestamp = frame.timestamp * cut_info['time_base'] - info['start_time']
+                            
+                            # Start encoders for clips that begin at this frame
+                            while pending and pending[0].start_time <= timestamp:
+                                task = pending.pop(0)
+                                fd, raw_path = tempfile.mkstemp(suffix=RAW_STREAM_SUFFIXES[self.codec])
+                                temp_paths.append(raw_path)
+                                active.append((task, self._create_encoder(task, info), raw_path, os.fdopen(fd, 'wb')))
+                            
+                            for entry in list(active):
+                                task, encoder, _, handle = entry
+                                if timestamp >= task.end_time:
+                                    active.remove(entry)
+                                    close(entry)
+                                else:
+                                    handle.write(bytearray(encoder.Encode(frame)))
+                        
+                        if not pending and not active:
+                            break
+                finally:
+                    while active:
+                        close(active.pop())
+            
+            results = {}
+            for task, raw_path in finished:
+                try:
+                    with self.fallback.remux_slot():
+                        results[task.clip_id] = self._mux_audio(task, raw_path, info)
+                finally:
+                    task.completed_at = time.time()
+            return results
+        finally:
+            for path in temp_paths:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+    
+    def _mux_audio(self, task: ClipTask, raw_path: str, info: Dict) -> bool:
+        """Copy the encoded video and add the clip's audio from the source"""
+        cmd = [
+            'ffmpeg', '-y', '-hide_banner', '-loglevel', 'warning',
+            '-framerate', info['fps_str'], '-i', raw_path,
+            '-ss', str(task.start_time), '-t', str(task.duration), '-i', task.input_path,
+            '-map', '0:v:0', '-map', '1:a:0?',
+            '-c:v', 'copy',
+            '-c:a', getattr(self.config, 'AUDIO_CODEC', 'aac'),
+            '-b:a', getattr(self.config, 'AUDIO_BITRATE', '192k'),
+            '-shortest',
+            task.output_path
+        ]
+        try:
+            returncode, stderr_tail = run_ffmpeg(cmd, timeout=self.fallback.export_timeout(task))
+        except subprocess.TimeoutExpired:
+            task.error = "Export timeout"
+            return False
+        if returncode == 0 and os.path.exists(task.output_path) and os.path.getsize(task.output_path) > 1000:
+            return True
+        task.error = stderr_tail or "Output file too small"
+        return False
+
+
+def _bitrate_to_bps(bitrate: str) -> int:
+    """Convert FFmpeg-style bitrate strings ('4M', '800k') to bits per second"""
+    value = str(bitrate).strip().lower()
+    multiplier = 1
+    if value.endswith('m'):
+        multiplier, value = 1_000_000, value[:-1]
+    elif value.endswith('k'):
+        multiplier, value = 1_000, value[:-1]
+    return int(float(value) * multiplier)
+
+
 def create_batch_processor(config, gpu_optimizer=None) -> Tuple[BatchProcessor, GPUAwareExporter]:
     """
     Factory function to create BatchProcessor and GPUAwareExporter.
@@ -495,7 +1684,19 @@ def create_batch_processor(config, gpu_optimizer=None) -> Tuple[BatchProcessor,
     Returns:
         Tuple of (BatchProcessor, GPUAwareExporter)
     """
-    exporter = GPUAwareExporter(config, gpu_optimizer)
     processor = BatchProcessor(config, gpu_optimizer)
+    exporter = GPUAwareExporter(
+        config,
+        gpu_optimizer,
+        nvenc_slots=processor._nvenc_sem,
+        cpu_slots=processor._cpu_sem,
+        nvenc_sessions=processor.nvenc_sessions
+    )
+    
+    processor.batch_cleanups.append(exporter.remove_hook_images)
+    
+    # Batches decode once on NVDEC when PyNvVideoCodec is installed
+    if PYNVC_AVAILABLE and exporter.use_gpu and getattr(config, 'USE_PYNVC_EXPORTER', True):
+        exporter.native = PyNvcExporter(config, exporter)
     
     return processor, exporter
@@ -7,14 +7,210 @@ Features:
 """
 
 import os
+import re
+import bisect
+import functools
+import itertools
+import shutil
 import subprocess
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import json
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, NamedTuple
 from dataclasses import dataclass
 
+import numpy as np
 
-@dataclass
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional fast JSON parser
+    orjson = None
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - numba ships with openai-whisper
+    njit = None
+
+
+# ffprobe JSON is parsed straight from bytes (both parsers accept them)
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _jit(func):
+    """Compile with Numba when available; otherwise run as plain Python."""
+    if njit is None:
+        return func
+    return njit(cache=True)(func)
+
+
+class MediaInfo(NamedTuple):
+    """ffprobe summary shared by SilenceRemover and VerticalFormatter"""
+    duration: float = 0.0
+    width: int = 0
+    height: int = 0
+    video_codec: str = ''
+    audio_codec: str = ''
+    pix_fmt: str = ''
+    fps: float = 0.0
+
+
+@functools.lru_cache(maxsize=512)
+def _probe_cached(video_path: str, mtime_ns: int, size: int) -> MediaInfo:
+    cmd = [
+        'ffprobe', '-v', 'error',
+        '-show_entries', 'format=duration:stream=codec_type,codec_name,width,height,pix_fmt,r_frame_rate',
+        '-of', 'json',
+        video_path
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, timeout=30)
+        data = _json_loads(result.stdout)
+    except Exception:
+        return MediaInfo()
+    
+    info = {}
+    try:
+        info['duration'] = float(data.get('format', {}).get('duration', 0))
+    except (TypeError, ValueError):
+        pass
+    for stream in data.get('streams', []):
+        if stream.get('codec_type') == 'video' and 'video_codec' not in info:
+            info['video_codec'] = stream.get('codec_name', '')
+            info['width'] = int(stream.get('width', 0))
+            info['height'] = int(stream.get('height', 0))
+            info['pix_fmt'] = stream.get('pix_fmt', '')
+            num, _, den = (stream.get('r_frame_rate') or '0/1').partition('/')
+            try:
+                info['fps'] = float(num) / float(den or 1)
+            except (ValueError, ZeroDivisionError):
+                pass
+        elif stream.get('codec_type') == 'audio' and 'audio_codec' not in info:
+            info['audio_codec'] = stream.get('codec_name', '')
+    return MediaInfo(**info)
+
+
+def _probe(video_path: str) -> MediaInfo:
+    """
+    Probe a file once per version; later calls for the same unchanged path
+    (duration, dimensions, codecs) are served from cache.
+    """
+    try:
+        st = os.stat(video_path)
+    except OSError:
+        return MediaInfo()
+    return _probe_cached(video_path, st.st_mtime_ns, st.st_size)
+
+
+def _run_ffmpeg(cmd: List[str], timeout: float) -> Tuple[int, str]:
+    """
+    Run an FFmpeg command with stats off and errors-only logging.
+    stdout is discarded; stderr stays tiny at this log level, so it is kept
+    for failure messages without risking a full pipe stalling the encoder.
+    Returns (returncode, stderr text).
+    """
+    cmd = [cmd[0], '-nostats', '-loglevel', 'error', *cmd[1:]]
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=timeout)
+    return result.returncode, result.stderr.decode(errors='replace').strip()
+
+
+@functools.lru_cache(maxsize=1)
+def _probe_filters(ffmpeg_path: str = 'ffmpeg') -> frozenset:
+    """
+    Filter names from `ffmpeg -filters`, scanned once per process.
+    Call _probe_filters.cache_clear() to rescan (e.g. after changing FFmpeg).
+    """
+    filters = set()
+    try:
+        result = subprocess.run(
+            [ffmpeg_path, '-hide_banner', '-filters'],
+            capture_output=True,
+            text=True,
+            timeout=10
+        )
+        for line in result.stdout.splitlines():
+            parts = line.split()
+            # Filter lines look like " ... scale_npp  V->V  NVIDIA Performance Primitives video scaling"
+            if len(parts) >= 3 and '->' in parts[2]:
+                filters.add(parts[1])
+    except Exception:
+        pass
+    return frozenset(filters)
+
+
+@functools.lru_cache(maxsize=256)
+def _crop_box(src_w: int, src_h: int, target_w: int, target_h: int,
+              position: str) -> Tuple[int, int, int, int]:
+    """
+    (crop_w, crop_h, crop_x, crop_y) fitting the source to the target aspect
+    ratio. Cached: a batch sees only a handful of source resolutions.
+    """
+    src_ratio = src_w / src_h
+    target_ratio = target_w / target_h
+    
+    if src_ratio > target_ratio:
+        # Source is wider - crop sides
+        crop_h = src_h
+        crop_w = int(src_h * target_ratio)
+        crop_y = 0
+        
+        if position == 'left':
+            crop_x = 0
+        elif position == 'right':
+            crop_x = src_w - crop_w
+        else:  # center / auto - default to center
+            crop_x = (src_w - crop_w) // 2
+    else:
+        # Source is taller - crop top/bottom
+        crop_w = src_w
+        crop_h = int(src_w / target_ratio)
+        crop_x = 0
+        crop_y = (src_h - crop_h) // 2
+    
+    return crop_w, crop_h, crop_x, crop_y
+
+
+@_jit
+def _build_speaking(sil_start, sil_end, duration, min_speech, padding):
+    """
+    Speaking spans between sorted silences. Spans less than 2 * padding
+    apart (or overlapping) are merged, so no seam is cut for them.
+    Returns an (N, 2) float64 array of start/end rows.
+    """
+    n = sil_start.shape[0]
+    out = np.empty((n + 1, 2), dtype=np.float64)
+    count = 0
+    current_pos = 0.0
+
+    for i in range(n):
+        # Add speaking segment before this silence
+        if sil_start[i] > current_pos + min_speech:
+            # Add padding to keep natural flow
+            seg_start = max(0.0, current_pos)
+            seg_end = min(duration, sil_start[i] + padding)
+            if count > 0 and seg_start - out[count - 1, 1] < 2 * padding:
+                out[count - 1, 1] = max(out[count - 1, 1], seg_end)
+            else:
+                out[count, 0] = seg_start
+                out[count, 1] = seg_end
+                count += 1
+
+        # Move position to end of silence (with padding)
+        current_pos = max(current_pos, sil_end[i] - padding)
+
+    # Add final speaking segment
+    if current_pos < duration - min_speech:
+        if count > 0 and current_pos - out[count - 1, 1] < 2 * padding:
+            out[count - 1, 1] = duration
+        else:
+            out[count, 0] = current_pos
+            out[count, 1] = duration
+            count += 1
+
+    return out[:count]
+
+
+@dataclass(slots=True, frozen=True)
 class SilenceSegment:
     """Represents a silent segment in audio"""
     start: float
@@ -27,7 +223,7 @@ class SilenceSegment:
         return self.duration >= 0.3  # At least 300ms
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SpeakingSegment:
     """Represents a speaking segment (non-silent)"""
     start: float
@@ -41,6 +237,24 @@ class SilenceRemover:
     Creates "jump cut" style videos with continuous speech.
     """
     
+    # Decoded mono PCM used for silence detection
+    PCM_SAMPLE_RATE = 8000
+    RMS_WINDOW = 0.01  # seconds per RMS envelope frame
+    FRAMES_PER_READ = 500  # RMS frames decoded per pipe read (5s of audio)
+    
+    # Sources that can be cut and joined with -c copy into the mp4 output
+    COPY_VIDEO_CODECS = ('h264',)
+    COPY_AUDIO_CODECS = ('aac',)
+    
+    # Keyframe rows of `ffprobe -show_entries packet=pts_time,flags -of csv=p=0`
+    _RE_KEYFRAME = re.compile(r'^(-?\d+(?:\.\d+)?),K', re.MULTILINE)
+    
+    # Seconds of packets read to estimate the keyframe interval
+    GOP_SAMPLE_SECONDS = 30
+    
+    # From this many segments on, select/aselect replaces per-segment trim + concat
+    SELECT_MIN_SEGMENTS = 5
+    
     def __init__(self, config):
         self.config = config
         
@@ -49,63 +263,115 @@ class SilenceRemover:
         self.min_silence_duration = getattr(config, 'MIN_SILENCE_TO_REMOVE', 0.4)  # seconds
         self.min_speech_duration = getattr(config, 'MIN_SPEECH_DURATION', 0.2)  # seconds
         self.padding = getattr(config, 'SILENCE_PADDING', 0.05)  # Keep 50ms before/after speech
+        self.stream_copy = getattr(config, 'SILENCE_STREAM_COPY', True)
+        self.auto_threshold = getattr(config, 'AUTO_SILENCE_THRESHOLD', False)
+        self.auto_threshold_offset = getattr(config, 'AUTO_SILENCE_OFFSET_DB', 10)  # dB below mean volume
+        
+        # Encoder settings, read once instead of per command
+        self.use_gpu_accel = bool(getattr(config, 'USE_GPU_ACCELERATION', False))
+        self.video_codec = getattr(config, 'VIDEO_CODEC', 'h264_nvenc')
+        self.nvenc_preset = getattr(config, 'NVENC_PRESET', 'p4')
         
     def detect_silence(self, video_path: str) -> List[SilenceSegment]:
         """
-        Detect silent segments in video using FFmpeg silencedetect filter.
+        Detect silent segments from the RMS envelope of the decoded audio.
+        FFmpeg pipes raw mono PCM, NumPy reduces it chunk by chunk so
+        only the per-frame power is kept, not the samples.
+        With AUTO_SILENCE_THRESHOLD the threshold is the clip's mean volume
+        minus AUTO_SILENCE_OFFSET_DB instead of the fixed SILENCE_THRESHOLD_DB.
         
         Returns list of SilenceSegment objects.
         """
         cmd = [
-            'ffmpeg', '-i', video_path,
-            '-af', f'silencedetect=noise={self.silence_threshold_db}dB:d={self.min_silence_duration}',
-            '-f', 'null', '-'
+            'ffmpeg', '-v', 'error', '-nostats', '-i', video_path,
+            '-vn', '-f', 's16le', '-ac', '1', '-ar', str(self.PCM_SAMPLE_RATE),
+            'pipe:1'
         ]
+        frame_bytes = 2 * max(1, int(self.PCM_SAMPLE_RATE * self.RMS_WINDOW))
+        chunk_bytes = frame_bytes * self.FRAMES_PER_READ
         
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=120
-            )
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+            # stdout is read on this thread; a timer enforces the overall timeout
+            timed_out = threading.Event()
             
-            output = result.stderr
-            silences = []
+            def on_timeout():
+                timed_out.set()
+                proc.kill()
             
-            # Parse FFmpeg silencedetect output
-            lines = output.split('\n')
-            current_start = None
+            watchdog = threading.Timer(120, on_timeout)
+            watchdog.start()
+            try:
+                powers = []
+                pending = b''
+                while True:
+                    data = proc.stdout.read(chunk_bytes)
+                    if not data:
+                        break
+                    data = pending + data
+                    usable = len(data) - len(data) % frame_bytes
+                    pending = data[usable:]
+                    if usable:
+                        powers.append(self._frame_power(np.frombuffer(data[:usable], dtype=np.int16)))
+                proc.wait()
+            except BaseException:
+                # Don't leave FFmpeg running (or a zombie) when reading or reducing fails
+                proc.kill()
+                proc.wait()
+                raise
+            finally:
+                watchdog.cancel()
+                proc.stdout.close()
+            if timed_out.is_set():
+                raise subprocess.TimeoutExpired(cmd, 120)
             
-            for line in lines:
-                if 'silence_start:' in line:
-                    try:
-                        start_str = line.split('silence_start:')[1].strip().split()[0]
-                        current_start = float(start_str)
-                    except:
-                        pass
-                        
-                elif 'silence_end:' in line and current_start is not None:
-                    try:
-                        parts = line.split('silence_end:')[1].strip().split()
-                        end = float(parts[0])
-                        duration = end - current_start
-                        
-                        silences.append(SilenceSegment(
-                            start=current_start,
-                            end=end,
-                            duration=duration
-                        ))
-                        current_start = None
-                    except:
-                        pass
+            if not powers:
+                return []
+            power = np.concatenate(powers)
+            threshold_db = self._auto_threshold(power) if self.auto_threshold else self.silence_threshold_db
             
-            return silences
+            # Compared as mean square in the int16 amplitude domain
+            threshold = 10 ** (threshold_db / 20) * 32768
+            return self._silent_runs(power < threshold * threshold)
             
         except Exception as e:
             print(f"⚠️ Silence detection failed: {e}")
             return []
     
+    def _frame_power(self, samples: np.ndarray) -> np.ndarray:
+        """Mean square per RMS frame (whole frames only)"""
+        frame_len = max(1, int(self.PCM_SAMPLE_RATE * self.RMS_WINDOW))
+        n_frames = len(samples) // frame_len
+        
+        frames = samples[:n_frames * frame_len].astype(np.float32).reshape(n_frames, frame_len)
+        return np.mean(frames * frames, axis=1)
+    
+    def _auto_threshold(self, power: np.ndarray) -> float:
+        """
+        Silence threshold in dB relative to the clip's own loudness
+        (mean_volume as volumedetect reports it, minus the configured offset).
+        """
+        mean_square = float(np.mean(power, dtype=np.float64))
+        if mean_square <= 0:
+            return self.silence_threshold_db
+        mean_db = 10 * np.log10(mean_square / (32768.0 * 32768.0))
+        return float(mean_db - self.auto_threshold_offset)
+    
+    def _silent_runs(self, silent: np.ndarray) -> List[SilenceSegment]:
+        """Silent runs of min_silence_duration or longer from a per-frame mask"""
+        # Rising/falling edges of the silent mask give run starts/ends
+        edges = np.diff(np.concatenate(([0], silent.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        
+        frame_dur = max(1, int(self.PCM_SAMPLE_RATE * self.RMS_WINDOW)) / self.PCM_SAMPLE_RATE
+        keep = (ends - starts) * frame_dur >= self.min_silence_duration
+        
+        return [
+            SilenceSegment(start, end, end - start)
+            for start, end in zip((starts[keep] * frame_dur).tolist(), (ends[keep] * frame_dur).tolist())
+        ]
+    
     def get_speaking_segments(self, video_path: str, duration: float) -> List[SpeakingSegment]:
         """
         Get speaking (non-silent) segments from video.
@@ -118,34 +384,16 @@ class SilenceRemover:
             # No silence detected - entire video is speech
             return [SpeakingSegment(start=0, end=duration, duration=duration)]
         
-        speaking = []
-        current_pos = 0.0
-        
-        for silence in silences:
-            # Add speaking segment before this silence
-            if silence.start > current_pos + self.min_speech_duration:
-                # Add padding to keep natural flow
-                seg_start = max(0, current_pos)
-                seg_end = min(duration, silence.start + self.padding)
-                
-                speaking.append(SpeakingSegment(
-                    start=seg_start,
-                    end=seg_end,
-                    duration=seg_end - seg_start
-                ))
-            
-            # Move position to end of silence (with padding)
-            current_pos = max(current_pos, silence.end - self.padding)
-        
-        # Add final speaking segment
-        if current_pos < duration - self.min_speech_duration:
-            speaking.append(SpeakingSegment(
-                start=current_pos,
-                end=duration,
-                duration=duration - current_pos
-            ))
+        spans = _build_speaking(
+            np.fromiter((s.start for s in silences), dtype=np.float64, count=len(silences)),
+            np.fromiter((s.end for s in silences), dtype=np.float64, count=len(silences)),
+            float(duration), float(self.min_speech_duration), float(self.padding)
+        )
         
-        return speaking
+        return [
+            SpeakingSegment(start, end, end - start)
+            for start, end in spans.tolist()
+        ]
     
     def remove_silence(self, input_path: str, output_path: str, 
                        use_gpu: bool = True) -> Tuple[bool, Dict]:
@@ -172,7 +420,29 @@ class SilenceRemover:
         if not speaking:
             return False, {'error': 'No speaking segments detected'}
         
-        # Calculate stats
+        stats = self.silence_stats(duration, speaking)
+        
+        # If minimal silence, just copy
+        if stats['removed_duration'] == 0:
+            shutil.copy(input_path, output_path)
+            return True, stats
+        
+        # Cut on keyframes without re-encoding when the source allows it,
+        # otherwise build FFmpeg complex filter to concatenate speaking segments
+        success = (
+            self.stream_copy
+            and self._concatenate_segments_copy(input_path, output_path, speaking)
+        )
+        if not success:
+            success = self._concatenate_segments(input_path, output_path, speaking, use_gpu)
+        
+        return success, stats
+    
+    def silence_stats(self, duration: float, speaking: List[SpeakingSegment]) -> Dict:
+        """
+        Stats for removing everything but `speaking`.
+        removed_duration is 0 when under 0.5s of silence would go (keep original).
+        """
         original_duration = duration
         new_duration = sum(seg.duration for seg in speaking)
         removed_duration = original_duration - new_duration
@@ -180,22 +450,16 @@ class SilenceRemover:
         print(f"   📊 Original: {original_duration:.1f}s → New: {new_duration:.1f}s")
         print(f"   ✂️  Removed: {removed_duration:.1f}s of silence ({len(speaking)} segments)")
         
-        # If minimal silence, just copy
         if removed_duration < 0.5:
             print(f"   ℹ️  Minimal silence detected, keeping original")
-            import shutil
-            shutil.copy(input_path, output_path)
-            return True, {
+            return {
                 'original_duration': original_duration,
                 'new_duration': original_duration,
                 'removed_duration': 0,
                 'segments': 1
             }
         
-        # Build FFmpeg complex filter to concatenate speaking segments
-        success = self._concatenate_segments(input_path, output_path, speaking, use_gpu)
-        
-        return success, {
+        return {
             'original_duration': original_duration,
             'new_duration': new_duration,
             'removed_duration': removed_duration,
@@ -207,40 +471,29 @@ class SilenceRemover:
                               segments: List[SpeakingSegment], use_gpu: bool) -> bool:
         """Concatenate speaking segments using FFmpeg"""
         
-        # Create filter complex for segment extraction and concat
-        filter_parts = []
-        concat_inputs = []
-        
-        for i, seg in enumerate(segments):
-            # Trim each segment
-            filter_parts.append(
-                f"[0:v]trim=start={seg.start}:end={seg.end},setpts=PTS-STARTPTS[v{i}];"
-            )
-            filter_parts.append(
-                f"[0:a]atrim=start={seg.start}:end={seg.end},asetpts=PTS-STARTPTS[a{i}];"
-            )
-            concat_inputs.append(f"[v{i}][a{i}]")
-        
-        # Concat all segments
-        filter_complex = ''.join(filter_parts)
-        filter_complex += f"{''.join(concat_inputs)}concat=n={len(segments)}:v=1:a=1[outv][outa]"
-        
         # Build FFmpeg command
-        cmd = ['ffmpeg', '-y', '-i', input_path]
+        gpu = use_gpu and self.use_gpu_accel
+        cmd = ['ffmpeg', '-y']
         
-        # GPU acceleration
-        if use_gpu and getattr(self.config, 'USE_GPU_ACCELERATION', False):
+        # GPU acceleration (input option, must precede -i)
+        if gpu:
             cmd.extend(['-hwaccel', 'cuda'])
         
-        cmd.extend([
-            '-filter_complex', filter_complex,
-            '-map', '[outv]', '-map', '[outa]'
-        ])
+        cmd.extend(['-i', input_path])
+        
+        if len(segments) >= self.SELECT_MIN_SEGMENTS:
+            # One select/aselect pass keeps the graph size constant
+            vf, af = self.select_filters(segments)
+            cmd.extend(['-vf', vf, '-af', af])
+        else:
+            cmd.extend([
+                '-filter_complex', self.concat_filter(segments, '[outv]'),
+                '-map', '[outv]', '-map', '[outa]'
+            ])
         
         # Video codec
-        if use_gpu and getattr(self.config, 'USE_GPU_ACCELERATION', False):
-            cmd.extend(['-c:v', getattr(self.config, 'VIDEO_CODEC', 'h264_nvenc')])
-            cmd.extend(['-preset', getattr(self.config, 'NVENC_PRESET', 'p4')])
+        if gpu:
+            cmd.extend(['-c:v', self.video_codec, '-preset', self.nvenc_preset])
         else:
             cmd.extend(['-c:v', 'libx264', '-preset', 'fast'])
         
@@ -248,25 +501,142 @@ class SilenceRemover:
         cmd.append(output_path)
         
         try:
-            result = subprocess.run(cmd, capture_output=True, timeout=300)
-            return result.returncode == 0 and os.path.exists(output_path)
+            returncode, stderr = _run_ffmpeg(cmd, timeout=300)
         except Exception as e:
             print(f"   ❌ Concatenation failed: {e}")
             return False
+        if returncode != 0:
+            print(f"   ❌ Concatenation failed: {stderr[-300:]}")
+        return returncode == 0 and os.path.exists(output_path)
     
-    def _get_duration(self, video_path: str) -> float:
-        """Get video duration using ffprobe"""
+    def concat_filter(self, segments: List[SpeakingSegment], video_label: str) -> str:
+        """
+        filter_complex trimming every segment from input 0 and concatenating
+        them into `video_label` and [outa]. Built in a single join.
+        """
+        n = len(segments)
+        return ''.join(itertools.chain(
+            # Trim each segment
+            (
+                f"[0:v]trim=start={seg.start}:end={seg.end},setpts=PTS-STARTPTS[v{i}];"
+                f"[0:a]atrim=start={seg.start}:end={seg.end},asetpts=PTS-STARTPTS[a{i}];"
+                for i, seg in enumerate(segments)
+            ),
+            # Concat all segments
+            (f"[v{i}][a{i}]" for i in range(n)),
+            (f"concat=n={n}:v=1:a=1{video_label}[outa]",)
+        ))
+    
+    def select_filters(self, segments: List[SpeakingSegment]) -> Tuple[str, str]:
+        """
+        Video and audio filters keeping only `segments`: a single select/aselect
+        over the source with timestamps regenerated to close the gaps.
+        """
+        expr = '+'.join(f"between(t,{seg.start:.3f},{seg.end:.3f})" for seg in segments)
+        return (
+            f"select='{expr}',setpts=N/FRAME_RATE/TB",
+            f"aselect='{expr}',asetpts=N/SR/TB"
+        )
+    
+    def _concatenate_segments_copy(self, input_path: str, output_path: str,
+                                   segments: List[SpeakingSegment]) -> bool:
+        """
+        Concatenate speaking segments without transcoding.
+        
+        Each segment start is snapped back to the previous keyframe, cut with
+        -c copy and joined through the concat demuxer. Returns False (caller
+        re-encodes) when the codecs don't match the output or a snap would
+        add more than `padding` seconds of silence.
+        """
+        info = _probe(input_path)
+        if (info.video_codec not in self.COPY_VIDEO_CODECS
+                or info.audio_codec not in self.COPY_AUDIO_CODECS):
+            return False
+        
+        # Starts only land within `padding` of a keyframe when keyframes are
+        # that dense (e.g. all-intra), so sample the GOP before a full scan
+        sample = self._get_keyframes(input_path, read_intervals=f'%+{self.GOP_SAMPLE_SECONDS}')
+        if len(sample) > 1:
+            gop = float(np.median(np.diff(sample)))
+            if gop > self.padding:
+                print(f"   ℹ️ Keyframes every {gop:.2f}s, re-encoding instead of stream copy")
+                return False
+        
+        keyframes = self._get_keyframes(input_path)
+        if not keyframes:
+            return False
+        
+        cuts = []
+        for seg in segments:
+            i = bisect.bisect_right(keyframes, seg.start + 1e-3) - 1
+            if i < 0 or seg.start - keyframes[i] > self.padding:
+                return False
+            cuts.append((keyframes[i], seg.end - keyframes[i]))
+        
+        print(f"   ⚡ Stream-copying {len(cuts)} keyframe-aligned segments")
+        
+        with tempfile.TemporaryDirectory(prefix='silence_copy_') as tmp_dir:
+            list_path = os.path.join(tmp_dir, 'list.txt')
+            with open(list_path, 'w') as list_file:
+                for i, (start, dur) in enumerate(cuts):
+                    part = os.path.join(tmp_dir, f'part_{i:04d}.ts')
+                    cmd = [
+                        'ffmpeg', '-y',
+                        '-ss', f'{start:.3f}', '-i', input_path,
+                        '-t', f'{dur:.3f}',
+                        '-map', '0:v:0', '-map', '0:a:0',
+                        '-c', 'copy', '-avoid_negative_ts', 'make_zero',
+                        part
+                    ]
+                    try:
+                        returncode, _ = _run_ffmpeg(cmd, timeout=120)
+                    except Exception as e:
+                        print(f"   ⚠️ Segment copy failed: {e}")
+                        return False
+                    if returncode != 0:
+                        return False
+                    list_file.write(f"file '{part}'\n")
+            
+            cmd = [
+                'ffmpeg', '-y',
+                '-f', 'concat', '-safe', '0', '-i', list_path,
+                '-c', 'copy', '-bsf:a', 'aac_adtstoasc',
+                '-movflags', '+faststart',
+                output_path
+            ]
+            try:
+                returncode, _ = _run_ffmpeg(cmd, timeout=300)
+                return returncode == 0 and os.path.exists(output_path)
+            except Exception as e:
+                print(f"   ⚠️ Stream-copy concat failed: {e}")
+                return False
+    
+    def _get_keyframes(self, video_path: str, read_intervals: Optional[str] = None) -> List[float]:
+        """
+        Sorted keyframe timestamps of the first video stream, limited to
+        ffprobe's -read_intervals (e.g. '%+30') when given.
+        """
+        # Packet flags carry the keyframe marker, so nothing needs decoding
         cmd = [
             'ffprobe', '-v', 'error',
-            '-show_entries', 'format=duration',
-            '-of', 'default=noprint_wrappers=1:nokey=1',
+            '-select_streams', 'v:0',
+            *(('-read_intervals', read_intervals) if read_intervals else ()),
+            '-show_entries', 'packet=pts_time,flags',
+            '-of', 'csv=p=0',
             video_path
         ]
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-            return float(result.stdout.strip())
-        except:
-            return 0
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+        except Exception:
+            return []
+        # One scan over the whole output; non-key packets never reach Python
+        keyframes = [float(pts) for pts in self._RE_KEYFRAME.findall(result.stdout)]
+        keyframes.sort()
+        return keyframes
+    
+    def _get_duration(self, video_path: str) -> float:
+        """Get video duration using ffprobe"""
+        return _probe(video_path).duration
 
 
 class VerticalFormatter:
@@ -283,10 +653,27 @@ class VerticalFormatter:
         '16:9': {'width': 1920, 'height': 1080, 'name': 'YouTube/Landscape'},
     }
     
+    # Crop + scale chains keyed by GPU scaler (None = CPU), filled with
+    # crop_w, crop_h, crop_x, crop_y, target_w, target_h.
+    # GPU: crop is a zero-copy plane offset, so only the cropped frame is
+    # uploaded; the CUDA scaler resizes it and NVENC reads it in place.
+    CROP_FILTER_TEMPLATES = {
+        'scale_npp': "crop={}:{}:{}:{},format=nv12,hwupload_cuda,scale_npp=w={}:h={}:interp_algo=lanczos",
+        'scale_cuda': "crop={}:{}:{}:{},format=nv12,hwupload_cuda,scale_cuda={}:{}",
+        None: "crop={}:{}:{}:{},scale={}:{}",
+    }
+    
     def __init__(self, config):
         self.config = config
         self.default_format = getattr(config, 'DEFAULT_VERTICAL_FORMAT', '9:16')
         
+        # Filter/encoder settings, read once instead of per command
+        self.use_gpu_accel = bool(getattr(config, 'USE_GPU_ACCELERATION', False))
+        self.use_gpu_filters = bool(getattr(config, 'USE_GPU_FILTERS', False))
+        self.video_codec = getattr(config, 'VIDEO_CODEC', 'h264_nvenc')
+        self.nvenc_preset = getattr(config, 'NVENC_PRESET', 'p4')
+        self.video_bitrate = getattr(config, 'VIDEO_BITRATE', '4M')
+        
     def convert_to_vertical(self, input_path: str, output_path: str,
                            format_ratio: str = '9:16',
                            crop_position: str = 'center',
@@ -318,13 +705,18 @@ class VerticalFormatter:
         if src_w <= 0 or src_h <= 0:
             return False, {'error': 'Could not get video dimensions'}
         
-        # Calculate crop parameters
-        crop_params = self._calculate_crop(src_w, src_h, target_w, target_h, crop_position)
-        
-        # Build FFmpeg command
-        success = self._apply_vertical_crop(
-            input_path, output_path, crop_params, target_w, target_h, use_gpu
-        )
+        if (src_w, src_h) == (target_w, target_h):
+            # Already the target size - nothing to crop or scale
+            print(f"   ℹ️  Source is already {target_w}x{target_h}, skipping re-encode")
+            success = self._copy_without_encode(input_path, output_path)
+        else:
+            # Calculate crop parameters
+            crop_params = self._calculate_crop(src_w, src_h, target_w, target_h, crop_position)
+            
+            # Build FFmpeg command
+            success = self._apply_vertical_crop(
+                input_path, output_path, crop_params, target_w, target_h, use_gpu
+            )
         
         return success, {
             'format': format_ratio,
@@ -334,108 +726,98 @@ class VerticalFormatter:
             'crop_position': crop_position
         }
     
+    def _copy_without_encode(self, input_path: str, output_path: str) -> bool:
+        """Plain file copy, or a stream-copy remux when the container changes"""
+        if os.path.splitext(input_path)[1].lower() == os.path.splitext(output_path)[1].lower():
+            try:
+                shutil.copyfile(input_path, output_path)
+                return True
+            except OSError as e:
+                print(f"   ❌ Copy failed: {e}")
+                return False
+        
+        cmd = ['ffmpeg', '-y', '-i', input_path, '-map', '0', '-c', 'copy', output_path]
+        try:
+            returncode, stderr = _run_ffmpeg(cmd, timeout=120)
+        except Exception as e:
+            print(f"   ❌ Remux failed: {e}")
+            return False
+        if returncode != 0:
+            print(f"   ❌ Remux failed: {stderr[-300:]}")
+        return returncode == 0 and os.path.exists(output_path)
+    
     def _get_dimensions(self, video_path: str) -> Tuple[int, int]:
         """Get video dimensions using ffprobe"""
-        cmd = [
-            'ffprobe', '-v', 'error',
-            '-select_streams', 'v:0',
-            '-show_entries', 'stream=width,height',
-            '-of', 'json',
-            video_path
-        ]
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-            data = json.loads(result.stdout)
-            stream = data['streams'][0]
-            return int(stream['width']), int(stream['height'])
-        except:
-            return 0, 0
+        info = _probe(video_path)
+        return info.width, info.height
     
     def _calculate_crop(self, src_w: int, src_h: int, 
                        target_w: int, target_h: int,
-                       position: str) -> Dict:
+                       position: str) -> Tuple[int, int, int, int]:
         """
         Calculate crop parameters to fit target aspect ratio.
         
-        Returns dict with crop_w, crop_h, crop_x, crop_y
+        Returns (crop_w, crop_h, crop_x, crop_y)
         """
-        src_ratio = src_w / src_h
-        target_ratio = target_w / target_h
-        
-        if src_ratio > target_ratio:
-            # Source is wider - crop sides
-            crop_h = src_h
-            crop_w = int(src_h * target_ratio)
-            crop_y = 0
-            
-            if position == 'center':
-                crop_x = (src_w - crop_w) // 2
-            elif position == 'left':
-                crop_x = 0
-            elif position == 'right':
-                crop_x = src_w - crop_w
-            else:  # auto - default to center
-                crop_x = (src_w - crop_w) // 2
+        return _crop_box(src_w, src_h, target_w, target_h, position)
+    
+    @property
+    def _has_npp(self) -> bool:
+        """scale_npp is compiled into this FFmpeg (probed once per process)"""
+        return 'scale_npp' in _probe_filters()
+    
+    def _gpu_scaler(self) -> Optional[str]:
+        """CUDA scale filter to use, or None when GPU filters are off/unavailable"""
+        if not (self.use_gpu_filters and self.use_gpu_accel):
+            return None
+        if self._has_npp:
+            return 'scale_npp'
+        if 'scale_cuda' in _probe_filters():
+            return 'scale_cuda'
+        return None
+    
+    def _crop_filter(self, crop: Tuple[int, int, int, int],
+                     target_w: int, target_h: int, use_gpu: bool) -> str:
+        """Crop + scale filter chain for the target size"""
+        scaler = self._gpu_scaler() if use_gpu else None
+        return self.CROP_FILTER_TEMPLATES[scaler].format(*crop, target_w, target_h)
+    
+    def _encode_args(self, use_gpu: bool) -> List[str]:
+        """Video and audio codec arguments for the final output"""
+        if use_gpu and self.use_gpu_accel:
+            args = ['-c:v', self.video_codec, '-preset', self.nvenc_preset, '-b:v', self.video_bitrate]
         else:
-            # Source is taller - crop top/bottom
-            crop_w = src_w
-            crop_h = int(src_w / target_ratio)
-            crop_x = 0
-            crop_y = (src_h - crop_h) // 2
-        
-        return {
-            'crop_w': crop_w,
-            'crop_h': crop_h,
-            'crop_x': crop_x,
-            'crop_y': crop_y
-        }
+            args = ['-c:v', 'libx264', '-preset', 'fast', '-crf', '23']
+        return args + ['-c:a', 'aac', '-b:a', '192k']
     
     def _apply_vertical_crop(self, input_path: str, output_path: str,
-                             crop: Dict, target_w: int, target_h: int,
+                             crop: Tuple[int, int, int, int], target_w: int, target_h: int,
                              use_gpu: bool) -> bool:
         """Apply crop and scale to target dimensions"""
         
         # Build filter
-        if use_gpu and getattr(self.config, 'USE_GPU_FILTERS', False):
-            # GPU filter chain
-            vf = (
-                f"crop={crop['crop_w']}:{crop['crop_h']}:{crop['crop_x']}:{crop['crop_y']},"
-                f"scale_cuda={target_w}:{target_h}"
-            )
-        else:
-            # CPU filter chain
-            vf = (
-                f"crop={crop['crop_w']}:{crop['crop_h']}:{crop['crop_x']}:{crop['crop_y']},"
-                f"scale={target_w}:{target_h}"
-            )
+        vf = self._crop_filter(crop, target_w, target_h, use_gpu)
         
         # Build command
         cmd = ['ffmpeg', '-y']
         
         # GPU decode
-        if use_gpu and getattr(self.config, 'USE_GPU_ACCELERATION', False):
+        if use_gpu and self.use_gpu_accel:
             cmd.extend(['-hwaccel', 'cuda'])
         
         cmd.extend(['-i', input_path])
         cmd.extend(['-vf', vf])
-        
-        # Video codec
-        if use_gpu and getattr(self.config, 'USE_GPU_ACCELERATION', False):
-            cmd.extend(['-c:v', getattr(self.config, 'VIDEO_CODEC', 'h264_nvenc')])
-            cmd.extend(['-preset', getattr(self.config, 'NVENC_PRESET', 'p4')])
-            cmd.extend(['-b:v', getattr(self.config, 'VIDEO_BITRATE', '4M')])
-        else:
-            cmd.extend(['-c:v', 'libx264', '-preset', 'fast', '-crf', '23'])
-        
-        cmd.extend(['-c:a', 'aac', '-b:a', '192k'])
+        cmd.extend(self._encode_args(use_gpu))
         cmd.append(output_path)
         
         try:
-            result = subprocess.run(cmd, capture_output=True, timeout=300)
-            return result.returncode == 0 and os.path.exists(output_path)
+            returncode, stderr = _run_ffmpeg(cmd, timeout=300)
         except Exception as e:
             print(f"   ❌ Vertical conversion failed: {e}")
             return False
+        if returncode != 0:
+            print(f"   ❌ Vertical conversion failed: {stderr[-300:]}")
+        return returncode == 0 and os.path.exists(output_path)
 
 
 class ClipEnhancer:
@@ -444,10 +826,19 @@ class ClipEnhancer:
     Creates TikTok/Reels-ready clips.
     """
     
+    # Above this many speaking segments the fused filter graph gets too large;
+    # fall back to the two-pass path
+    MAX_FUSED_SEGMENTS = 256
+    
+    # Clips per FFmpeg process in batch_enhance (keeps the command line short)
+    BATCH_FFMPEG_SIZE = 16
+    
     def __init__(self, config):
         self.config = config
         self.silence_remover = SilenceRemover(config)
         self.vertical_formatter = VerticalFormatter(config)
+        self.use_gpu_accel = bool(getattr(config, 'USE_GPU_ACCELERATION', False))
+        self.nvenc_max_sessions = max(1, getattr(config, 'NVENC_MAX_SESSIONS', 2))
     
     def enhance_clip(self, input_path: str, output_path: str,
                      remove_silence: bool = True,
@@ -468,6 +859,11 @@ class ClipEnhancer:
         Returns:
             (success, metadata) tuple
         """
+        if remove_silence and vertical_format:
+            fused = self._enhance_fused(input_path, output_path, vertical_format, crop_position, use_gpu)
+            if fused is not None:
+                return fused
+        
         temp_files = []
         current_input = input_path
         metadata = {'steps': []}
@@ -475,7 +871,10 @@ class ClipEnhancer:
         try:
             # Step 1: Remove silence if requested
             if remove_silence:
-                temp_file = tempfile.NamedTemporaryFile(suffix='.mp4', delete=False)
+                # Temp next to the output so the final move is a same-filesystem rename
+                temp_file = tempfile.NamedTemporaryFile(
+                    suffix='.mp4', delete=False, dir=os.path.dirname(output_path) or '.'
+                )
                 temp_path = temp_file.name
                 temp_file.close()
                 temp_files.append(temp_path)
@@ -509,11 +908,9 @@ class ClipEnhancer:
             else:
                 # No vertical format - just copy final result
                 if current_input != input_path:
-                    import shutil
-                    shutil.move(current_input, output_path)
+                    os.replace(current_input, output_path)
                     temp_files.remove(current_input)
                 else:
-                    import shutil
                     shutil.copy(current_input, output_path)
                 
                 return True, metadata
@@ -527,6 +924,98 @@ class ClipEnhancer:
                 except:
                     pass
     
+    def _build_fused_filter(self, segments: List[SpeakingSegment], crop: Tuple[int, int, int, int],
+                            target_w: int, target_h: int, use_gpu: bool) -> str:
+        """
+        One filter graph for silence removal and vertical crop: trim/atrim
+        every speaking segment, concat, then crop + scale the joined video once.
+        Many segments use a single select/aselect pass instead of trim + concat.
+        """
+        crop_chain = self.vertical_formatter._crop_filter(crop, target_w, target_h, use_gpu)
+        
+        if len(segments) >= self.silence_remover.SELECT_MIN_SEGMENTS:
+            vf, af = self.silence_remover.select_filters(segments)
+            return f"[0:v]{vf},{crop_chain}[outv];[0:a]{af}[outa]"
+        
+        return f"{self.silence_remover.concat_filter(segments, '[cv]')};[cv]{crop_chain}[outv]"
+    
+    def _enhance_fused(self, input_path: str, output_path: str,
+                       vertical_format: str, crop_position: str,
+                       use_gpu: bool) -> Optional[Tuple[bool, Dict]]:
+        """
+        Silence removal + vertical crop in a single FFmpeg pass (one decode,
+        one encode, no intermediate file).
+        Returns None when the two-pass path should be used instead.
+        """
+        remover = self.silence_remover
+        formatter = self.vertical_formatter
+        
+        duration = remover._get_duration(input_path)
+        if duration <= 0:
+            return None
+        
+        print("   🔍 Detecting speech segments...")
+        speaking = remover.get_speaking_segments(input_path, duration)
+        if not speaking or len(speaking) > self.MAX_FUSED_SEGMENTS:
+            return None
+        
+        silence_stats = remover.silence_stats(duration, speaking)
+        metadata = {'steps': [], 'silence_removed': True}
+        
+        if silence_stats['removed_duration'] == 0:
+            # Nothing to cut - only the vertical conversion remains
+            success, format_stats = formatter.convert_to_vertical(
+                input_path, output_path, vertical_format, crop_position, use_gpu
+            )
+        else:
+            if vertical_format not in formatter.FORMATS:
+                vertical_format = '9:16'
+            target = formatter.FORMATS[vertical_format]
+            print(f"   ✂️📱 Removing silence and converting to {vertical_format} in one pass...")
+            
+            src_w, src_h = formatter._get_dimensions(input_path)
+            if src_w <= 0 or src_h <= 0:
+                return None
+            crop = formatter._calculate_crop(src_w, src_h, target['width'], target['height'], crop_position)
+            
+            cmd = ['ffmpeg', '-y']
+            if use_gpu and self.use_gpu_accel:
+                cmd.extend(['-hwaccel', 'cuda'])
+            cmd.extend(['-i', input_path])
+            cmd.extend([
+                '-filter_complex', self._build_fused_filter(
+                    speaking, crop, target['width'], target['height'], use_gpu
+                ),
+                '-map', '[outv]', '-map', '[outa]'
+            ])
+            cmd.extend(formatter._encode_args(use_gpu))
+            cmd.append(output_path)
+            
+            try:
+                returncode, stderr = _run_ffmpeg(cmd, timeout=300)
+                if returncode != 0:
+                    print(f"   ❌ Enhancement failed: {stderr[-300:]}")
+                success = returncode == 0 and os.path.exists(output_path)
+            except Exception as e:
+                print(f"   ❌ Enhancement failed: {e}")
+                success = False
+            
+            format_stats = {
+                'format': vertical_format,
+                'format_name': target['name'],
+                'source_size': f'{src_w}x{src_h}',
+                'target_size': f"{target['width']}x{target['height']}",
+                'crop_position': crop_position
+            }
+        
+        if not success:
+            return False, {'error': 'Vertical conversion failed'}
+        
+        metadata['steps'].append({'silence_removal': silence_stats})
+        metadata['steps'].append({'vertical_format': format_stats})
+        metadata['format'] = vertical_format
+        return True, metadata
+    
     def batch_enhance(self, clips: List[Dict], output_dir: str,
                       remove_silence: bool = True,
                       vertical_format: Optional[str] = None,
@@ -542,47 +1031,219 @@ class ClipEnhancer:
             use_gpu: Use GPU acceleration
             
         Returns:
-            List of enhanced clip metadata
+            List of enhanced clip metadata, in input order
         """
         os.makedirs(output_dir, exist_ok=True)
-        results = []
+        if not clips:
+            return []
+        
+        # Each clip is an independent FFmpeg pipeline, so run several at once.
+        # Threads are enough: the work happens in the FFmpeg subprocesses.
+        workers = min(max(1, (os.cpu_count() or 2) // 2), len(clips))
+        if use_gpu and self.use_gpu_accel:
+            # Consumer NVENC silently queues above its session limit
+            workers = min(workers, self.nvenc_max_sessions)
+        
+        if vertical_format and len(clips) > 1:
+            return self._batch_enhance_vertical(
+                clips, output_dir, remove_silence, vertical_format, use_gpu, workers
+            )
+        
+        def enhance(i: int, clip: Dict) -> Dict:
+            return self._enhance_batch_item(
+                i, len(clips), clip, output_dir,
+                remove_silence, vertical_format, use_gpu
+            )
         
-        for i, clip in enumerate(clips):
+        return self._run_parallel(enhance, clips, workers)
+    
+    @staticmethod
+    def _run_parallel(fn, clips: List[Dict], workers: int) -> List:
+        """fn(i, clip) for every clip on `workers` threads, results in input order"""
+        if workers <= 1:
+            return [fn(i, clip) for i, clip in enumerate(clips)]
+        
+        results = {}
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='enhance') as pool:
+            futures = {pool.submit(fn, i, clip): i for i, clip in enumerate(clips)}
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    results[i] = {'error': str(e), 'clip': clips[i]}
+        
+        return [results[i] for i in range(len(clips))]
+    
+    @staticmethod
+    def _batch_output_path(input_path: str, output_dir: str,
+                           remove_silence: bool, vertical_format: Optional[str]) -> str:
+        """Output filename for a batch_enhance clip"""
+        base_name = os.path.basename(input_path)
+        name, ext = os.path.splitext(base_name)
+        
+        suffix = ""
+        if remove_silence:
+            suffix += "_nosilence"
+        if vertical_format:
+            suffix += f"_{vertical_format.replace(':', 'x')}"
+        
+        return os.path.join(output_dir, f"{name}{suffix}{ext}")
+    
+    def _enhance_batch_item(self, i: int, total: int, clip: Dict, output_dir: str,
+                            remove_silence: bool, vertical_format: Optional[str],
+                            use_gpu: bool) -> Dict:
+        """Enhance one clip of batch_enhance and build its result entry"""
+        input_path = clip.get('path')
+        if not input_path or not os.path.exists(input_path):
+            return {'error': 'Invalid input path', 'clip': clip}
+        
+        # Generate output filename
+        output_path = self._batch_output_path(input_path, output_dir, remove_silence, vertical_format)
+        
+        print(f"\n🎬 Enhancing clip {i+1}/{total}: {os.path.basename(input_path)}")
+        
+        success, metadata = self.enhance_clip(
+            input_path, output_path,
+            remove_silence=remove_silence,
+            vertical_format=vertical_format,
+            use_gpu=use_gpu
+        )
+        
+        return {
+            'input': input_path,
+            'output': output_path if success else None,
+            'success': success,
+            **metadata
+        }
+    
+    def _batch_enhance_vertical(self, clips: List[Dict], output_dir: str,
+                                remove_silence: bool, vertical_format: str,
+                                use_gpu: bool, workers: int) -> List[Dict]:
+        """
+        batch_enhance for a shared vertical transform: plan every clip (probe,
+        crop, speech segments), then encode up to BATCH_FFMPEG_SIZE clips per
+        FFmpeg process. A failed batch is redone clip by clip.
+        """
+        total = len(clips)
+        
+        def plan(i: int, clip: Dict):
             input_path = clip.get('path')
             if not input_path or not os.path.exists(input_path):
-                results.append({'error': 'Invalid input path', 'clip': clip})
-                continue
-            
-            # Generate output filename
-            base_name = os.path.basename(input_path)
-            name, ext = os.path.splitext(base_name)
-            
-            suffix = ""
-            if remove_silence:
-                suffix += "_nosilence"
-            if vertical_format:
-                suffix += f"_{vertical_format.replace(':', 'x')}"
-            
-            output_name = f"{name}{suffix}{ext}"
-            output_path = os.path.join(output_dir, output_name)
-            
-            print(f"\n🎬 Enhancing clip {i+1}/{len(clips)}: {base_name}")
-            
-            success, metadata = self.enhance_clip(
-                input_path, output_path,
-                remove_silence=remove_silence,
-                vertical_format=vertical_format,
-                use_gpu=use_gpu
-            )
-            
-            results.append({
-                'input': input_path,
-                'output': output_path if success else None,
-                'success': success,
-                **metadata
-            })
+                return {'error': 'Invalid input path', 'clip': clip}
+            print(f"\n🎬 Planning clip {i+1}/{total}: {os.path.basename(input_path)}")
+            output_path = self._batch_output_path(input_path, output_dir, remove_silence, vertical_format)
+            return self._plan_vertical_item(input_path, output_path, remove_silence, vertical_format, use_gpu)
+        
+        planned = self._run_parallel(plan, clips, workers)
+        
+        results: List[Optional[Dict]] = [None] * total
+        pending = []
+        for i, item in enumerate(planned):
+            if item is None:
+                results[i] = self._enhance_batch_item(
+                    i, total, clips[i], output_dir, remove_silence, vertical_format, use_gpu
+                )
+            elif isinstance(item, dict):
+                results[i] = item
+            else:
+                pending.append((i, item))
+        
+        # Each output is its own NVENC session
+        batch_size = self.BATCH_FFMPEG_SIZE
+        if use_gpu and self.use_gpu_accel:
+            batch_size = min(batch_size, self.nvenc_max_sessions)
+        
+        for b in range(0, len(pending), batch_size):
+            batch = pending[b:b + batch_size]
+            print(f"   🎞️ Encoding {len(batch)} clips in one FFmpeg pass...")
+            ok = self._batch_ffmpeg([task for _, (task, _) in batch], use_gpu)
+            for i, (task, metadata) in batch:
+                if ok:
+                    results[i] = {'input': task[0], 'output': task[1], 'success': True, **metadata}
+                else:
+                    results[i] = self._enhance_batch_item(
+                        i, total, clips[i], output_dir, remove_silence, vertical_format, use_gpu
+                    )
         
         return results
+    
+    def _plan_vertical_item(self, input_path: str, output_path: str,
+                            remove_silence: bool, vertical_format: str, use_gpu: bool):
+        """
+        ((input, output, video_filter, audio_filter), metadata) for one clip of
+        a vertical batch, or None when it has to go through enhance_clip.
+        """
+        formatter = self.vertical_formatter
+        if vertical_format not in formatter.FORMATS:
+            vertical_format = '9:16'
+        target = formatter.FORMATS[vertical_format]
+        
+        src_w, src_h = formatter._get_dimensions(input_path)
+        if src_w <= 0 or src_h <= 0:
+            return None
+        crop = formatter._calculate_crop(src_w, src_h, target['width'], target['height'], 'center')
+        vf = formatter._crop_filter(crop, target['width'], target['height'], use_gpu)
+        af = None
+        metadata = {'steps': []}
+        
+        if remove_silence:
+            remover = self.silence_remover
+            duration = remover._get_duration(input_path)
+            if duration <= 0:
+                return None
+            speaking = remover.get_speaking_segments(input_path, duration)
+            if not speaking:
+                return None
+            silence_stats = remover.silence_stats(duration, speaking)
+            if silence_stats['removed_duration'] > 0:
+                select_v, af = remover.select_filters(speaking)
+                vf = f"{select_v},{vf}"
+            metadata['steps'].append({'silence_removal': silence_stats})
+            metadata['silence_removed'] = True
+        
+        metadata['steps'].append({'vertical_format': {
+            'format': vertical_format,
+            'format_name': target['name'],
+            'source_size': f'{src_w}x{src_h}',
+            'target_size': f"{target['width']}x{target['height']}",
+            'crop_position': 'center'
+        }})
+        metadata['format'] = vertical_format
+        return (input_path, output_path, vf, af), metadata
+    
+    def _batch_ffmpeg(self, tasks: List[Tuple[str, str, str, Optional[str]]], use_gpu: bool) -> bool:
+        """
+        Encode several clips in one FFmpeg process: one input, one filter chain
+        and one output per (input, output, video_filter, audio_filter) task.
+        Audio is passed to the encoder unfiltered when audio_filter is None.
+        """
+        gpu = use_gpu and self.use_gpu_accel
+        cmd = ['ffmpeg', '-y']
+        graph = []
+        for i, (input_path, _, vf, af) in enumerate(tasks):
+            if gpu:
+                cmd.extend(['-hwaccel', 'cuda'])
+            cmd.extend(['-i', input_path])
+            graph.append(f"[{i}:v]{vf}[v{i}]")
+            if af:
+                graph.append(f"[{i}:a]{af}[a{i}]")
+        cmd.extend(['-filter_complex', ';'.join(graph)])
+        
+        encode_args = self.vertical_formatter._encode_args(use_gpu)
+        for i, (_, output_path, _, af) in enumerate(tasks):
+            cmd.extend(['-map', f'[v{i}]', '-map', f'[a{i}]' if af else f'{i}:a?'])
+            cmd.extend(encode_args)
+            cmd.append(output_path)
+        
+        try:
+            returncode, stderr = _run_ffmpeg(cmd, timeout=300 * len(tasks))
+        except Exception as e:
+            print(f"   ⚠️ Batch encode failed: {e}")
+            return False
+        if returncode != 0:
+            print(f"   ⚠️ Batch encode failed: {stderr[-300:]}")
+        return returncode == 0 and all(os.path.exists(t[1]) for t in tasks)
 
 
 # Convenience functions
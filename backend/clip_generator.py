@@ -4,14 +4,34 @@ Combines audio and video analysis to generate optimal clips
 Enhanced with Enterprise Features (Opus Clip / Vizard inspired)
 """
 import os
+import queue
 import re
+import bisect
+import collections
+import functools
+import hashlib
+import itertools
 import subprocess
+import threading
 import time
-from typing import List, Dict, Tuple, Optional
-from collections import Counter
+import zlib
+from typing import List, Dict, Tuple, Optional, Union
 import json
+from dataclasses import dataclass
 from datetime import timedelta
 
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - numba ships with openai-whisper
+    njit = None
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional fast multi-keyword matcher
+    ahocorasick = None
+
 # Enterprise Features Import
 try:
     from enterprise_features import (
@@ -48,9 +68,283 @@ except ImportError as e:
     print(f"   ⚠️ AI Enhancements not available: {e}")
 
 
+# Hot-path patterns, compiled once
+_WORD_RE = re.compile(r'\b\w+\b')
+_SENT_SPLIT_RE = re.compile(r'[.!?]')
+_DIGIT_RE = re.compile(r'\d+')
+# ASCII text: every non-word character becomes a space, so split() yields
+# exactly what _WORD_RE.findall would
+_ASCII_NON_WORD = str.maketrans({
+    chr(code): ' ' for code in range(128)
+    if not (chr(code).isalnum() or chr(code) == '_')
+})
+
+# Same, except sentence ends (.!?) become '.': one translate of a whole
+# ASCII text then splits into per-sentence word runs aligned with
+# _SENT_SPLIT_RE.split(text)
+_ASCII_SENTENCE_WORDS = str.maketrans({
+    **{chr(code): ' ' for code in range(128) if not (chr(code).isalnum() or chr(code) == '_')},
+    '.': '.', '!': '.', '?': '.',
+})
+
+# Specific numbers read as more credible (narrative context scoring)
+_POWER_NUMBER_RES = tuple(re.compile(pattern) for pattern in (
+    r'\d+%', r'\d+ persen', r'\d+x', r'\d+ kali',
+    r'\d+ juta', r'\d+ milyar', r'\d+ tahun', r'\d+ bulan',
+    r'\d+ hari', r'\d+ jam', r'\d+ langkah', r'\d+ cara',
+    r'pertama', r'kedua', r'ketiga', r'step \d', r'langkah \d'
+))
+
+
+# Clip reason labels, in bit order; _REASON_TEXTS[mask] joins the labels
+# whose bits are set (the text _label_segments reports for that mask)
+_REASON_LABELS = ('hook kuat', 'konten emosional', 'opini kontroversial', 'close-up speaker', 'visual dinamis')
+_REASON_BITS = 1 << np.arange(len(_REASON_LABELS))
+_REASON_TEXTS = tuple(
+    (' + '.join(label for bit, label in enumerate(_REASON_LABELS) if mask >> bit & 1) or 'konten informatif').capitalize()
+    for mask in range(1 << len(_REASON_LABELS))
+)
+
+# FFmpeg stderr lines kept for error reports
+_STDERR_TAIL_LINES = 256
+
+# Per-thread FFmpeg placement set by parallel export workers: .cpus (core
+# set to pin to) and .niceness, applied by _run_ffmpeg to each process it starts
+_ffmpeg_placement = threading.local()
+
+
+def _place_process(pid: int) -> None:
+    """Pin/renice a just-started FFmpeg per the calling thread's placement (best effort)"""
+    cpus = getattr(_ffmpeg_placement, 'cpus', None)
+    niceness = getattr(_ffmpeg_placement, 'niceness', 0)
+    try:
+        if cpus and hasattr(os, 'sched_setaffinity'):
+            os.sched_setaffinity(pid, cpus)
+        if niceness and hasattr(os, 'setpriority'):
+            os.setpriority(os.PRIO_PROCESS, pid, niceness)
+    except OSError:
+        pass  # process already exited, or not permitted
+
+
+def _run_ffmpeg(cmd: List[str], timeout: Optional[float] = None, check: bool = False) -> Tuple[int, str]:
+    """
+    Run FFmpeg with stderr drained by a thread into a bounded ring buffer, so
+    long encodes never stall on a full pipe or keep their whole log in memory.
+    Returns (returncode, stderr tail). Raises TimeoutExpired (after killing
+    the process) and, with check=True, CalledProcessError like subprocess.run.
+    """
+    proc = subprocess.Popen(
+        cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors='replace'
+    )
+    _place_process(proc.pid)
+    tail = collections.deque(maxlen=_STDERR_TAIL_LINES)
+    reader = threading.Thread(target=tail.extend, args=(proc.stderr,), daemon=True)
+    reader.start()
+    try:
+        returncode = proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        raise
+    finally:
+        reader.join()
+        proc.stderr.close()
+    stderr = ''.join(tail)
+    if check and returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd, stderr=stderr)
+    return returncode, stderr
+
+
+@functools.lru_cache(maxsize=1)
+def _ffmpeg_encoders() -> frozenset:
+    """
+    Encoder names from `ffmpeg -encoders`, scanned once per process.
+    Empty when FFmpeg is missing or the scan fails.
+    """
+    try:
+        result = subprocess.run(
+            ['ffmpeg', '-hide_banner', '-encoders'],
+            capture_output=True,
+            text=True,
+            timeout=10
+        )
+    except (OSError, subprocess.SubprocessError):
+        return frozenset()
+    encoders = set()
+    for line in result.stdout.splitlines():
+        parts = line.split()
+        # Encoder lines look like " V....D h264_nvenc  NVIDIA NVENC H.264 encoder"
+        if len(parts) >= 2 and len(parts[0]) == 6:
+            encoders.add(parts[1])
+    return frozenset(encoders)
+
+
+# Hardware H.264 encoders tried, in order, when the configured codec is missing
+_HW_ENCODERS = ('h264_nvenc', 'h264_qsv', 'h264_vaapi')
+
+
+def _jit(func):
+    """Compile with Numba when available; otherwise run as plain Python."""
+    if njit is None:
+        return func
+    return njit(cache=True)(func)
+
+
+@_jit
+def _distinct_mask(cand_start, cand_end, cand_dur, sel_starts, sel_ends, sel_durs, min_gap, max_overlap):
+    """
+    True when the candidate neither overlaps any selected clip by
+    max_overlap (relative to the shorter clip) nor starts and ends within
+    min_gap of one.
+    """
+    for i in range(sel_starts.shape[0]):
+        start = max(sel_starts[i], cand_start)
+        end = min(sel_ends[i], cand_end)
+        if end > start:
+            shortest = max(0.01, min(sel_durs[i], cand_dur))
+            if (end - start) / shortest >= max_overlap:
+                return False
+        if abs(cand_start - sel_starts[i]) < min_gap and abs(cand_end - sel_ends[i]) < min_gap:
+            return False
+    return True
+
+
+@functools.lru_cache(maxsize=8192)
+def _fmt_srt_ms(total_ms: int) -> str:
+    """HH:MM:SS,mmm for a non-negative millisecond count"""
+    total_secs, millis = divmod(total_ms, 1000)
+    total_mins, secs = divmod(total_secs, 60)
+    hours, minutes = divmod(total_mins, 60)
+    return f"{hours:02}:{minutes:02}:{secs:02},{millis:03}"
+
+
+def _escape_filter_value(value: str) -> str:
+    """
+    Escape a filter option value for an FFmpeg filtergraph: once for the
+    option parser (backslash, quote, colon), then once for the graph parser
+    (backslash, quote, brackets, comma, semicolon). Backslash goes first in
+    each pass so the escapes just added are not escaped again.
+    """
+    for char in "\\':":
+        value = value.replace(char, '\\' + char)
+    for char in "\\'[],;":
+        value = value.replace(char, '\\' + char)
+    return value
+
+
+@_jit
+def _caption_spans(starts, ends, lo, hi, clip_start, clip_end, min_span):
+    """
+    Transcript segments in [lo, hi) that overlap the clip by at least
+    min_span: their indices and start/end times relative to the clip.
+    """
+    count = max(hi - lo, 0)
+    indices = np.empty(count, dtype=np.int64)
+    rel_starts = np.empty(count, dtype=np.float64)
+    rel_ends = np.empty(count, dtype=np.float64)
+    n = 0
+    for i in range(lo, hi):
+        if ends[i] <= clip_start or starts[i] >= clip_end:
+            continue
+        relative_start = max(starts[i], clip_start) - clip_start
+        relative_end = min(ends[i], clip_end) - clip_start
+        if relative_end - relative_start < min_span:
+            continue
+        indices[n] = i
+        rel_starts[n] = relative_start
+        rel_ends[n] = relative_end
+        n += 1
+    return indices[:n], rel_starts[:n], rel_ends[:n]
+
+
+class _AudioTimeIndex:
+    """
+    Start-sorted view of transcript segments for time-window overlap queries.
+    A window only has to look at segments between the first whose running
+    max end reaches its start and the last starting before its end. Texts
+    and score dicts are kept alongside so windows can be joined by slice.
+    """
+
+    def __init__(self, audio_segments: List[Dict]):
+        self.source = audio_segments
+        self.size = len(audio_segments)
+        self.segments = sorted(audio_segments, key=lambda seg: seg.get('start', 0))
+        self.starts = [seg.get('start', 0) for seg in self.segments]
+        self.ends = [seg.get('end', 0) for seg in self.segments]
+        self.max_ends = list(itertools.accumulate(self.ends, max))
+        self.texts = [seg.get('text', '') for seg in self.segments]
+        self.scores = [seg.get('scores', {}) for seg in self.segments]
+        # Non-overlapping transcripts (the usual case) have ends in start order,
+        # so every window maps onto one contiguous [lo, hi) slice
+        self.ends_sorted = self.ends == self.max_ends
+
+    def is_for(self, audio_segments: List[Dict]) -> bool:
+        return self.source is audio_segments and self.size == len(audio_segments)
+
+    def window(self, start: float, end: float) -> Tuple[str, List[Dict], List[Dict]]:
+        """
+        Joined text, score dicts and segments overlapping [start, end]
+        (same test as _segments_overlap), in start order.
+        """
+        lo = bisect.bisect_left(self.max_ends, start)
+        hi = bisect.bisect_right(self.starts, end)
+        if self.ends_sorted:
+            return ' '.join(self.texts[lo:hi]), self.scores[lo:hi], self.segments[lo:hi]
+        ends = self.ends
+        hits = [i for i in range(lo, hi) if ends[i] >= start]
+        return (
+            ' '.join([self.texts[i] for i in hits]),
+            [self.scores[i] for i in hits],
+            [self.segments[i] for i in hits],
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class TranscriptArrays:
+    """
+    Transcript segments with text as struct-of-arrays: float64 start/end
+    arrays and the stripped texts, empty segments dropped. Caption lookups
+    slice these instead of reading a dict per segment per clip.
+    """
+    start: np.ndarray
+    end: np.ndarray
+    text: List[str]
+    in_order: bool  # starts and ends both non-decreasing, so clips can searchsorted
+    
+    @classmethod
+    def from_segments(cls, transcript_segments: List[Dict]) -> 'TranscriptArrays':
+        texts = []
+        seg_starts = []
+        seg_ends = []
+        for segment in transcript_segments:
+            text = (segment.get('text') or '').strip()
+            if not text:
+                continue
+            texts.append(text)
+            seg_starts.append(float(segment.get('start', 0)))
+            seg_ends.append(float(segment.get('end', 0)))
+        starts = np.array(seg_starts, dtype=np.float64)
+        ends = np.array(seg_ends, dtype=np.float64)
+        in_order = bool(np.all(starts[1:] >= starts[:-1]) and np.all(ends[1:] >= ends[:-1]))
+        return cls(starts, ends, texts, in_order)
+    
+    def __len__(self) -> int:
+        return len(self.text)
+
+
 class TimotyHookGenerator:
     """Generate punchy hook lines inspired by Timoty Ronald's delivery."""
 
+    # Memoized _select picks kept before the oldest is evicted
+    SELECT_CACHE_SIZE = 4096
+    # Memoized focus phrases, keyed by (text, theme)
+    FOCUS_CACHE_SIZE = 512
+
     def __init__(self):
         self.theme_keywords = {
             'closing': {
@@ -83,27 +377,27 @@ class TimotyHookGenerator:
             }
         }
 
-        self.openers = [
+        self.openers = (
             'Bro, dengerin bentar',
             'Gue kasih tau jujur',
             'Timoty selalu bilang',
             'Ini brutal banget',
             'Lu harus sadar'
-        ]
-        self.action_phrases = [
+        )
+        self.action_phrases = (
             'bikin prospek kebuka',
             'langsung nutup deal',
             'angkat conversion sampai 3x',
             'bikin lawan bicara diem',
             'pecahin sales mentok'
-        ]
-        self.commands = [
+        )
+        self.commands = (
             'Catet sekarang juga',
             'Jangan tunggu minggu depan',
             'Langsung praktek hari ini',
             'Jangan kebanyakan mikir',
             'Tes di prospek berikutnya'
-        ]
+        )
         self.templates = {
             'closing': [
                 '{opener}! Gue bongkar kenapa {focus}. {command}.',
@@ -131,9 +425,19 @@ class TimotyHookGenerator:
                 '{opener}! Gue gak mau lu ulang {focus}. {command}.'
             ]
         }
-        self.power_vocabulary = set(
-            sum((block['keywords'] for block in self.theme_keywords.values()), [])
-        )
+        # Option pools are tuples so their id() is a stable _select cache key
+        self.templates = {theme: tuple(pool) for theme, pool in self.templates.items()}
+        self._select_cache: Dict[Tuple[int, str], str] = {}
+        self._focus_cache: Dict[Tuple[str, str], str] = {}
+        
+        # O(1) per-token keyword checks
+        self._theme_keyword_sets = {
+            theme: frozenset(block['keywords'])
+            for theme, block in self.theme_keywords.items()
+        }
+        # Union of the theme sets (no list concatenation needed)
+        self.power_vocabulary = frozenset().union(*self._theme_keyword_sets.values())
+        self._keyword_automaton = self._build_keyword_automaton()
 
     def generate(self, segment: Dict) -> Dict:
         """Generate hook metadata for a clip segment."""
@@ -141,9 +445,17 @@ class TimotyHookGenerator:
         if not text:
             return None
 
-        tokens = self._tokenize(text)
-        theme, theme_score = self._detect_theme(tokens)
-        focus = self._extract_focus_phrase(text, theme)
+        hits = self._scan_keywords(text)
+        if hits is not None:
+            theme, theme_score = self._theme_from_counts(collections.Counter(
+                theme for _, themes in hits for theme in themes
+            ))
+            power_words = list(dict.fromkeys(keyword for keyword, _ in hits))[:5]
+        else:
+            tokens = self._tokenize(text)
+            theme, theme_score = self._detect_theme(tokens)
+            power_words = self._extract_power_words(tokens)
+        focus = self._extract_focus_phrase_cached(text, theme)
         opener = self._select(self.openers, text)
         command = self._select(self.commands, text + focus)
         action = self._select(self.action_phrases, focus)
@@ -170,36 +482,124 @@ class TimotyHookGenerator:
             'text': hook_text.strip(),
             'theme': theme,
             'confidence': round(confidence, 2),
-            'power_words': self._extract_power_words(tokens),
+            'power_words': power_words,
             'source_fragment': focus
         }
 
     def _tokenize(self, text: str) -> List[str]:
-        return re.findall(r'\b\w+\b', text.lower())
+        if text.isascii():
+            return text.lower().translate(_ASCII_NON_WORD).split()
+        return _WORD_RE.findall(text.lower())
 
     def _detect_theme(self, tokens: List[str]) -> Tuple[str, float]:
         best_theme = 'default'
-        best_score = 0.0
-        for theme, block in self.theme_keywords.items():
-            matches = sum(1 for token in tokens if token in block['keywords'])
-            normalized = matches / 4.0
-            if normalized > best_score:
+        best_matches = 0
+        token_count = len(tokens)
+        for theme, keyword_set in self._theme_keyword_sets.items():
+            # No later theme can have more raw hits than there are tokens
+            if best_matches >= token_count:
+                break
+            matches = 0
+            for i, token in enumerate(tokens):
+                if token in keyword_set:
+                    matches += 1
+                elif matches + token_count - i - 1 <= best_matches:
+                    # Even if every remaining token matched, it can't win
+                    break
+            if matches > best_matches:
                 best_theme = theme
-                best_score = normalized
-        return best_theme, min(best_score, 1.0)
+                best_matches = matches
+        return best_theme, min(best_matches / 4.0, 1.0)
+
+    def _build_keyword_automaton(self):
+        """
+        Aho-Corasick automaton over the single-word theme keywords, each
+        padded with spaces so it only matches a whole token of the
+        translated text. Value: (keyword, themes listing it). Multi-word
+        keywords are left out, as no single token can equal them.
+        """
+        if ahocorasick is None:
+            return None
+        keyword_themes: Dict[str, List[str]] = {}
+        for theme, keyword_set in self._theme_keyword_sets.items():
+            for keyword in keyword_set:
+                if keyword and not keyword.split()[1:] and keyword.isascii():
+                    keyword_themes.setdefault(keyword, []).append(theme)
+        if not keyword_themes:
+            return None
+        automaton = ahocorasick.Automaton()
+        for keyword, themes in keyword_themes.items():
+            automaton.add_word(f' {keyword} ', (keyword, tuple(themes)))
+        automaton.make_automaton()
+        return automaton
+
+    def _scan_keywords(self, text: str) -> Optional[List[Tuple[str, Tuple[str, ...]]]]:
+        """
+        Theme keyword hits in text order, from one automaton pass over the
+        lowercased ASCII text; None when the token path must be used instead
+        (no automaton, or non-ASCII text).
+        """
+        if self._keyword_automaton is None or not text.isascii():
+            return None
+        # Overlapping hits are reported, so adjacent keywords sharing a space both count
+        padded = f" {text.lower().translate(_ASCII_NON_WORD)} "
+        return [value for _, value in self._keyword_automaton.iter(padded)]
+
+    def _theme_from_counts(self, counts: Dict[str, int]) -> Tuple[str, float]:
+        """Same pick as _detect_theme, from per-theme keyword hit counts"""
+        best_theme = 'default'
+        best_matches = 0
+        for theme in self._theme_keyword_sets:
+            # Uncapped counts, so the theme with the most hits wins
+            matches = counts.get(theme, 0)
+            if matches > best_matches:
+                best_theme = theme
+                best_matches = matches
+        return best_theme, min(best_matches / 4.0, 1.0)
+
+    def _extract_focus_phrase_cached(self, text: str, theme: str) -> str:
+        key = (text, theme)
+        cached = self._focus_cache.get(key)
+        if cached is not None:
+            return cached
+        focus = self._extract_focus_phrase(text, theme)
+        if len(self._focus_cache) >= self.FOCUS_CACHE_SIZE:
+            # FIFO: dicts iterate in insertion order
+            del self._focus_cache[next(iter(self._focus_cache))]
+        self._focus_cache[key] = focus
+        return focus
+
+    def _sentence_words(self, text: str) -> List[Tuple[str, List[str]]]:
+        """
+        (stripped sentence, lowercase words) for each non-empty sentence.
+        ASCII text is lowercased and scanned once for all its sentences;
+        other text is tokenized sentence by sentence.
+        """
+        pieces = _SENT_SPLIT_RE.split(text)
+        if text.isascii():
+            word_runs = text.lower().translate(_ASCII_SENTENCE_WORDS).split('.')
+            return [
+                (piece.strip(), run.split())
+                for piece, run in zip(pieces, word_runs)
+                if piece.strip()
+            ]
+        return [(piece.strip(), self._tokenize(piece)) for piece in pieces if piece.strip()]
 
     def _extract_focus_phrase(self, text: str, theme: str) -> str:
-        sentences = [s.strip() for s in re.split(r'[.!?]', text) if s.strip()]
+        sentences = self._sentence_words(text)
         if not sentences:
-            sentences = [text.strip()]
-        theme_words = set(self.theme_keywords.get(theme, {}).get('keywords', []))
-        scored = []
-        for sentence in sentences:
-            lower_words = re.findall(r'\b\w+\b', sentence.lower())
+            stripped = text.strip()
+            sentences = [(stripped, self._tokenize(stripped))]
+        theme_words = self._theme_keyword_sets.get(theme, frozenset())
+        # Running max of (score, length, sentence), same pick as sorting descending
+        best_key = None
+        focus_sentence = sentences[0][0]
+        for sentence, lower_words in sentences:
             score = sum(1 for word in lower_words if word in theme_words)
-            scored.append((score, len(sentence), sentence))
-        scored.sort(reverse=True)
-        focus_sentence = scored[0][2] if scored else sentences[0]
+            key = (score, len(sentence), sentence)
+            if best_key is None or key > best_key:
+                best_key = key
+                focus_sentence = sentence
         words = focus_sentence.split()
         return ' '.join(words[:14]).strip()
 
@@ -209,21 +609,38 @@ class TimotyHookGenerator:
         return focus
 
     def _extract_power_words(self, tokens: List[str]) -> List[str]:
-        seen = []
+        seen = set()
+        ordered = []
         for token in tokens:
             if token in self.power_vocabulary and token not in seen:
-                seen.append(token)
-        return seen[:5]
+                seen.add(token)
+                ordered.append(token)
+                if len(ordered) == 5:
+                    break
+        return ordered
 
-    def _select(self, options: List[str], seed: str) -> str:
+    def _select(self, options: Tuple[str, ...], seed: str) -> str:
         if not options:
             return ''
-        idx = abs(hash(seed)) % len(options)
-        return options[idx]
+        key = (id(options), seed)
+        cached = self._select_cache.get(key)
+        if cached is not None:
+            return cached
+        # crc32 is stable across runs (str hash is salted per process), so the
+        # same transcript always gets the same template
+        choice = options[zlib.crc32(seed.encode('utf-8')) % len(options)]
+        if len(self._select_cache) >= self.SELECT_CACHE_SIZE:
+            # FIFO: dicts iterate in insertion order
+            del self._select_cache[next(iter(self._select_cache))]
+        self._select_cache[key] = choice
+        return choice
 
 
 
 class ClipGenerator:
+    # From this many segments on, base viral scores are computed as arrays
+    VECTOR_SCORE_MIN_SEGMENTS = 16
+
     def __init__(self, video_path: str, config, resolution: str = None, aspect_ratio: str = None):
         self.video_path = video_path
         self.config = config
@@ -232,6 +649,14 @@ class ClipGenerator:
         self.needs_review = False
         self.review_reason = ''
         self.selection_mode = getattr(config, 'CLIP_SELECTION_MODE', 'standard').lower()
+        # Source stream info / keyframe times, probed once per video path
+        self._probe_cache: Dict[str, Dict] = {}
+        self._keyframe_cache: Dict[str, List[float]] = {}
+        # Flash-word matcher over the configured vocab + mental slap keywords
+        self._flash_vocab = getattr(config, 'TEXT_FLASH_VOCAB', [])
+        self._flash_automaton = self._build_flash_automaton(self._flash_vocab)
+        # Parallel exports share one probe instead of each running their own
+        self._probe_lock = threading.Lock()
         
         # Initialize Enterprise Features
         self.enterprise_enabled = ENTERPRISE_FEATURES_AVAILABLE
@@ -729,13 +1154,9 @@ class ClipGenerator:
         end: float
     ) -> Tuple[str, Dict, List[Dict]]:
         """Collect transcript + scores for a time window."""
-        overlapping_audio = [
-            seg for seg in audio_segments
-            if self._segments_overlap((start, end), (seg.get('start', 0), seg.get('end', 0)))
-        ]
-        combined_text = ' '.join([seg.get('text', '') for seg in overlapping_audio]).strip()
-        avg_audio_scores = self._average_audio_scores(overlapping_audio)
-        return combined_text, avg_audio_scores, overlapping_audio
+        combined_text, scores, overlapping_audio = self._audio_index(audio_segments).window(start, end)
+        avg_audio_scores = self._average_audio_scores(scores)
+        return combined_text.strip(), avg_audio_scores, overlapping_audio
 
     def _aggregate_visual_signals(self, scenes: List[Dict], start: float, end: float) -> Dict:
         """Aggregate visual signals for a time window."""
@@ -1584,6 +2005,14 @@ class ClipGenerator:
         """Check if two time segments overlap"""
         return seg1[0] <= seg2[1] and seg2[0] <= seg1[1]
     
+    def _audio_index(self, audio_segments: List[Dict]) -> _AudioTimeIndex:
+        """Overlap index for audio_segments, rebuilt only when a different list comes in"""
+        index = getattr(self, '_audio_time_index', None)
+        if index is None or not index.is_for(audio_segments):
+            index = _AudioTimeIndex(audio_segments)
+            self._audio_time_index = index
+        return index
+    
     def _create_time_based_segments(self, audio_segments: List[Dict], video_duration: float) -> List[Dict]:
         """
         Create time-based segments for monolog/podcast videos with minimal scene changes.
@@ -1636,6 +2065,7 @@ class ClipGenerator:
     def _segment_by_pauses(self, audio_segments: List[Dict], pause_points: List[float]) -> List[Dict]:
         """Create segments around natural pause points."""
         segments = []
+        audio_index = self._audio_index(audio_segments)
         
         for i in range(len(pause_points) - 1):
             start = pause_points[i]
@@ -1644,14 +2074,10 @@ class ClipGenerator:
             
             # Only use segments between 10-50 seconds (expanded for extended duration)
             if 10 <= duration <= 50:
-                overlapping_audio = [
-                    seg for seg in audio_segments
-                    if self._segments_overlap((start, end), (seg['start'], seg['end']))
-                ]
+                combined_text, scores, overlapping_audio = audio_index.window(start, end)
                 
                 if overlapping_audio:
-                    combined_text = ' '.join([seg.get('text', '') for seg in overlapping_audio])
-                    avg_audio_scores = self._average_audio_scores(overlapping_audio)
+                    avg_audio_scores = self._average_audio_scores(scores)
                     
                     segments.append({
                         'start': start,
@@ -1711,6 +2137,8 @@ class ClipGenerator:
                 (45, 0.75),  # Extended clips: 45s, 75% step - for better context
             ]
         
+        audio_index = self._audio_index(audio_segments)
+        
         for segment_length, step_ratio in segment_configs:
             start_time = 0
             step = segment_length * step_ratio
@@ -1725,18 +2153,13 @@ class ClipGenerator:
                     continue
                 
                 # Find audio segments that overlap
-                overlapping_audio = [
-                    seg for seg in audio_segments
-                    if self._segments_overlap((start_time, end_time), (seg['start'], seg['end']))
-                ]
+                combined_text, scores, overlapping_audio = audio_index.window(start_time, end_time)
                 
                 # ALWAYS create segment if we have audio OR if duration is valid
-                combined_text = ''
                 avg_audio_scores = {}
                 
                 if overlapping_audio:
-                    combined_text = ' '.join([seg.get('text', '') for seg in overlapping_audio])
-                    avg_audio_scores = self._average_audio_scores(overlapping_audio)
+                    avg_audio_scores = self._average_audio_scores(scores)
                 else:
                     # Even without matching audio, create segment for monolog
                     avg_audio_scores = {
@@ -1815,7 +2238,7 @@ class ClipGenerator:
         """Create a single segment from a group of audio segments."""
         group_end = max(seg.get('end', seg.get('start', 0) + 5) for seg in audio_group)
         combined_text = ' '.join([seg.get('text', '') for seg in audio_group])
-        avg_scores = self._average_audio_scores(audio_group)
+        avg_scores = self._average_audio_scores([seg.get('scores', {}) for seg in audio_group])
         
         return {
             'start': group_start,
@@ -1835,9 +2258,9 @@ class ClipGenerator:
             'is_emergency': True
         }
     
-    def _average_audio_scores(self, segments: List[Dict]) -> Dict:
-        """Average audio scores from multiple segments"""
-        if not segments:
+    def _average_audio_scores(self, scores_list: List[Dict]) -> Dict:
+        """Average the 'scores' dicts of multiple audio segments"""
+        if not scores_list:
             # Return default scores instead of empty dict
             return {
                 'hook': 0.3, 'emotional': 0.2, 'controversial': 0.1,
@@ -1851,23 +2274,27 @@ class ClipGenerator:
             'engagement', 'money', 'urgency', 'mental_slap',
             'rare_topic', 'meta_topic_strength'
         ]
-        averaged = {}
+        # Single pass: running sums/counts per key and a topic histogram
+        sums = dict.fromkeys(keys, 0.0)
+        counts = dict.fromkeys(keys, 0)
+        topic_counts: Dict[str, int] = {}
         
-        for key in keys:
-            values = []
-            for seg in segments:
-                scores = seg.get('scores', {})
+        for scores in scores_list:
+            for key in keys:
                 if key in scores:
-                    values.append(scores[key])
-            averaged[key] = sum(values) / len(values) if values else 0.2  # Default 0.2 instead of 0
-        
-        meta_topics = []
-        for seg in segments:
-            scores = seg.get('scores', {})
-            if scores.get('meta_topic'):
-                meta_topics.append(scores['meta_topic'])
-        if meta_topics:
-            averaged['meta_topic'] = Counter(meta_topics).most_common(1)[0][0]
+                    sums[key] += scores[key]
+                    counts[key] += 1
+            meta_topic = scores.get('meta_topic')
+            if meta_topic:
+                topic_counts[meta_topic] = topic_counts.get(meta_topic, 0) + 1
+        
+        averaged = {
+            key: sums[key] / counts[key] if counts[key] else 0.2  # Default 0.2 instead of 0
+            for key in keys
+        }
+        if topic_counts:
+            # Most frequent topic; ties go to the one seen first
+            averaged['meta_topic'] = max(topic_counts, key=topic_counts.get)
         
         return averaged
     
@@ -2241,15 +2668,7 @@ class ClipGenerator:
             context_scores['has_repetition'] = True
         
         # 4. POWER NUMBERS (specific numbers are more credible)
-        number_patterns = [
-            r'\d+%', r'\d+ persen', r'\d+x', r'\d+ kali',
-            r'\d+ juta', r'\d+ milyar', r'\d+ tahun', r'\d+ bulan',
-            r'\d+ hari', r'\d+ jam', r'\d+ langkah', r'\d+ cara',
-            r'pertama', r'kedua', r'ketiga', r'step \d', r'langkah \d'
-        ]
-        import re as regex_module
-        number_count = sum(1 for pattern in number_patterns 
-                         if regex_module.search(pattern, text))
+        number_count = sum(1 for pattern in _POWER_NUMBER_RES if pattern.search(text))
         if number_count >= 2:
             context_scores['narrative_strength'] += 0.1
             context_scores['has_power_numbers'] = True
@@ -2575,9 +2994,13 @@ class ClipGenerator:
         
         scored = []
         
-        for segment in segments:
-            # Calculate base viral score
-            viral_score = self._calculate_viral_score(segment, style)
+        # Calculate base viral scores
+        if len(segments) >= self.VECTOR_SCORE_MIN_SEGMENTS:
+            base_scores = self._calculate_viral_scores(segments, style).tolist()
+        else:
+            base_scores = [self._calculate_viral_score(segment, style) for segment in segments]
+        
+        for segment, viral_score in zip(segments, base_scores):
             base_score = viral_score
 
             # HIGH IQ ANALYSIS: Narrative context
@@ -2803,17 +3226,26 @@ class ClipGenerator:
         duration = segment.get('duration', 0)
         is_fallback = segment.get('is_fallback', False)
 
-        hook = min(max(audio.get('hook', 0), 0), 1)
-        audio_engagement = min(max(audio.get('engagement', 0), 0), 1)
-        visual_engagement = min(max(visual.get('visual_engagement', 0), 0), 1)
+        # Each score is read once; several feed more than one bucket below
+        audio_get = audio.get
+        emotional = audio_get('emotional', 0)
+        educational = audio_get('educational', 0)
+        entertaining = audio_get('entertaining', 0)
+        controversial = audio_get('controversial', 0)
+        visual_get = visual.get
+        has_faces = visual_get('has_faces')
+
+        hook = min(max(audio_get('hook', 0), 0), 1)
+        audio_engagement = min(max(audio_get('engagement', 0), 0), 1)
+        visual_engagement = min(max(visual_get('visual_engagement', 0), 0), 1)
 
         content_value = (
-            audio.get('emotional', 0) * 0.25 +
-            audio.get('educational', 0) * 0.18 +
-            audio.get('entertaining', 0) * 0.18 +
-            audio.get('controversial', 0) * 0.10 +
-            audio.get('money', 0) * 0.15 +
-            audio.get('urgency', 0) * 0.14
+            emotional * 0.25 +
+            educational * 0.18 +
+            entertaining * 0.18 +
+            controversial * 0.10 +
+            audio_get('money', 0) * 0.15 +
+            audio_get('urgency', 0) * 0.14
         )
         content_value = min(1.0, max(0.0, content_value))
 
@@ -2830,38 +3262,32 @@ class ClipGenerator:
         # Style score normalized
         style_score = 0.0
         if style == 'funny':
-            style_score = audio.get('entertaining', 0)
+            style_score = entertaining
         elif style == 'educational':
-            style_score = audio.get('educational', 0)
+            style_score = educational
         elif style == 'dramatic':
-            style_score = audio.get('emotional', 0)
+            style_score = emotional
         elif style == 'controversial':
-            style_score = audio.get('controversial', 0)
+            style_score = controversial
         elif style == 'balanced':
-            style_score = (
-                audio.get('entertaining', 0) +
-                audio.get('educational', 0) +
-                audio.get('emotional', 0)
-            ) / 3
+            style_score = (entertaining + educational + emotional) / 3
         style_score = min(1.0, max(0.0, style_score))
 
         # Bonus bucket (capped)
         bonus_bucket = 0.0
-        if visual.get('has_closeup'):
+        if visual_get('has_closeup'):
             bonus_bucket += 0.05
-        if visual.get('has_high_motion'):
+        if visual_get('has_high_motion'):
             bonus_bucket += 0.05
-        if visual.get('has_faces'):
+        if has_faces:
             bonus_bucket += 0.03
         if text and '?' in text:
             bonus_bucket += 0.03
-        if text:
-            import re
-            if re.search(r'\d+', text):
-                bonus_bucket += 0.03
-        bonus_bucket += audio.get('mental_slap', 0) * 0.08
-        bonus_bucket += audio.get('meta_topic_strength', 0) * 0.06
-        if is_fallback and visual.get('has_faces'):
+        if text and _DIGIT_RE.search(text):
+            bonus_bucket += 0.03
+        bonus_bucket += audio_get('mental_slap', 0) * 0.08
+        bonus_bucket += audio_get('meta_topic_strength', 0) * 0.06
+        if is_fallback and has_faces:
             bonus_bucket += 0.05
         bonus_bucket = self._cap_bonus(bonus_bucket, 0.18)
 
@@ -2875,7 +3301,7 @@ class ClipGenerator:
             bonus_bucket -= 0.04
         bonus_bucket = self._cap_bonus(max(bonus_bucket, 0.0), 0.20)
 
-        penalty_bucket = audio.get('rare_topic', 0) * 0.15
+        penalty_bucket = audio_get('rare_topic', 0) * 0.15
         penalty_bucket = self._cap_bonus(penalty_bucket, 0.12)
 
         base_score = (
@@ -2890,12 +3316,12 @@ class ClipGenerator:
         total_score = base_score + bonus_bucket - penalty_bucket
 
         # Ghost speaker penalty (visual not talking but audio active)
-        is_talking_visual = visual.get('is_talking', True)
+        is_talking_visual = visual_get('is_talking', True)
         has_ghost_speaker_issue = (
             not is_talking_visual and
             not is_fallback and
-            visual.get('has_faces') and
-            visual.get('face_count', 0) > 0
+            has_faces and
+            visual_get('face_count', 0) > 0
         )
         if has_ghost_speaker_issue:
             total_score *= 0.7
@@ -2906,6 +3332,122 @@ class ClipGenerator:
 
         total_score = max(0.0, min(total_score, 1.0))
         return max(0.0, min(self._logistic_scale(total_score, k=4.0, midpoint=0.6), 1.0))
+
+    def _calculate_viral_scores(self, segments: List[Dict], style: str) -> np.ndarray:
+        """
+        _calculate_viral_score for every segment at once.
+        Signals are gathered into per-field arrays (one pass over the dicts),
+        then the same formula is evaluated column-wise.
+        """
+        n = len(segments)
+        audio_keys = (
+            'hook', 'engagement', 'emotional', 'educational', 'entertaining',
+            'controversial', 'money', 'urgency', 'mental_slap',
+            'meta_topic_strength', 'rare_topic'
+        )
+        audio_cols = np.empty((len(audio_keys), n), dtype=np.float64)
+        visual_engagement = np.empty(n, dtype=np.float64)
+        flags = np.zeros((7, n), dtype=bool)  # closeup, motion, faces, question, digit, fallback, talking
+        face_count = np.empty(n, dtype=np.float64)
+        duration = np.empty(n, dtype=np.float64)
+        word_count = np.empty(n, dtype=np.float64)
+
+        for i, segment in enumerate(segments):
+            audio_get = segment['audio'].get
+            visual_get = segment['visual'].get
+            text = segment.get('text', '') or ''
+            for k, key in enumerate(audio_keys):
+                audio_cols[k, i] = audio_get(key, 0)
+            visual_engagement[i] = visual_get('visual_engagement', 0)
+            flags[0, i] = bool(visual_get('has_closeup'))
+            flags[1, i] = bool(visual_get('has_high_motion'))
+            flags[2, i] = bool(visual_get('has_faces'))
+            flags[3, i] = '?' in text
+            flags[4, i] = _DIGIT_RE.search(text) is not None
+            flags[5, i] = bool(segment.get('is_fallback', False))
+            flags[6, i] = bool(visual_get('is_talking', True))
+            face_count[i] = visual_get('face_count', 0)
+            duration[i] = segment.get('duration', 0)
+            word_count[i] = len(text.split())
+
+        (hook, audio_engagement, emotional, educational, entertaining,
+         controversial, money, urgency, mental_slap, meta_topic, rare_topic) = audio_cols
+        has_closeup, has_motion, has_faces, has_question, has_digit, is_fallback, is_talking = flags
+
+        hook = np.clip(hook, 0, 1)
+        audio_engagement = np.clip(audio_engagement, 0, 1)
+        visual_engagement = np.clip(visual_engagement, 0, 1)
+
+        content_value = np.clip(
+            emotional * 0.25 + educational * 0.18 + entertaining * 0.18 +
+            controversial * 0.10 + money * 0.15 + urgency * 0.14,
+            0.0, 1.0
+        )
+
+        # Pacing score - prefer punchy clips but allow longer context
+        pacing_score = np.select(
+            [duration <= 15, duration <= 25, duration <= 35],
+            [1.0, 0.8, 0.6],
+            default=0.4
+        )
+
+        # Style score normalized
+        if style == 'funny':
+            style_score = entertaining
+        elif style == 'educational':
+            style_score = educational
+        elif style == 'dramatic':
+            style_score = emotional
+        elif style == 'controversial':
+            style_score = controversial
+        elif style == 'balanced':
+            style_score = (entertaining + educational + emotional) / 3
+        else:
+            style_score = np.zeros(n)
+        style_score = np.clip(style_score, 0.0, 1.0)
+
+        # Bonus bucket (capped)
+        bonus_bucket = (
+            has_closeup * 0.05 + has_motion * 0.05 + has_faces * 0.03 +
+            has_question * 0.03 + has_digit * 0.03 +
+            mental_slap * 0.08 + meta_topic * 0.06 +
+            (is_fallback & has_faces) * 0.05
+        )
+        bonus_bucket = np.minimum(bonus_bucket, 0.18)
+
+        # WPM adjustment (small)
+        wpm = word_count / (np.maximum(duration, 1) / 60.0)
+        bonus_bucket += np.where((wpm >= 130) & (wpm <= 190), 0.04, 0.0)
+        bonus_bucket -= np.where((wpm < 100) | (wpm > 220), 0.04, 0.0)
+        bonus_bucket = np.minimum(np.maximum(bonus_bucket, 0.0), 0.20)
+
+        penalty_bucket = np.minimum(rare_topic * 0.15, 0.12)
+
+        base_score = (
+            hook * 0.28 +
+            content_value * 0.26 +
+            visual_engagement * 0.18 +
+            audio_engagement * 0.12 +
+            pacing_score * 0.08 +
+            style_score * 0.08
+        )
+        total_score = base_score + bonus_bucket - penalty_bucket
+
+        # Ghost speaker penalty (visual not talking but audio active)
+        ghost = ~is_talking & ~is_fallback & has_faces & (face_count > 0)
+        total_score = np.where(ghost, total_score * 0.7, total_score)
+
+        fallback_floor = getattr(self.config, 'FALLBACK_VIRAL_SCORE', 0.15)
+        total_score = np.where(is_fallback, np.maximum(total_score, fallback_floor), total_score)
+
+        # Vectorized _logistic_scale(k=4.0, midpoint=0.6)
+        k, midpoint = 4.0, 0.6
+        value = np.clip(total_score, 0.0, 1.0)
+        low = 1.0 / (1.0 + np.exp(-k * (0.0 - midpoint)))
+        high = 1.0 / (1.0 + np.exp(-k * (1.0 - midpoint)))
+        scaled = 1.0 / (1.0 + np.exp(-k * (value - midpoint)))
+        return np.clip((scaled - low) / (high - low), 0.0, 1.0)
+
     def _determine_category(self, segment: Dict) -> str:
         """Determine the primary category of the segment"""
         audio = segment['audio']
@@ -2953,7 +3495,8 @@ class ClipGenerator:
         def duration_ok(segment: Dict) -> bool:
             return segment.get('duration', 0) >= min_duration
 
-        allow_fallback = bool(getattr(self.config, 'QUALITY_FIRST_ALLOW_FALLBACK', False)) if quality_first else True
+        cfg = self.config
+        allow_fallback = bool(getattr(cfg, 'QUALITY_FIRST_ALLOW_FALLBACK', False)) if quality_first else True
         fallback_segments = [
             s for s in scored_segments
             if s.get('is_fallback') and duration_ok(s)
@@ -2980,7 +3523,7 @@ class ClipGenerator:
             print(f"   Using all scored segments: {len(candidates)}")
 
         # Give priority to fallback monolog segments when no standard candidates available
-        if allow_fallback and fallback_segments and len(candidates) < getattr(self.config, 'MIN_CLIP_OUTPUT', 5):
+        if allow_fallback and fallback_segments and len(candidates) < getattr(cfg, 'MIN_CLIP_OUTPUT', 5):
             # extend while preserving order and avoiding duplicates
             seen_ids = set(id(seg) for seg in candidates)
             for seg in fallback_segments:
@@ -2991,54 +3534,86 @@ class ClipGenerator:
                     seen_ids.add(id(seg))
             print(f"   After adding fallback priority: {len(candidates)}")
 
-        max_clips = max(1, getattr(self.config, 'MAX_CLIPS_PER_VIDEO', 15))
-        min_required = 0 if quality_first else min(max_clips, max(1, getattr(self.config, 'MIN_CLIP_OUTPUT', 3)))
-        target_goal = min(max_clips, max(min_required, getattr(self.config, 'TARGET_CLIP_COUNT', min_required)))
+        max_clips = max(1, getattr(cfg, 'MAX_CLIPS_PER_VIDEO', 15))
+        min_required = 0 if quality_first else min(max_clips, max(1, getattr(cfg, 'MIN_CLIP_OUTPUT', 3)))
+        target_goal = min(max_clips, max(min_required, getattr(cfg, 'TARGET_CLIP_COUNT', min_required)))
 
-        base_threshold = getattr(self.config, 'MIN_VIRAL_SCORE', 0.10)
+        base_threshold = getattr(cfg, 'MIN_VIRAL_SCORE', 0.10)
         if quality_first:
-            base_threshold = max(base_threshold, float(getattr(self.config, 'QUALITY_FIRST_MIN_SCORE', base_threshold)))
-        relaxed_threshold = max(getattr(self.config, 'RELAXED_VIRAL_SCORE', 0.05), 0.0)
-        fallback_threshold = max(getattr(self.config, 'FALLBACK_VIRAL_SCORE', 0.01), 0.0)
+            base_threshold = max(base_threshold, float(getattr(cfg, 'QUALITY_FIRST_MIN_SCORE', base_threshold)))
+        relaxed_threshold = max(getattr(cfg, 'RELAXED_VIRAL_SCORE', 0.05), 0.0)
+        fallback_threshold = max(getattr(cfg, 'FALLBACK_VIRAL_SCORE', 0.01), 0.0)
+        min_gap = float(max(0.0, getattr(cfg, 'MIN_CLIP_GAP_SECONDS', 3.0)))
+        max_overlap = float(max(0.0, getattr(cfg, 'MAX_CLIP_OVERLAP_RATIO', 0.6)))
 
         print(f"   Thresholds: base={base_threshold}, relaxed={relaxed_threshold}, fallback={fallback_threshold}")
         print(f"   Goals: min={min_required}, target={target_goal}, max={max_clips}")
 
         seen_keys = set()
+        # Progressive selection with decreasing thresholds: (threshold, limit) per tier
+        tiers = (
+            (base_threshold, target_goal),
+            (relaxed_threshold, target_goal),
+            (relaxed_threshold, max_clips),
+            (fallback_threshold, max_clips),
+            (0.0, max_clips),  # ZERO threshold as final attempt
+        )
+        # Each candidate is bucketed once, best score first, under the first tier
+        # whose threshold it clears, so the tiers are walked in a single pass
+        # instead of re-scanning every candidate per threshold.
+        buckets = [[] for _ in tiers]
+        ranked = sorted(
+            (segment for segment in candidates if duration_ok(segment)),
+            key=lambda item: item.get('viral_score', 0),
+            reverse=True,
+        )
+        for segment in ranked:
+            score = segment.get('viral_score', 0)
+            is_fallback = segment.get('is_fallback')
+            for tier, (threshold, _) in enumerate(tiers):
+                if is_fallback:
+                    threshold = min(threshold, fallback_threshold)
+                if score >= threshold:
+                    key = (round(segment['start'], 2), round(segment['end'], 2))
+                    buckets[tier].append((segment, key))
+                    break
 
-        def pick(threshold: float, limit: int) -> None:
+        # At most max_clips are picked here, so the spans of picked clips fit
+        # in fixed arrays that the distinctness kernel reads as views
+        sel_starts = np.empty(max_clips, dtype=np.float64)
+        sel_ends = np.empty(max_clips, dtype=np.float64)
+        sel_durs = np.empty(max_clips, dtype=np.float64)
+
+        # Eligible candidates cut off by a tier's limit wait for a later tier
+        # with a higher limit; clips rejected as near-duplicates never return,
+        # since the selection only grows.
+        deferred = []
+        for tier, (_, limit) in enumerate(tiers):
             limit = min(limit, max_clips)
-            if len(selected) >= limit:
-                return
-            for segment in candidates:
-                if len(selected) >= limit:
+            pending = deferred + buckets[tier] if deferred else buckets[tier]
+            deferred = []
+            for position, (segment, key) in enumerate(pending):
+                count = len(selected)
+                if count >= limit:
+                    deferred = pending[position:]
                     break
-                if not duration_ok(segment):
-                    continue
-                key = (round(segment['start'], 2), round(segment['end'], 2))
                 if key in seen_keys:
                     continue
-                effective_threshold = threshold
-                if segment.get('is_fallback'):
-                    effective_threshold = min(threshold, fallback_threshold)
-                if segment.get('viral_score', 0) < effective_threshold:
-                    continue
-                if not self._is_distinct_segment(segment, selected):
+                if not _distinct_mask(
+                    float(segment['start']), float(segment['end']), float(segment['duration']),
+                    sel_starts[:count], sel_ends[:count], sel_durs[:count],
+                    min_gap, max_overlap,
+                ):
                     continue
+                sel_starts[count] = segment['start']
+                sel_ends[count] = segment['end']
+                sel_durs[count] = segment['duration']
                 selected.append(segment)
                 seen_keys.add(key)
-
-        # Progressive selection with decreasing thresholds
-        for threshold, limit in (
-            (base_threshold, target_goal),
-            (relaxed_threshold, target_goal),
-            (relaxed_threshold, max_clips),
-            (fallback_threshold, max_clips),
-            (0.0, max_clips),  # ZERO threshold as final attempt
-        ):
-            pick(threshold, limit)
             if not quality_first and len(selected) >= min_required:
                 break
+            if len(selected) >= max_clips:
+                break
         
         print(f"   After threshold passes: {len(selected)} selected")
 
@@ -3066,7 +3641,7 @@ class ClipGenerator:
                 seen_keys.add(key)
 
         if not quality_first:
-            forced_min = max(1, getattr(self.config, 'FORCED_MIN_CLIP_OUTPUT', 3))
+            forced_min = max(1, getattr(cfg, 'FORCED_MIN_CLIP_OUTPUT', 3))
             if len(selected) < forced_min:
                 forced = self._force_minimum_output(
                     selected,
@@ -3122,26 +3697,6 @@ class ClipGenerator:
         
         return adjusted
 
-    def _is_distinct_segment(self, candidate: Dict, selected: List[Dict]) -> bool:
-        """Prevent near-duplicate clips by enforcing overlap and spacing rules."""
-        if not selected:
-            return True
-
-        min_gap = max(0.0, getattr(self.config, 'MIN_CLIP_GAP_SECONDS', 3.0))
-        max_overlap = max(0.0, getattr(self.config, 'MAX_CLIP_OVERLAP_RATIO', 0.6))
-
-        for existing in selected:
-            overlap = self._calculate_overlap_ratio(existing, candidate)
-            if overlap >= max_overlap:
-                return False
-
-            start_gap = abs(candidate['start'] - existing['start'])
-            end_gap = abs(candidate['end'] - existing['end'])
-            if start_gap < min_gap and end_gap < min_gap:
-                return False
-
-        return True
-
     @staticmethod
     def _calculate_overlap_ratio(seg_a: Dict, seg_b: Dict) -> float:
         """Measure overlap relative to the shorter clip to detect duplicates."""
@@ -3255,15 +3810,19 @@ class ClipGenerator:
                 except Exception as e:
                     print(f"   ⚠️ LLM analysis failed for clip {idx + 1}: {e}")
         
+        # Viral level, reason and transcript preview for all segments at once
+        viral_levels, reasons = self._label_segments(segments)
+        previews = [
+            text[:200] + '...' if len(text) > 200 else text
+            for text in (segment['text'] for segment in segments)
+        ]
+        
         for idx, segment in enumerate(segments):
             # Generate title
             title = self._generate_title(segment)
             
-            # Determine viral level
-            viral_level = self._get_viral_level(segment['viral_score'])
-            
-            # Generate reason
-            reason = self._generate_reason(segment)
+            viral_level = viral_levels[idx]
+            reason = reasons[idx]
             
             clip_payload = {
                 'id': idx + 1,
@@ -3274,11 +3833,14 @@ class ClipGenerator:
                 'start_seconds': segment['start'],
                 'end_seconds': segment['end'],
                 'duration': segment['duration'],
+                # -ss/-t strings for FFmpeg, formatted once (millisecond precision)
+                '_ff_ss': f"{segment['start']:.3f}",
+                '_ff_t': f"{segment['duration']:.3f}",
                 'viral_score': viral_level,
                 'viral_score_numeric': round(segment['viral_score'], 2),
                 'reason': reason,
                 'category': segment['category'],
-                'transcript': segment['text'][:200] + '...' if len(segment['text']) > 200 else segment['text']
+                'transcript': previews[idx]
             }
             
             # LLM INTELLIGENCE: Add AI-powered insights
@@ -3390,9 +3952,18 @@ class ClipGenerator:
         
         return clips
 
-    def attach_captions(self, clips: List[Dict], transcript_segments: List[Dict]) -> None:
-        """Attach caption metadata to clips based on transcript segments."""
-        if not transcript_segments:
+    def attach_captions(self, clips: List[Dict], transcript_segments: Union[List[Dict], TranscriptArrays]) -> None:
+        """
+        Attach caption metadata to clips based on transcript segments
+        (segment dicts, or a TranscriptArrays already built from them).
+        """
+        if not isinstance(transcript_segments, TranscriptArrays):
+            if not transcript_segments:
+                return
+            # One pass over the transcript: texts are stripped once (not once
+            # per clip) and segments without text never reach the lookups
+            transcript_segments = TranscriptArrays.from_segments(transcript_segments)
+        if not len(transcript_segments):
             return
 
         for clip in clips:
@@ -3417,47 +3988,38 @@ class ClipGenerator:
         
         return f"{key_phrase}..."
     
-    def _get_viral_level(self, score: float) -> str:
-        """Convert numeric score to level"""
-        if score >= 0.75:
-            return 'Tinggi'
-        elif score >= 0.5:
-            return 'Sedang'
-        else:
-            return 'Rendah'
-    
-    def _generate_reason(self, segment: Dict) -> str:
-        """Generate explanation for viral score"""
-        reasons = []
-        
-        audio = segment['audio']
-        visual = segment['visual']
-        
-        if audio.get('hook', 0) > 0.5:
-            reasons.append('hook kuat')
-        
-        if audio.get('emotional', 0) > 0.5:
-            reasons.append('konten emosional')
-        
-        if audio.get('controversial', 0) > 0.5:
-            reasons.append('opini kontroversial')
-        
-        if visual.get('has_closeup'):
-            reasons.append('close-up speaker')
-        
-        if visual.get('has_high_motion'):
-            reasons.append('visual dinamis')
-        
-        if not reasons:
-            reasons.append('konten informatif')
-        
-        return ' + '.join(reasons).capitalize()
+    def _label_segments(self, segments: List[Dict]) -> Tuple[List[str], List[str]]:
+        """
+        Viral level and reason text for every segment in one NumPy pass:
+        levels from score thresholds, reasons from a 5-bit mask of the
+        metrics that fired, looked up in the precomputed _REASON_TEXTS.
+        """
+        if not segments:
+            return [], []
+        scores = np.fromiter((seg['viral_score'] for seg in segments), dtype=np.float64, count=len(segments))
+        levels = np.where(scores >= 0.75, 'Tinggi', np.where(scores >= 0.5, 'Sedang', 'Rendah'))
+        
+        metrics = np.array([
+            (
+                seg['audio'].get('hook', 0),
+                seg['audio'].get('emotional', 0),
+                seg['audio'].get('controversial', 0),
+                bool(seg['visual'].get('has_closeup')),
+                bool(seg['visual'].get('has_high_motion')),
+            )
+            for seg in segments
+        ], dtype=np.float64)
+        fired = np.empty_like(metrics, dtype=bool)
+        fired[:, :3] = metrics[:, :3] > 0.5
+        fired[:, 3:] = metrics[:, 3:] != 0
+        masks = fired @ _REASON_BITS
+        return levels.tolist(), [_REASON_TEXTS[mask] for mask in masks.tolist()]
     
     def _format_timestamp(self, seconds: float) -> str:
         """Format seconds to HH:MM:SS"""
         return str(timedelta(seconds=int(seconds)))
     
-    def export_clip(self, clip: Dict, output_dir: str) -> str:
+    def export_clip(self, clip: Dict, output_dir: str, threads: Optional[int] = None) -> str:
         """
         Export a single clip using FFmpeg with ADVANCED GPU acceleration (NVIDIA CUDA)
         - Hardware-accelerated decoding (CUDA decoder)
@@ -3465,12 +4027,111 @@ class ClipGenerator:
         - NVIDIA NVENC encoder with optimized settings
         - Supports both H.264 and H.265 (HEVC) codecs
         - Smart cropping for vertical formats (TikTok/Reels/Instagram)
+        - threads caps FFmpeg's worker threads when several exports run at once
+        - Stream copy (no decode/encode) when the source already matches the output
         """
         output_path = os.path.join(output_dir, clip['filename'])
         
+        copied = self._export_clip_stream_copy(clip, output_path)
+        if copied:
+            return copied
+        
+        subtitles = self._caption_burn_filter(clip, output_dir)
+        
+        cmd = [
+            'ffmpeg',
+            '-hide_banner',  # Reduce verbose output
+            '-loglevel', 'warning',  # Only show warnings and errors
+        ]
+        cmd.extend(self._export_decode_args())
+        
+        if threads:
+            cmd.extend(['-threads', str(threads)])
+        
+        cmd.extend(self._export_seek_args(clip, subtitles is not None))
+        cmd.extend(self._vf_args(self._export_video_filter(subtitles)))
+        cmd.extend(self._export_encode_args(threads))
+        cmd.extend([
+            '-y',  # Overwrite output file
+            output_path
+        ])
+        
+        # Run FFmpeg with GPU acceleration
+        try:
+            gpu_enabled = getattr(self.config, 'USE_GPU_ACCELERATION', True)
+            gpu_filters = getattr(self.config, 'USE_GPU_FILTERS', False)
+            print(f"   🎬 GPU Acceleration: {gpu_enabled} | GPU Filters: {gpu_filters} | Codec: {self._pick_hw_encoder()[0]}")
+            print(f"   🔧 Preset: {getattr(self.config, 'NVENC_PRESET', 'medium')} | Bitrate: {self.target_bitrate} | Resolution: {self.resolution}")
+            
+            _run_ffmpeg(cmd, check=True)
+            print(f"   ✅ Clip exported successfully: {os.path.basename(output_path)}")
+            return output_path
+        except subprocess.CalledProcessError as e:
+            print(f"❌ Error exporting clip: {e}")
+            if e.stderr:
+                print(f"   FFmpeg stderr: {e.stderr[-500:]}")  # Show last 500 chars of error
+            # Fallback to CPU if GPU fails
+            print(f"   ⚠️  Fallback to CPU encoding...")
+            return self._export_clip_cpu_fallback(clip, output_dir, threads)
+    
+    @staticmethod
+    def _ff_span(clip: Dict) -> Tuple[str, str]:
+        """-ss and -t values for the clip: the preformatted strings, else formatted to the millisecond"""
+        ff_ss = clip.get('_ff_ss') or f"{clip['start_seconds']:.3f}"
+        ff_t = clip.get('_ff_t') or f"{clip['duration']:.3f}"
+        return ff_ss, ff_t
+    
+    def _export_seek_args(self, clip: Dict, seek_input: bool) -> List[str]:
+        """
+        -i with the clip's -ss/-t. Burned captions need input seeking: it
+        restarts timestamps at 0, matching the clip-relative SRT, whereas
+        output seeking filters frames with their source timestamps.
+        """
+        ff_ss, ff_t = self._ff_span(clip)
+        span = ['-ss', ff_ss, '-t', ff_t]
+        if seek_input:
+            return span + ['-i', self.video_path]
+        return ['-i', self.video_path] + span
+    
+    def _caption_burn_filter(self, clip: Dict, output_dir: str) -> Optional[str]:
+        """
+        subtitles= filter for hard-burning the clip's captions (BURN_CAPTIONS),
+        so they are drawn in the same encode as the scale/pad instead of a
+        second pass. Writes the SRT first; None when not burning.
+        """
+        if not (getattr(self.config, 'BURN_CAPTIONS', False) and clip.get('captions') and clip.get('caption_file')):
+            return None
+        self._write_caption_file(clip, output_dir)
+        caption_path = os.path.abspath(os.path.join(output_dir, clip['caption_file']))
+        style = getattr(self.config, 'CAPTION_FORCE_STYLE', 'Fontname=Inter,Fontsize=22')
+        subtitles = f"subtitles={_escape_filter_value(caption_path)}"
+        if style:
+            subtitles += f":force_style={_escape_filter_value(style)}"
+        return subtitles
+    
+    def _export_video_filter(self, subtitles: Optional[str] = None, hw_upload: bool = True) -> str:
+        """
+        Scale/crop (vertical) or scale/pad (landscape) chain to the target size.
+        hw_upload=False leaves out the hardware encoder's upload step (CPU encodes).
+        Steps that would not change the frame for the probed source size are
+        left out; '' means no -vf is needed at all.
+        """
+        tw, th = self.target_width, self.target_height
+        info = self._probe_source(self.video_path)
+        # Anamorphic sources always go through scale, which resolves the SAR
+        source_size = (info.get('width', 0), info.get('height', 0)) if info.get('square_pixels', True) else (0, 0)
+        
         # Build video filters for aspect ratio using instance resolution
         # Using CPU-based filters for better compatibility with GPU encoding
-        if self.is_vertical:
+        if source_size == (tw, th):
+            video_filters = []
+        elif self.is_vertical and ((source_size[0] == tw and source_size[1] > th) or (source_size[1] == th and source_size[0] > tw)):
+            # One side already matches and the other overflows: scale factor is 1, crop only
+            video_filters = [f"crop={tw}:{th}:(iw-{tw})/2:(ih-{th})/2"]
+        elif not self.is_vertical and ((source_size[0] == tw and 0 < source_size[1] < th) or (source_size[1] == th and 0 < source_size[0] < tw)):
+            # One side already matches and the other fits: scale factor is 1, pad only
+            video_filters = [f"pad={tw}:{th}:(ow-iw)/2:(oh-ih)/2:black"]
+        elif self.is_vertical:
             # For vertical formats (9:16, 4:5): Scale to fill, then crop center
             # This avoids ugly black bars on social media videos
             video_filters = [
@@ -3485,80 +4146,404 @@ class ClipGenerator:
                 f"scale=w={self.target_width}:h={self.target_height}:force_original_aspect_ratio=decrease",
                 f"pad={self.target_width}:{self.target_height}:(ow-iw)/2:(oh-ih)/2:black"
             ]
-        
-        composite_filter = ','.join(video_filters)
-
-        cmd = [
-            'ffmpeg',
-            '-hide_banner',  # Reduce verbose output
-            '-loglevel', 'warning',  # Only show warnings and errors
-        ]
-        
-        # Add hardware-accelerated DECODING if enabled
-        if getattr(self.config, 'USE_GPU_ACCELERATION', True):
-            cmd.extend([
+        if subtitles:
+            video_filters.append(subtitles)
+        hw_filter = self._pick_hw_encoder()[2] if hw_upload else None
+        if hw_filter:
+            video_filters.append(hw_filter)
+        return ','.join(video_filters)
+    
+    @staticmethod
+    def _vf_args(video_filter: str) -> List[str]:
+        """-vf for a non-empty filter chain; nothing when frames pass through as-is"""
+        return ['-vf', video_filter] if video_filter else []
+    
+    def _pick_hw_encoder(self) -> Tuple[str, List[str], Optional[str]]:
+        """
+        (codec, extra input flags, extra filter) for the export encode.
+        The configured VIDEO_CODEC is used when FFmpeg provides it, otherwise
+        the first available of NVENC, QSV and VAAPI, otherwise libx264.
+        VAAPI encodes from GPU surfaces, so its filter uploads the scaled
+        frames (format=nv12,hwupload) to the device opened by the input flags.
+        """
+        if not getattr(self.config, 'USE_GPU_ACCELERATION', True):
+            return 'libx264', [], None
+        configured = getattr(self.config, 'VIDEO_CODEC', 'h264_nvenc')
+        if configured in ('libx264', 'libx265'):
+            return 'libx264', [], None
+        
+        available = _ffmpeg_encoders()
+        vaapi_device = getattr(self.config, 'VAAPI_DEVICE', '/dev/dri/renderD128')
+        for codec in (configured, *_HW_ENCODERS):
+            if codec not in available:
+                continue
+            if codec.endswith(('_nvenc', '_qsv')):
+                return codec, [], None
+            if codec.endswith('_vaapi') and os.path.exists(vaapi_device):
+                return codec, ['-vaapi_device', vaapi_device], 'format=nv12,hwupload'
+        return 'libx264', [], None
+    
+    def _export_decode_args(self) -> List[str]:
+        """Hardware-accelerated DECODING options for one input, if enabled"""
+        codec, input_flags, _ = self._pick_hw_encoder()
+        args = list(input_flags)
+        if codec.endswith('_nvenc'):
+            args.extend([
                 '-hwaccel', getattr(self.config, 'HWACCEL_DECODER', 'cuda'),
                 '-hwaccel_output_format', 'nv12',  # Use standard output format for compatibility
             ])
             if hasattr(self.config, 'GPU_DEVICE'):
-                cmd.extend([
+                args.extend([
                     '-hwaccel_device', str(getattr(self.config, 'GPU_DEVICE', 0))
                 ])
-        
-        cmd.extend([
-            '-i', self.video_path,
-            '-ss', str(clip['start_seconds']),
-            '-t', str(clip['duration']),
-            '-vf', composite_filter
-        ])
-        
+        return args
+    
+    def _export_encode_args(self, threads: Optional[int] = None) -> List[str]:
+        """Encoder options for one output (NVENC/QSV/VAAPI when available, libx264 otherwise)"""
+        codec = self._pick_hw_encoder()[0]
+        bufsize = f"{int(int(self.target_bitrate.rstrip('M')) * 2)}M"
         # Add encoding parameters (ADVANCED GPU OPTIMIZATION)
-        if getattr(self.config, 'USE_GPU_ACCELERATION', True) and self.config.VIDEO_CODEC in ['h264_nvenc', 'hevc_nvenc']:
+        if codec.endswith('_nvenc'):
             # NVIDIA NVENC encoder with advanced settings
-            cmd.extend([
-                '-c:v', self.config.VIDEO_CODEC,
+            return [
+                '-c:v', codec,
                 '-preset', getattr(self.config, 'NVENC_PRESET', 'medium'),  # slow/medium/fast
                 '-rc', getattr(self.config, 'NVENC_RC_MODE', 'vbr'),  # Rate control mode
                 '-b:v', self.target_bitrate,  # Target bitrate based on resolution
                 '-maxrate', self.target_bitrate,  # Max bitrate
-                '-bufsize', f"{int(int(self.target_bitrate.rstrip('M')) * 2)}M",  # Buffer size = 2x bitrate
+                '-bufsize', bufsize,  # Buffer size = 2x bitrate
                 '-c:a', self.config.AUDIO_CODEC,
                 '-b:a', self.config.AUDIO_BITRATE,
-                '-y',  # Overwrite output file
-                output_path
-            ])
-        else:
-            # Fallback to CPU encoding if GPU not available
-            cmd.extend([
-                '-c:v', 'libx264',
-                '-preset', 'fast',  # CPU preset
-                '-crf', '23',  # Quality (lower = better, 23 = good default)
+            ]
+        if codec.endswith(('_qsv', '_vaapi')):
+            # Intel Quick Sync / VAAPI: same bitrate envelope as NVENC
+            args = ['-c:v', codec]
+            if codec.endswith('_qsv'):
+                args.extend(['-preset', getattr(self.config, 'QSV_PRESET', 'faster')])
+            args.extend([
                 '-b:v', self.target_bitrate,
+                '-maxrate', self.target_bitrate,
+                '-bufsize', bufsize,
                 '-c:a', self.config.AUDIO_CODEC,
                 '-b:a', self.config.AUDIO_BITRATE,
-                '-y',
-                output_path
             ])
+            return args
+        # Fallback to CPU encoding if GPU not available
+        args = ['-c:v', 'libx264']
+        if threads:
+            args.extend(['-threads', str(threads)])
+        args.extend([
+            '-preset', 'fast',  # CPU preset
+            '-crf', '23',  # Quality (lower = better, 23 = good default)
+            '-b:v', self.target_bitrate,
+            '-c:a', self.config.AUDIO_CODEC,
+            '-b:a', self.config.AUDIO_BITRATE,
+        ])
+        return args
+    
+    def _export_batch(self, clips: List[Dict], output_dir: str, threads: Optional[int] = None) -> List[Optional[str]]:
+        """
+        Encode several clips in one FFmpeg process, each to its own output, so
+        process start-up and encoder setup are paid once per batch instead of
+        per clip. Clips packed densely enough share one decode of their span
+        (split/trim); otherwise every clip gets its own seeked input.
+        If the process fails or times out, every output of the batch is
+        deleted (a killed encode leaves truncated MP4s without a moov atom)
+        and each clip is re-exported with export_clip.
+        """
+        output_paths = [os.path.join(output_dir, clip['filename']) for clip in clips]
         
-        # Run FFmpeg with GPU acceleration
+        cmd = ['ffmpeg', '-hide_banner', '-loglevel', 'warning', '-y']
+        if self._use_shared_decode(clips):
+            cmd.extend(self._shared_decode_args(clips, output_dir, output_paths, threads))
+            print(f"   🎞️ Batch encoding {len(clips)} clips from one shared decode")
+        else:
+            cmd.extend(self._per_input_batch_args(clips, output_dir, output_paths, threads))
+            print(f"   🎞️ Batch encoding {len(clips)} clips in one FFmpeg process")
+        succeeded = False
         try:
-            gpu_enabled = getattr(self.config, 'USE_GPU_ACCELERATION', True)
-            gpu_filters = getattr(self.config, 'USE_GPU_FILTERS', False)
-            print(f"   🎬 GPU Acceleration: {gpu_enabled} | GPU Filters: {gpu_filters} | Codec: {self.config.VIDEO_CODEC}")
-            print(f"   🔧 Preset: {getattr(self.config, 'NVENC_PRESET', 'medium')} | Bitrate: {self.target_bitrate} | Resolution: {self.resolution}")
-            
-            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-            print(f"   ✅ Clip exported successfully: {os.path.basename(output_path)}")
+            returncode, stderr = _run_ffmpeg(cmd, timeout=300 * len(clips))
+            succeeded = returncode == 0
+            if not succeeded:
+                print(f"   ⚠️ Batch encode failed: {stderr[-500:]}")
+        except subprocess.TimeoutExpired:
+            print("   ⚠️ Batch encode timed out")
+        
+        if not succeeded:
+            # Outputs of a failed process can't be trusted, whatever their size
+            for output_path in output_paths:
+                try:
+                    os.remove(output_path)
+                except FileNotFoundError:
+                    pass
+            print(f"   🔁 Re-exporting {len(clips)} clips one by one")
+            return [self.export_clip(clip, output_dir, threads=threads) for clip in clips]
+        
+        exported = []
+        for clip, output_path in zip(clips, output_paths):
+            if os.path.exists(output_path) and os.path.getsize(output_path) > 1000:
+                exported.append(output_path)
+            else:
+                exported.append(self.export_clip(clip, output_dir, threads=threads))
+        return exported
+    
+    def _per_input_batch_args(
+        self,
+        clips: List[Dict],
+        output_dir: str,
+        output_paths: List[str],
+        threads: Optional[int]
+    ) -> List[str]:
+        """One input per clip, seeked with -ss/-t before -i, mapped to its own output"""
+        decode_args = self._export_decode_args()
+        encode_args = self._export_encode_args(threads)
+        args = []
+        for clip in clips:
+            args.extend(decode_args)
+            if threads:
+                args.extend(['-threads', str(threads)])
+            ff_ss, ff_t = self._ff_span(clip)
+            args.extend(['-ss', ff_ss, '-t', ff_t, '-i', self.video_path])
+        for i, (clip, output_path) in enumerate(zip(clips, output_paths)):
+            # Inputs are seeked, so burned captions line up with the clip
+            composite_filter = self._export_video_filter(self._caption_burn_filter(clip, output_dir))
+            args.extend(['-map', f'{i}:v:0', '-map', f'{i}:a?', *self._vf_args(composite_filter)])
+            args.extend(encode_args)
+            args.append(output_path)
+        return args
+    
+    def _use_shared_decode(self, clips: List[Dict]) -> bool:
+        """
+        Whether one decode of the batch's whole span is cheaper than a decode
+        per clip: the clips must cover at least EXPORT_SHARED_DECODE_COVERAGE
+        of the span (overlapping clips count twice), and the source's streams
+        must be known so the audio split is only built when audio exists.
+        """
+        coverage_needed = getattr(self.config, 'EXPORT_SHARED_DECODE_COVERAGE', 0.6)
+        if len(clips) < 2 or coverage_needed <= 0:
+            return False
+        span_start = min(clip['start_seconds'] for clip in clips)
+        span_end = max(clip['start_seconds'] + clip['duration'] for clip in clips)
+        if span_end <= span_start:
+            return False
+        covered = sum(clip['duration'] for clip in clips)
+        return covered / (span_end - span_start) >= coverage_needed and bool(self._probe_source(self.video_path))
+    
+    def _shared_decode_args(
+        self,
+        clips: List[Dict],
+        output_dir: str,
+        output_paths: List[str],
+        threads: Optional[int]
+    ) -> List[str]:
+        """
+        One input seeked to the batch span, split into a trim branch per clip:
+        [0:v]split=N, then per clip trim + setpts (timestamps restart at 0, so
+        burned captions line up) + the scale/pad chain; audio the same with
+        asplit/atrim when the source has an audio stream.
+        """
+        span_start = min(clip['start_seconds'] for clip in clips)
+        span_end = max(clip['start_seconds'] + clip['duration'] for clip in clips)
+        has_audio = bool(self._probe_source(self.video_path).get('audio_codec'))
+        count = len(clips)
+        
+        graph = ['[0:v]split=' + str(count) + ''.join(f'[v{i}]' for i in range(count))]
+        if has_audio:
+            graph.append('[0:a]asplit=' + str(count) + ''.join(f'[a{i}]' for i in range(count)))
+        for i, clip in enumerate(clips):
+            trim_start = clip['start_seconds'] - span_start
+            trim_end = trim_start + clip['duration']
+            branch = [f"trim=start={trim_start:.3f}:end={trim_end:.3f}", 'setpts=PTS-STARTPTS']
+            composite_filter = self._export_video_filter(self._caption_burn_filter(clip, output_dir))
+            if composite_filter:
+                branch.append(composite_filter)
+            graph.append(f"[v{i}]{','.join(branch)}[vo{i}]")
+            if has_audio:
+                graph.append(f"[a{i}]atrim=start={trim_start:.3f}:end={trim_end:.3f},asetpts=PTS-STARTPTS[ao{i}]")
+        
+        args = list(self._export_decode_args())
+        if threads:
+            args.extend(['-threads', str(threads)])
+        args.extend([
+            '-ss', f"{span_start:.3f}",
+            '-t', f"{span_end - span_start:.3f}",
+            '-i', self.video_path,
+            '-filter_complex', ';'.join(graph)
+        ])
+        encode_args = self._export_encode_args(threads)
+        for i, output_path in enumerate(output_paths):
+            args.extend(['-map', f'[vo{i}]'])
+            if has_audio:
+                args.extend(['-map', f'[ao{i}]'])
+            args.extend(encode_args)
+            args.append(output_path)
+        return args
+    
+    def _encoder_session_limit(self) -> Optional[int]:
+        """Concurrent hardware encoder sessions allowed (NVENC_MAX_SESSIONS); None when unlimited"""
+        if self._pick_hw_encoder()[0].endswith('_nvenc'):
+            return max(1, getattr(self.config, 'NVENC_MAX_SESSIONS', 2))
+        return None
+    
+    def _plan_export_groups(self, clips: List[Dict], max_workers: int) -> Tuple[List[List[int]], int]:
+        """
+        Group clip indices for _export_batch and return (groups, workers).
+        Stream-copy clips stay on their own; the rest are ordered by start
+        and split so every worker gets work. With NVENC, workers x group size
+        stays within NVENC_MAX_SESSIONS, since every clip in a group is its
+        own encoder session.
+        """
+        per_process = max(1, getattr(self.config, 'EXPORT_CLIPS_PER_FFMPEG', 4))
+        sessions = self._encoder_session_limit()
+        if sessions:
+            per_process = min(per_process, sessions)
+        groups = []
+        encode = []
+        for idx, clip in enumerate(clips):
+            if self._stream_copy_start(clip) is not None:
+                groups.append([idx])
+            else:
+                encode.append(idx)
+        if encode:
+            encode.sort(key=lambda idx: clips[idx]['start_seconds'])
+            size = min(per_process, -(-len(encode) // max_workers))
+            if sessions:
+                # Spread the sessions over workers first, then over clips per process
+                size = min(size, max(1, sessions // max_workers))
+            groups.extend(encode[i:i + size] for i in range(0, len(encode), size))
+            if sessions:
+                max_workers = max(1, min(max_workers, sessions // size))
+        return groups, max_workers
+    
+    def _probe_source(self, video_path: str) -> Dict:
+        """Video size/codec and audio codec of the source, cached per path"""
+        with self._probe_lock:
+            info = self._probe_cache.get(video_path)
+            if info is not None:
+                return info
+            info = {}
+            cmd = [
+                'ffprobe', '-v', 'error',
+                '-show_entries', 'stream=codec_type,codec_name,width,height,sample_aspect_ratio:stream_side_data=rotation',
+                '-of', 'json',
+                video_path
+            ]
+            try:
+                result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+                for stream in json.loads(result.stdout or '{}').get('streams', []):
+                    codec_type = stream.get('codec_type')
+                    if codec_type == 'video' and 'video_codec' not in info:
+                        info['video_codec'] = stream.get('codec_name')
+                        width = int(stream.get('width') or 0)
+                        height = int(stream.get('height') or 0)
+                        rotation = next((side.get('rotation') for side in stream.get('side_data_list', []) if 'rotation' in side), 0)
+                        # Width/height as displayed: FFmpeg autorotates 90°-rotated video
+                        if int(rotation or 0) % 180:
+                            width, height = height, width
+                        info['width'] = width
+                        info['height'] = height
+                        info['square_pixels'] = stream.get('sample_aspect_ratio', '1:1') in ('1:1', '0:1', 'N/A')
+                    elif codec_type == 'audio' and 'audio_codec' not in info:
+                        info['audio_codec'] = stream.get('codec_name')
+            except Exception as e:
+                print(f"   ⚠️ ffprobe failed for {os.path.basename(video_path)}: {e}")
+            self._probe_cache[video_path] = info
+            return info
+    
+    def _source_keyframes(self, video_path: str) -> List[float]:
+        """Sorted keyframe timestamps of the source, read once from packet flags"""
+        with self._probe_lock:
+            keyframes = self._keyframe_cache.get(video_path)
+            if keyframes is not None:
+                return keyframes
+            # Packet flags carry the keyframe marker, so nothing needs decoding
+            cmd = [
+                'ffprobe', '-v', 'error',
+                '-select_streams', 'v:0',
+                '-show_entries', 'packet=pts_time,flags',
+                '-of', 'csv=p=0',
+                video_path
+            ]
+            keyframes = []
+            try:
+                result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
+                for line in result.stdout.splitlines():
+                    pts, _, flags = line.partition(',')
+                    if flags.startswith('K'):
+                        try:
+                            keyframes.append(float(pts))
+                        except ValueError:
+                            continue
+                keyframes.sort()
+            except Exception:
+                keyframes = []
+            self._keyframe_cache[video_path] = keyframes
+            return keyframes
+    
+    def _stream_copy_start(self, clip: Dict) -> Optional[float]:
+        """
+        Keyframe to cut from when the clip can be stream-copied, else None.
+        Needs the source to already be the output size in the output codec
+        (audio too), and a keyframe within KEYFRAME_TOLERANCE of the start.
+        """
+        if not getattr(self.config, 'EXPORT_STREAM_COPY', True):
+            return None
+        if getattr(self.config, 'BURN_CAPTIONS', False) and clip.get('captions'):
+            return None
+        info = self._probe_source(self.video_path)
+        if (info.get('width'), info.get('height')) != (self.target_width, self.target_height):
+            return None
+        if not info.get('square_pixels', True):
+            return None
+        video_codec = getattr(self.config, 'VIDEO_CODEC', 'libx264')
+        target_codec = 'hevc' if video_codec in ('hevc_nvenc', 'libx265') else 'h264'
+        if info.get('video_codec') != target_codec:
+            return None
+        if info.get('audio_codec') not in (None, getattr(self.config, 'AUDIO_CODEC', 'aac')):
+            return None
+        
+        keyframes = self._source_keyframes(self.video_path)
+        if not keyframes:
+            return None
+        start = clip['start_seconds']
+        pos = bisect.bisect_left(keyframes, start)
+        nearest = min(keyframes[max(pos - 1, 0):pos + 1], key=lambda kf: abs(kf - start))
+        if abs(nearest - start) > getattr(self.config, 'KEYFRAME_TOLERANCE', 0.25):
+            return None
+        return nearest
+    
+    def _export_clip_stream_copy(self, clip: Dict, output_path: str) -> Optional[str]:
+        """Cut the clip at a keyframe with -c copy; None means encode instead"""
+        start = self._stream_copy_start(clip)
+        if start is None:
+            return None
+        end = clip.get('end_seconds', clip['start_seconds'] + clip['duration'])
+        cmd = [
+            'ffmpeg',
+            '-hide_banner',
+            '-loglevel', 'warning',
+            # Input seeking lands on the keyframe, so the copy starts clean
+            '-ss', str(start),
+            '-i', self.video_path,
+            '-t', str(end - start),
+            '-map', '0:v:0', '-map', '0:a?',
+            '-c', 'copy',
+            '-avoid_negative_ts', 'make_zero',
+            '-movflags', '+faststart',
+            '-y',
+            output_path
+        ]
+        try:
+            _run_ffmpeg(cmd, timeout=120, check=True)
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
+            print(f"   ⚠️ Stream copy failed ({type(e).__name__}), re-encoding...")
+            return None
+        if os.path.exists(output_path) and os.path.getsize(output_path) > 1000:
+            print(f"   ⚡ Stream-copied clip (no re-encode): {os.path.basename(output_path)}")
             return output_path
-        except subprocess.CalledProcessError as e:
-            print(f"❌ Error exporting clip: {e}")
-            if e.stderr:
-                print(f"   FFmpeg stderr: {e.stderr[:500]}")  # Show first 500 chars of error
-            # Fallback to CPU if GPU fails
-            print(f"   ⚠️  Fallback to CPU encoding...")
-            return self._export_clip_cpu_fallback(clip, output_dir)
+        return None
     
-    def _export_clip_cpu_fallback(self, clip: Dict, output_dir: str) -> str:
+    def _export_clip_cpu_fallback(self, clip: Dict, output_dir: str, threads: Optional[int] = None) -> str:
         """
         Fallback CPU-based export if GPU fails
         Optimized with multi-threading for fast encoding on multi-core systems
@@ -3566,32 +4551,20 @@ class ClipGenerator:
         output_path = os.path.join(output_dir, clip['filename'])
         
         # Use same filter logic as GPU export
-        if self.is_vertical:
-            # For vertical formats (9:16, 4:5): Scale to fill, then crop center
-            video_filters = [
-                f"scale=w={self.target_width}:h={self.target_height}:force_original_aspect_ratio=increase",
-                f"crop={self.target_width}:{self.target_height}:(iw-{self.target_width})/2:(ih-{self.target_height})/2"
-            ]
-        else:
-            # For landscape/square formats: Scale to fit, then pad if needed
-            video_filters = [
-                f"scale=w={self.target_width}:h={self.target_height}:force_original_aspect_ratio=decrease",
-                f"pad={self.target_width}:{self.target_height}:(ow-iw)/2:(oh-ih)/2:black"
-            ]
-        composite_filter = ','.join(video_filters)
+        subtitles = self._caption_burn_filter(clip, output_dir)
+        composite_filter = self._export_video_filter(subtitles, hw_upload=False)
         
         # Get thread count from config/env (default 8 for multi-core systems)
-        threads = getattr(self.config, 'FFMPEG_THREADS', int(os.environ.get('FFMPEG_THREADS', 8)))
+        if not threads:
+            threads = getattr(self.config, 'FFMPEG_THREADS', int(os.environ.get('FFMPEG_THREADS', 8)))
         
         cmd = [
             'ffmpeg',
             '-hide_banner',
             '-loglevel', 'warning',
             '-threads', str(threads),  # Multi-threading for decoding
-            '-i', self.video_path,
-            '-ss', str(clip['start_seconds']),
-            '-t', str(clip['duration']),
-            '-vf', composite_filter,
+            *self._export_seek_args(clip, subtitles is not None),
+            *self._vf_args(composite_filter),
             '-c:v', 'libx264',
             '-threads', str(threads),  # Multi-threading for encoding
             '-preset', 'fast',  # Use 'fast' preset for speed (good balance)
@@ -3608,7 +4581,7 @@ class ClipGenerator:
         
         try:
             print(f"      🔧 CPU fallback command: ffmpeg -i ... -ss {clip['start_seconds']} -t {clip['duration']}")
-            result = subprocess.run(cmd, check=True, capture_output=True, text=True, timeout=300)
+            _run_ffmpeg(cmd, timeout=300, check=True)
             if os.path.exists(output_path) and os.path.getsize(output_path) > 1000:
                 print(f"      ✅ CPU fallback succeeded")
                 return output_path
@@ -3621,9 +4594,7 @@ class ClipGenerator:
         except subprocess.CalledProcessError as e:
             print(f"      ❌ CPU fallback FFmpeg error (exit code {e.returncode})")
             if e.stderr:
-                print(f"         Stderr: {e.stderr[:500]}")
-            if e.stdout:
-                print(f"         Stdout: {e.stdout[:200]}")
+                print(f"         Stderr: {e.stderr[-500:]}")
             return None
         except Exception as e:
             print(f"      ❌ CPU fallback unexpected error: {type(e).__name__}: {str(e)[:200]}")
@@ -3636,16 +4607,113 @@ class ClipGenerator:
         """
         print(f"💾 Exporting {len(clips)} clips...")
         
+        # Clips whose output is already on disk from an identical export are reused
+        reused = []
+        pending = []
+        cache_keys = {}
+        use_cache = getattr(self.config, 'EXPORT_OUTPUT_CACHE', True)
+        for clip in clips:
+            output_path = os.path.join(output_dir, clip['filename'])
+            if use_cache:
+                cache_keys[output_path] = self._export_cache_key(clip)
+                if self._read_export_key(output_path) == cache_keys[output_path]:
+                    if clip.get('captions'):
+                        self._write_caption_file(clip, output_dir)
+                    self._write_hook_file(clip, output_dir)
+                    reused.append(output_path)
+                    continue
+            pending.append(clip)
+        if reused:
+            print(f"   ♻️ {len(reused)} clip(s) unchanged since the last export, skipping FFmpeg")
+        if not pending:
+            return reused
+        
         # Check if parallel export is enabled
         parallel_enabled = getattr(self.config, 'ENABLE_BATCH_EXPORT', True)
-        max_workers = getattr(self.config, 'MAX_PARALLEL_EXPORTS', 2)
+        max_workers = min(getattr(self.config, 'MAX_PARALLEL_EXPORTS', 2), len(pending))
         
-        if parallel_enabled and len(clips) > 1 and max_workers > 1:
+        if parallel_enabled and len(pending) > 1 and max_workers > 1:
             print(f"   ⚡ Parallel export enabled: {max_workers} concurrent exports")
-            return self._export_parallel(clips, output_dir, max_workers)
+            exported = self._export_parallel(pending, output_dir, max_workers)
         else:
             print(f"   📝 Sequential export mode")
-            return self._export_sequential(clips, output_dir)
+            exported = self._export_sequential(pending, output_dir)
+        
+        # Exported paths come from FFmpeg runs that exited 0; the key is only
+        # recorded once ffprobe also confirms the file holds the whole clip
+        durations = {os.path.join(output_dir, clip['filename']): clip['duration'] for clip in pending}
+        for output_path in exported:
+            if output_path in cache_keys and self._output_complete(output_path, durations[output_path]):
+                self._write_export_key(output_path, cache_keys[output_path])
+        return reused + exported
+    
+    def _export_cache_key(self, clip: Dict) -> str:
+        """
+        Hash of everything that decides an exported clip's content: the source
+        file (size + mtime), the clip span, output size/format, encoder and
+        bitrates, and burned caption text.
+        """
+        try:
+            stat = os.stat(self.video_path)
+            source = (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            source = None
+        ff_ss, ff_t = self._ff_span(clip)
+        burned = ''
+        if getattr(self.config, 'BURN_CAPTIONS', False) and clip.get('captions'):
+            burned = '\n'.join(f"{e['start']}|{e['end']}|{e['text']}" for e in clip['captions'])
+            burned += '|' + str(getattr(self.config, 'CAPTION_FORCE_STYLE', ''))
+        parts = (
+            os.path.abspath(self.video_path), source, ff_ss, ff_t,
+            self.target_width, self.target_height, self.is_vertical,
+            self._pick_hw_encoder()[0], self.target_bitrate,
+            getattr(self.config, 'AUDIO_CODEC', 'aac'), getattr(self.config, 'AUDIO_BITRATE', ''),
+            getattr(self.config, 'EXPORT_STREAM_COPY', True), burned,
+        )
+        return hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=16).hexdigest()
+    
+    def _output_complete(self, output_path: str, expected_duration: float) -> bool:
+        """
+        ffprobe can read the output's duration and it covers the clip (within
+        half a second or 5%). Truncated MP4s without a moov atom fail to probe.
+        """
+        cmd = [
+            'ffprobe', '-v', 'error',
+            '-show_entries', 'format=duration',
+            '-of', 'default=noprint_wrappers=1:nokey=1',
+            output_path
+        ]
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            duration = float(result.stdout.strip())
+        except (OSError, subprocess.SubprocessError, ValueError):
+            return False
+        if result.returncode != 0:
+            return False
+        return duration >= expected_duration - max(0.5, expected_duration * 0.05)
+    
+    @staticmethod
+    def _export_key_path(output_path: str) -> str:
+        """Hidden sidecar next to the clip: clip_001.mp4 -> .clip_001.mp4.key"""
+        directory, filename = os.path.split(output_path)
+        return os.path.join(directory, f".{filename}.key")
+    
+    def _read_export_key(self, output_path: str) -> Optional[str]:
+        """Stored cache key of an existing, non-trivial output; None when absent"""
+        try:
+            if os.path.getsize(output_path) <= 1000:
+                return None
+            with open(self._export_key_path(output_path), 'r', encoding='utf-8') as key_file:
+                return key_file.read().strip()
+        except OSError:
+            return None
+    
+    def _write_export_key(self, output_path: str, key: str) -> None:
+        try:
+            with open(self._export_key_path(output_path), 'w', encoding='utf-8') as key_file:
+                key_file.write(key)
+        except OSError as e:
+            print(f"   ⚠️ Could not record export cache key for {os.path.basename(output_path)}: {e}")
     
     def _export_parallel(self, clips: List[Dict], output_dir: str, max_workers: int) -> List[str]:
         """Parallel export using ThreadPoolExecutor"""
@@ -3655,40 +4723,65 @@ class ClipGenerator:
         failed = []
         total = len(clips)
         
-        def export_single(clip_data):
-            """Worker function for single clip export"""
-            idx, clip = clip_data
+        groups, max_workers = self._plan_export_groups(clips, max_workers)
+        
+        # Split the cores between concurrent FFmpeg processes so N exports
+        # don't each spawn a thread per core (explicit FFMPEG_THREADS wins)
+        threads = getattr(self.config, 'FFMPEG_THREADS', 0) or max(1, (os.cpu_count() or 1) // max_workers)
+        print(f"   🧵 {threads} FFmpeg thread(s) per export")
+        
+        def finish(idx: int, output_path: Optional[str]):
+            clip = clips[idx]
+            if output_path:
+                if clip.get('captions'):
+                    self._write_caption_file(clip, output_dir)
+                # Write hook file for each clip (if timoty_hook exists)
+                self._write_hook_file(clip, output_dir)
+                return (idx, output_path, None)
+            return (idx, None, "Export returned None")
+        
+        # One disjoint core set per concurrent worker (FFMPEG_PIN_CORES), handed
+        # out per group so FFmpeg processes don't migrate across each other's caches
+        placements = queue.SimpleQueue()
+        for cpus in self._export_core_sets(max_workers):
+            placements.put(cpus)
+        niceness = getattr(self.config, 'FFMPEG_NICE', 10)
+        
+        def export_group(indices: List[int]):
+            """Worker function: one clip, or several clips in a single FFmpeg process"""
+            cpus = placements.get()
+            _ffmpeg_placement.cpus = cpus
+            _ffmpeg_placement.niceness = niceness
+            # A batch runs one decoder and encoder per clip, so the
+            # per-export thread budget is shared among them
+            group_threads = max(1, threads // len(indices))
             try:
-                output_path = self.export_clip(clip, output_dir)
-                if output_path:
-                    if clip.get('captions'):
-                        self._write_caption_file(clip, output_dir)
-                    # Write hook file for each clip (if timoty_hook exists)
-                    self._write_hook_file(clip, output_dir)
-                    return (idx, output_path, None)
-                return (idx, None, "Export returned None")
+                if len(indices) == 1:
+                    paths = [self.export_clip(clips[indices[0]], output_dir, threads=group_threads)]
+                else:
+                    paths = self._export_batch([clips[idx] for idx in indices], output_dir, threads=group_threads)
+                return [finish(idx, path) for idx, path in zip(indices, paths)]
             except Exception as e:
-                return (idx, None, str(e))
+                return [(idx, None, str(e)) for idx in indices]
+            finally:
+                _ffmpeg_placement.cpus = None
+                placements.put(cpus)
         
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
             # Submit all export jobs
-            futures = {
-                executor.submit(export_single, (idx, clip)): idx 
-                for idx, clip in enumerate(clips)
-            }
+            futures = [executor.submit(export_group, indices) for indices in groups]
             
             # Process results as they complete
             completed = 0
             for future in as_completed(futures):
-                completed += 1
-                idx, output_path, error = future.result()
-                
-                if output_path:
-                    exported.append(output_path)
-                    print(f"   ✅ [{completed}/{total}] {clips[idx]['filename']} exported")
-                else:
-                    failed.append((idx, error))
-                    print(f"   ❌ [{completed}/{total}] {clips[idx]['filename']} failed: {error}")
+                for idx, output_path, error in future.result():
+                    completed += 1
+                    if output_path:
+                        exported.append(output_path)
+                        print(f"   ✅ [{completed}/{total}] {clips[idx]['filename']} exported")
+                    else:
+                        failed.append((idx, error))
+                        print(f"   ❌ [{completed}/{total}] {clips[idx]['filename']} failed: {error}")
         
         if failed:
             print(f"   ⚠️ {len(failed)} clips failed to export")
@@ -3696,6 +4789,23 @@ class ClipGenerator:
         print(f"✅ Exported {len(exported)}/{total} clips successfully")
         return exported
     
+    def _export_core_sets(self, workers: int) -> List[Optional[set]]:
+        """
+        Split this process's CPUs into `workers` disjoint sets (wrapping when
+        there are fewer CPUs than workers); None entries when pinning is off
+        or unsupported.
+        """
+        if not getattr(self.config, 'FFMPEG_PIN_CORES', True) or not hasattr(os, 'sched_getaffinity'):
+            return [None] * workers
+        cores = sorted(os.sched_getaffinity(0))
+        if len(cores) < 2:
+            return [None] * workers
+        count = len(cores)
+        if count < workers:
+            return [{cores[i % count]} for i in range(workers)]
+        # Contiguous, near-equal slices that use every core
+        return [set(cores[i * count // workers:(i + 1) * count // workers]) for i in range(workers)]
+    
     def _export_sequential(self, clips: List[Dict], output_dir: str) -> List[str]:
         """Sequential export with detailed error tracking"""
         exported = []
@@ -3744,45 +4854,42 @@ class ClipGenerator:
         
         return exported
 
-    def _build_caption_entries(self, clip: Dict, segments: List[Dict]) -> List[Dict]:
-        clip_start = clip['start_seconds']
-        clip_end = clip['end_seconds']
+    def _build_caption_entries(self, clip: Dict, transcript: TranscriptArrays) -> List[Dict]:
+        """SRT entries for one clip from the transcript arrays"""
+        clip_start = float(clip['start_seconds'])
+        clip_end = float(clip['end_seconds'])
+        starts, ends, texts = transcript.start, transcript.end, transcript.text
+        # Transcripts in time order (the normal case) let each clip
+        # searchsorted to its slice; otherwise every segment is checked
+        if transcript.in_order:
+            lo = int(np.searchsorted(ends, clip_start, 'right'))
+            hi = int(np.searchsorted(starts, clip_end, 'left'))
+        else:
+            lo, hi = 0, len(texts)
+        indices, rel_starts, rel_ends = _caption_spans(starts, ends, lo, hi, clip_start, clip_end, 0.15)
         entries = []
-        for segment in segments:
-            seg_start = segment.get('start', 0)
-            seg_end = segment.get('end', 0)
-            if seg_end <= clip_start or seg_start >= clip_end:
-                continue
-            relative_start = max(seg_start, clip_start) - clip_start
-            relative_end = min(seg_end, clip_end) - clip_start
-            if relative_end - relative_start < 0.15:
-                continue
-            text = (segment.get('text') or '').strip()
-            if not text:
-                continue
+        for i, relative_start, relative_end in zip(indices.tolist(), rel_starts.tolist(), rel_ends.tolist()):
             entries.append({
                 'index': len(entries) + 1,
                 'start': self._format_srt_timestamp(relative_start),
                 'end': self._format_srt_timestamp(relative_end),
-                'text': text
+                'text': texts[i]
             })
         return entries
 
     def _format_srt_timestamp(self, seconds: float) -> str:
-        total_ms = max(0, int(round(seconds * 1000)))
-        hours = total_ms // 3_600_000
-        minutes = (total_ms % 3_600_000) // 60_000
-        secs = (total_ms % 60_000) // 1000
-        millis = total_ms % 1000
-        return f"{hours:02}:{minutes:02}:{secs:02},{millis:03}"
+        return _fmt_srt_ms(max(0, int(round(seconds * 1000))))
 
     def _write_caption_file(self, clip: Dict, output_dir: str) -> None:
         caption_path = os.path.join(output_dir, clip['caption_file'])
+        # Whole file built in memory and written once; a list (not a
+        # generator) because join materializes its argument anyway
+        body = ''.join([
+            f"{entry['index']}\n{entry['start']} --> {entry['end']}\n{entry['text']}\n\n"
+            for entry in clip['captions']
+        ])
         with open(caption_path, 'w', encoding='utf-8') as caption_file:
-            for entry in clip['captions']:
-                caption_file.write(f"{entry['index']}\n")
-                caption_file.write(f"{entry['start']} --> {entry['end']}\n")
-                caption_file.write(f"{entry['text']}\n\n")
+            caption_file.write(body)
     
     def _write_hook_file(self, clip: Dict, output_dir: str) -> None:
         """
@@ -3850,7 +4957,11 @@ class ClipGenerator:
         duration = clip['duration']
         flashes = []
 
-        candidates = []
+        # Gather in-clip punchlines first; the flash word is only picked for
+        # the few candidates that are actually placed
+        candidate_texts = []
+        centers = []
+        scores = []
         for punch in self.punchlines:
             start = punch.get('start', 0)
             end = punch.get('end', 0)
@@ -3862,38 +4973,75 @@ class ClipGenerator:
             abs_end = end - clip['start_seconds']
             if abs_end <= 0 or abs_start >= duration:
                 continue
-            center = max(0, min(duration, (abs_start + abs_end) / 2))
-            overlay_text = self._pick_flash_word(text, vocab)
-            candidates.append({
-                'center': center,
-                'text': overlay_text or text[:12].upper(),
-                'score': score
-            })
-
-        if candidates:
-            candidates.sort(key=lambda x: x['score'], reverse=True)
-            used_times = []
+            candidate_texts.append(text)
+            centers.append(max(0, min(duration, (abs_start + abs_end) / 2)))
+            scores.append(score)
+
+        if candidate_texts:
+            # Highest score first; stable, so ties keep punchline order
+            order = np.argsort(-np.asarray(scores, dtype=np.float64), kind='stable')
+            used_times = []  # sorted centers already placed
             flash_duration = getattr(self.config, 'TEXT_FLASH_DURATION', 0.8)
             half_window = flash_duration / 2
-            for candidate in candidates:
+            for idx in order.tolist():
                 if len(flashes) >= max_flashes:
                     break
-                if any(abs(candidate['center'] - used) < flash_duration for used in used_times):
+                center = centers[idx]
+                # Only the nearest placed centers on either side can be too close
+                pos = bisect.bisect_left(used_times, center)
+                if pos > 0 and center - used_times[pos - 1] < flash_duration:
+                    continue
+                if pos < len(used_times) and used_times[pos] - center < flash_duration:
                     continue
+                text = candidate_texts[idx]
+                overlay_text = self._pick_flash_word(text, vocab)
                 flashes.append({
-                    'start': max(0, candidate['center'] - half_window),
-                    'end': min(duration, candidate['center'] + half_window),
-                    'text': candidate['text']
+                    'start': max(0, center - half_window),
+                    'end': min(duration, center + half_window),
+                    'text': overlay_text or text[:12].upper()
                 })
-                used_times.append(candidate['center'])
+                used_times.insert(pos, center)
 
         return flashes
 
+    def _build_flash_automaton(self, vocab: List[str]):
+        """
+        One Aho-Corasick automaton over the flash vocab (tier 0) and mental slap
+        keywords (tier 1). Each lowercase word maps to (tier, list position,
+        word), so the smallest hit is the word the ordered scans would pick.
+        """
+        if ahocorasick is None:
+            return None
+        ranked = {}
+        for order, word in enumerate(vocab):
+            if word:
+                ranked.setdefault(word.lower(), (0, order, word))
+        for order, keyword in enumerate(getattr(self.config, 'MENTAL_SLAP_KEYWORDS', [])):
+            if keyword:
+                ranked.setdefault(keyword.lower(), (1, order, keyword))
+        if not ranked:
+            return None
+        automaton = ahocorasick.Automaton()
+        for lowered, rank in ranked.items():
+            automaton.add_word(lowered, rank)
+        automaton.make_automaton()
+        return automaton
+
     def _pick_flash_word(self, punch_text: str, vocab: List[str]) -> str:
         """Choose the most relevant flash word for a punchline."""
         if not punch_text:
             return ''
         lowered = punch_text.lower()
+        if vocab is self._flash_vocab and self._flash_automaton is not None:
+            # Single scan of the text instead of one substring search per word
+            best = min((rank for _, rank in self._flash_automaton.iter(lowered)), default=None)
+            if best is not None and best[0] == 0:
+                return best[2].upper()
+            if len(punch_text.split()) <= 3:
+                return punch_text.upper()
+            if best is not None:
+                return best[2].upper()
+            return punch_text.split()[0].upper()
         for word in vocab:
             if word.lower() in lowered:
                 return word.upper()
@@ -416,22 +416,33 @@ class Config:
     VIDEO_BITRATE = os.environ.get('VIDEO_BITRATE', '4M')  # Higher bitrate for quality (T4 can handle 6M easily)
     AUDIO_BITRATE = '192k'  # Good audio quality
     OUTPUT_FORMAT = 'mp4'
+    EXPORT_STREAM_COPY = os.environ.get('EXPORT_STREAM_COPY', 'true').lower() == 'true'  # Cut without re-encoding when source already matches output size/codec
+    KEYFRAME_TOLERANCE = float(os.environ.get('KEYFRAME_TOLERANCE', 0.25))  # Max seconds a stream-copied clip start may move to reach a keyframe
+    BURN_CAPTIONS = os.environ.get('BURN_CAPTIONS', 'false').lower() == 'true'  # Hard-burn SRT captions during export (same encode pass)
+    CAPTION_FORCE_STYLE = os.environ.get('CAPTION_FORCE_STYLE', 'Fontname=Inter,Fontsize=22')  # libass force_style for burned captions
     
     # GPU Acceleration settings - OPTIMIZED FOR NVIDIA T4 (16GB VRAM)
     USE_GPU_ACCELERATION = os.environ.get('USE_GPU_ACCELERATION', 'true').lower() == 'true'
     GPU_DEVICE = int(os.environ.get('GPU_DEVICE', 0))  # Default GPU device (0 for first GPU)
     NVENC_PRESET = os.environ.get('NVENC_PRESET', 'p4')  # NVENC Turing presets: p1(fastest)-p7(slowest), p4 = balanced
-    NVENC_TUNE = os.environ.get('NVENC_TUNE', 'hq')  # Tuning: hq (high quality), ll (low latency), ull (ultra low latency)
+    NVENC_TUNE = os.environ.get('NVENC_TUNE', 'll')  # Tuning: ll (low latency, fastest export), hq (high quality), ull (ultra low latency)
     NVENC_RC_MODE = os.environ.get('NVENC_RC_MODE', 'vbr')  # Rate control: vbr, cbr, cqp
     NVENC_QUALITY = int(os.environ.get('NVENC_QUALITY', 20))  # CQ level (0=best, 51=worst), 20 = excellent quality
     NVENC_MULTIPASS = os.environ.get('NVENC_MULTIPASS', 'fullres')  # Multipass: disabled, qres, fullres
     NVENC_B_FRAMES = int(os.environ.get('NVENC_B_FRAMES', 3))  # B-frames for better compression
     NVENC_LOOKAHEAD = int(os.environ.get('NVENC_LOOKAHEAD', 20))  # Lookahead frames for rate control
+    NVENC_MAX_SESSIONS = int(os.environ.get('NVENC_MAX_SESSIONS', 2))  # Concurrent encodes before consumer NVENC starts queueing
+    GOP_SECONDS = float(os.environ.get('GOP_SECONDS', 2))  # NVENC keyframe interval in seconds (-g = source fps x this)
     HWACCEL_DECODER = os.environ.get('HWACCEL_DECODER', 'cuda')  # Hardware-accelerated decoding
     HWACCEL_OUTPUT_FORMAT = 'cuda'  # Keep frames on GPU to reduce memory transfers
+    VAAPI_DEVICE = os.environ.get('VAAPI_DEVICE', '/dev/dri/renderD128')  # Render node for h264_vaapi when NVENC is unavailable
+    QSV_PRESET = os.environ.get('QSV_PRESET', 'faster')  # Intel Quick Sync preset when NVENC is unavailable
+    USE_PYNVC_EXPORTER = os.environ.get('USE_PYNVC_EXPORTER', 'true').lower() == 'true'  # Batch exports decode once via PyNvVideoCodec when installed
     
     # CPU Encoding settings (fallback when GPU not available)
     FFMPEG_THREADS = int(os.environ.get('FFMPEG_THREADS', 0))  # 0 = auto-detect optimal threads
+    FFMPEG_PIN_CORES = os.environ.get('FFMPEG_PIN_CORES', 'true').lower() == 'true'  # Pin each parallel export's FFmpeg to its own core set
+    FFMPEG_NICE = int(os.environ.get('FFMPEG_NICE', 10))  # Niceness for parallel export FFmpeg processes (0 = unchanged)
     CPU_PRESET = os.environ.get('CPU_PRESET', 'medium')  # libx264: ultrafast, fast, medium, slow, veryslow
     
     # GPU Filter Processing - Use CUDA filters for speed on T4
@@ -445,6 +456,9 @@ class Config:
     # g4dn.xlarge has 4 vCPU, g4dn.2xlarge has 8 vCPU
     # T4 GPU can handle 4-6 parallel NVENC streams efficiently
     MAX_PARALLEL_EXPORTS = int(os.environ.get('MAX_PARALLEL_EXPORTS', min(6, max(4, _cpu_count))))  # Optimized for g4dn
+    EXPORT_CLIPS_PER_FFMPEG = int(os.environ.get('EXPORT_CLIPS_PER_FFMPEG', 4))  # Clips encoded by one FFmpeg process (1 = one process per clip)
+    EXPORT_OUTPUT_CACHE = os.environ.get('EXPORT_OUTPUT_CACHE', 'true').lower() == 'true'  # Reuse clips already exported with identical source/span/encoder settings
+    EXPORT_SHARED_DECODE_COVERAGE = float(os.environ.get('EXPORT_SHARED_DECODE_COVERAGE', 0.6))  # Batches whose clips cover this share of their span decode it once (split/trim); 0 = off
     
     # === ASPECT RATIO PRESETS ===
     # Format presets for different platforms
@@ -474,9 +488,12 @@ class Config:
     # For "jump cut" style clips without dead air
     SILENCE_REMOVAL_ENABLED = os.environ.get('SILENCE_REMOVAL_ENABLED', 'false').lower() == 'true'  # Off by default
     SILENCE_THRESHOLD_DB = int(os.environ.get('SILENCE_THRESHOLD_DB', -35))  # dB threshold for silence detection
+    AUTO_SILENCE_THRESHOLD = os.environ.get('AUTO_SILENCE_THRESHOLD', 'false').lower() == 'true'  # Derive threshold from each clip's mean volume
+    AUTO_SILENCE_OFFSET_DB = float(os.environ.get('AUTO_SILENCE_OFFSET_DB', 10))  # Auto threshold = mean volume - this many dB
     MIN_SILENCE_TO_REMOVE = float(os.environ.get('MIN_SILENCE_TO_REMOVE', 0.4))  # Minimum silence duration to remove (seconds)
     MIN_SPEECH_DURATION = float(os.environ.get('MIN_SPEECH_DURATION', 0.2))  # Minimum speech duration to keep
     SILENCE_PADDING = float(os.environ.get('SILENCE_PADDING', 0.05))  # Padding before/after speech (seconds)
+    SILENCE_STREAM_COPY = os.environ.get('SILENCE_STREAM_COPY', 'true').lower() == 'true'  # Keyframe-snapped cuts without re-encoding when source is H.264/AAC
     
     # Auto-enhance settings for TikTok-ready clips
     AUTO_TIKTOK_MODE = os.environ.get('AUTO_TIKTOK_MODE', 'false').lower() == 'true'  # Auto 9:16 + silence removal
@@ -70,6 +70,7 @@ class GPUProfile:
     use_tensorrt: bool
     optimal_workers: int
     description: str
+    max_nvenc_sessions: int = 3  # Concurrent NVENC sessions before the encoder serializes
 
 
 # Pre-defined GPU profiles
@@ -86,7 +87,8 @@ GPU_PROFILES = {
         max_batch_size=8,
         use_tensorrt=True,
         optimal_workers=4,
-        description='AWS g4dn instance - NVIDIA T4 16GB'
+        description='AWS g4dn instance - NVIDIA T4 16GB',
+        max_nvenc_sessions=4
     ),
     # AWS p3 instances (NVIDIA V100)
     'Tesla V100': GPUProfile(
@@ -100,7 +102,8 @@ GPU_PROFILES = {
         max_batch_size=16,
         use_tensorrt=True,
         optimal_workers=8,
-        description='AWS p3 instance - NVIDIA V100 16/32GB'
+        description='AWS p3 instance - NVIDIA V100 16/32GB',
+        max_nvenc_sessions=6
     ),
     # AWS g5 instances (NVIDIA A10G)
     'NVIDIA A10G': GPUProfile(
@@ -114,7 +117,8 @@ GPU_PROFILES = {
         max_batch_size=16,
         use_tensorrt=True,
         optimal_workers=6,
-        description='AWS g5 instance - NVIDIA A10G 24GB'
+        description='AWS g5 instance - NVIDIA A10G 24GB',
+        max_nvenc_sessions=6
     ),
     # Consumer GPUs
     'NVIDIA GeForce RTX 3060': GPUProfile(
@@ -128,7 +132,8 @@ GPU_PROFILES = {
         max_batch_size=6,
         use_tensorrt=False,
         optimal_workers=3,
-        description='RTX 3060 12GB - Consumer GPU'
+        description='RTX 3060 12GB - Consumer GPU',
+        max_nvenc_sessions=3
     ),
     'NVIDIA GeForce RTX 4090': GPUProfile(
         name='NVIDIA GeForce RTX 4090',
@@ -141,7 +146,8 @@ GPU_PROFILES = {
         max_batch_size=24,
         use_tensorrt=True,
         optimal_workers=8,
-        description='RTX 4090 24GB - High-end Consumer GPU'
+        description='RTX 4090 24GB - High-end Consumer GPU',
+        max_nvenc_sessions=5
     ),
     # Default fallback
     'default': GPUProfile(
@@ -155,7 +161,8 @@ GPU_PROFILES = {
         max_batch_size=4,
         use_tensorrt=False,
         optimal_workers=2,
-        description='Generic GPU with ~8GB VRAM'
+        description='Generic GPU with ~8GB VRAM',
+        max_nvenc_sessions=2
     )
 }
 
@@ -325,6 +332,7 @@ class GPUOptimizer:
             'MAX_PARALLEL_EXPORTS': self.profile.max_parallel_exports,
             'VIDEO_BITRATE': self.profile.video_bitrate,
             'NVENC_PRESET': self.profile.nvenc_preset,
+            'NVENC_MAX_SESSIONS': self.profile.max_nvenc_sessions,
             'VIDEO_CODEC': 'h264_nvenc' if self.primary_gpu else 'libx264',
             'USE_GPU_ACCELERATION': bool(self.primary_gpu),
             